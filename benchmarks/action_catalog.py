@@ -0,0 +1,46 @@
+"""
+Latency benchmark for the bundled action catalog.
+
+Times loading the catalog index, decoding single services on first use and
+expanding typical policy wildcards, cold and cached.
+
+Usage: python benchmarks/action_catalog.py [repeats]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from awsome_enum.action_catalog import ActionCatalog
+from awsome_enum.utils import ACTION_CATALOG_FILE
+
+PATTERNS = ['ec2:Describe*', 'iam:*Policy*', 's3:Get*', 'lambda:*', 'ssm:Get*Parameter*', '*:List*', '*']
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    path = os.path.join(os.path.dirname(__file__), '..', 'src', 'awsome_enum', ACTION_CATALOG_FILE)
+    with open(path, 'rb') as handle:
+        data = handle.read()
+
+    start = time.perf_counter()
+    catalog = ActionCatalog(data)
+    loaded = time.perf_counter() - start
+    print(f"Catalog of {len(catalog)} services (botocore {catalog.botocore_version}), {len(data) / 1024:.0f} KiB")
+    print(f"  load index:             {loaded * 1e6:8.0f} us")
+
+    for pattern in PATTERNS:
+        start = time.perf_counter()
+        expanded = catalog.expand(pattern)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            catalog.expand(pattern)
+        cached = (time.perf_counter() - start) / repeats
+        print(f"  {pattern:<22}  {len(expanded):6d} actions   first {cold * 1e6:8.0f} us   cached {cached * 1e6:6.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Connection-setup benchmark for the shared client pool.
+
+Replays the per-resource pattern of the Elastic Beanstalk and RDS checks:
+many work units each making one STS and one S3 call. "fresh clients" builds
+new clients for every unit (the old behaviour); "client pool" draws them
+from one ClientPool shared by all units. Needs an endpoint to talk to, e.g.
+a local moto server (`moto_server -p 5000`).
+
+Usage: python benchmarks/clients.py [endpoint_url] [units] [threads]
+"""
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import boto3
+from awsome_enum.clients import ClientPool
+
+
+class ConnectionCounter(logging.Handler):
+    """Counts the new HTTP(S) connections urllib3 opens."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record):
+        if record.getMessage().startswith('Starting new HTTP'):
+            self.count += 1
+
+
+def unit(get_client):
+    get_client('sts').get_caller_identity()
+    get_client('s3').list_buckets()
+
+
+def fresh_clients(session, endpoint_url, units, threads):
+    def run(_):
+        unit(lambda name: session.client(name, endpoint_url=endpoint_url))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, range(units)))
+
+
+def client_pool(session, endpoint_url, units, threads):
+    pool = ClientPool(session, endpoint_url=endpoint_url, max_pool_connections=threads)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: unit(pool.get), range(units)))
+    pool.close()
+
+
+def measure(func, session, endpoint_url, units, threads, counter):
+    counter.count = 0
+    start = time.perf_counter()
+    func(session, endpoint_url, units, threads)
+    return time.perf_counter() - start, counter.count
+
+
+def main():
+    endpoint_url = sys.argv[1] if len(sys.argv) > 1 else 'http://localhost:5000'
+    units = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    counter = ConnectionCounter()
+    logger = logging.getLogger('urllib3.connectionpool')
+    logger.addHandler(counter)
+    logger.setLevel(logging.DEBUG)
+
+    session = boto3.Session()
+    # Warm botocore's loader caches once so both runs pay the same import cost
+    session.client('sts', endpoint_url=endpoint_url)
+    session.client('s3', endpoint_url=endpoint_url)
+
+    fresh_time, fresh_connections = measure(fresh_clients, session, endpoint_url, units, threads, counter)
+    pool_time, pool_connections = measure(client_pool, session, endpoint_url, units, threads, counter)
+
+    print(f"{units} units x 2 calls on {threads} threads against {endpoint_url}")
+    print(f"  fresh clients: {fresh_time * 1000:8.1f} ms   {fresh_connections:5d} connections opened")
+    print(f"  client pool:   {pool_time * 1000:8.1f} ms   {pool_connections:5d} connections opened")
+    print(f"  saved:         {(fresh_time - pool_time) * 1000:8.1f} ms   {fresh_connections - pool_connections:5d} connections")
+
+
+if __name__ == '__main__':
+    main()
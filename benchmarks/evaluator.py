@@ -0,0 +1,102 @@
+"""
+Throughput benchmark for the policy evaluator.
+
+Builds a principal with a realistic mix of identity policies (service
+wildcards, read-only globs, resource-scoped grants, explicit denies,
+NotAction / NotResource statements and conditions), then times compiling
+them and deciding a stream of random (action, resource) queries.
+
+Usage: python benchmarks/evaluator.py [queries] [policies] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from awsome_enum.evaluator import PolicyEvaluator
+
+ACCOUNT = '123456789012'
+SERVICES = ['s3', 'ec2', 'iam', 'lambda', 'dynamodb', 'sqs', 'sns', 'kms', 'ecs', 'logs', 'rds', 'secretsmanager']
+VERBS = ['Get', 'List', 'Describe', 'Put', 'Create', 'Delete', 'Update', 'Tag']
+NOUNS = ['Bucket', 'Object', 'Instance', 'Role', 'Function', 'Table', 'Queue', 'Topic', 'Key', 'Cluster', 'Secret']
+CONTEXT = {
+    'aws:PrincipalArn': f"arn:aws:iam::{ACCOUNT}:role/app",
+    'aws:PrincipalAccount': ACCOUNT,
+    'aws:PrincipalType': 'AssumedRole',
+    'aws:SecureTransport': 'true',
+}
+
+
+def document(*statements):
+    return {'Version': '2012-10-17', 'Statement': list(statements)}
+
+
+def resource(rng, service):
+    return f"arn:aws:{service}:us-east-1:{ACCOUNT}:{rng.choice(NOUNS).lower()}/name-{rng.randrange(500)}"
+
+
+def policy(rng):
+    service = rng.choice(SERVICES)
+    roll = rng.random()
+    if roll < 0.3:
+        return document({'Effect': 'Allow', 'Action': [f"{service}:Get*", f"{service}:List*", f"{service}:Describe*"],
+                         'Resource': '*'})
+    if roll < 0.5:
+        return document({'Effect': 'Allow', 'Action': f"{service}:{rng.choice(VERBS)}{rng.choice(NOUNS)}",
+                         'Resource': [resource(rng, service) for _ in range(5)]})
+    if roll < 0.6:
+        return document({'Effect': 'Allow', 'Action': f"{service}:*",
+                         'Resource': f"arn:aws:{service}:*:{ACCOUNT}:*/team-{rng.randrange(20)}-*"})
+    if roll < 0.7:
+        return document({'Effect': 'Deny', 'Action': f"{service}:Delete*", 'Resource': '*',
+                         'Condition': {'StringNotEquals': {'aws:PrincipalAccount': ACCOUNT}}})
+    if roll < 0.8:
+        return document({'Effect': 'Deny', 'Action': f"{service}:{rng.choice(VERBS)}*",
+                         'Resource': resource(rng, service)})
+    if roll < 0.85:
+        return document({'Effect': 'Allow', 'NotAction': ['iam:*', 'kms:*'], 'Resource': '*',
+                         'Condition': {'IpAddress': {'aws:SourceIp': '10.0.0.0/8'}}})
+    if roll < 0.9:
+        return document({'Effect': 'Deny', 'Action': '*', 'NotResource': f"arn:aws:{service}:*:{ACCOUNT}:*",
+                         'Condition': {'Bool': {'aws:SecureTransport': 'false'}}})
+    return document({'Effect': 'Allow', 'Action': f"{service}:{rng.choice(VERBS)}*", 'Resource': '*',
+                     'Condition': {'StringEquals': {'aws:PrincipalTag/team': f"team-{rng.randrange(20)}"}}})
+
+
+def queries(rng, count):
+    return [
+        (f"{service}:{rng.choice(VERBS)}{rng.choice(NOUNS)}", resource(rng, service))
+        for service in (rng.choice(SERVICES) for _ in range(count))
+    ]
+
+
+def main():
+    query_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    policy_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+
+    rng = random.Random(seed)
+    documents = [policy(rng) for _ in range(policy_count)]
+    stream = queries(rng, query_count)
+
+    start = time.perf_counter()
+    evaluator = PolicyEvaluator(documents, CONTEXT)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decisions = {}
+    for action, arn in stream:
+        decision = evaluator.evaluate(action, arn)
+        decisions[decision] = decisions.get(decision, 0) + 1
+    decided = time.perf_counter() - start
+
+    print(f"Principal with {policy_count} policies ({len(evaluator.statements)} statements kept after conditions)")
+    print(f"  compile:                {compiled * 1000:8.1f} ms")
+    print(f"  {query_count} queries:       {decided * 1000:8.1f} ms   ({query_count / decided:,.0f} queries/s)")
+    print("  decisions: " + ", ".join(f"{name} {count}" for name, count in sorted(decisions.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Scaling benchmark for the privilege-escalation graph.
+
+Generates a synthetic GetAccountAuthorizationDetails snapshot (users in
+groups, roles trusted by services, by the account or by specific roles,
+chains of AssumeRole / PassRole permissions and a few administrators), then
+times building the PolicyGraph and searching paths from every user and role.
+
+Usage: python benchmarks/privesc.py [roles] [users] [seed]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from awsome_enum.iam_snapshot import IAMSnapshot
+from awsome_enum.privesc import PolicyGraph
+
+ACCOUNT = '123456789012'
+SERVICES = ['lambda.amazonaws.com', 'ec2.amazonaws.com', 'ecs-tasks.amazonaws.com', 'glue.amazonaws.com']
+READ_ONLY = {'Version': '2012-10-17', 'Statement': [
+    {'Effect': 'Allow', 'Action': ['s3:Get*', 's3:List*', 'ec2:Describe*'], 'Resource': '*'}
+]}
+ADMIN = {'Version': '2012-10-17', 'Statement': [{'Effect': 'Allow', 'Action': '*', 'Resource': '*'}]}
+
+
+def arn(kind, name):
+    return f"arn:aws:iam::{ACCOUNT}:{kind}/{name}"
+
+
+def document(*statements):
+    return {'Version': '2012-10-17', 'Statement': list(statements)}
+
+
+def trust_policy(rng, roles):
+    roll = rng.random()
+    if roll < 0.7:
+        principal = {'Service': rng.choice(SERVICES)}
+    elif roll < 0.85 or not roles:
+        principal = {'AWS': f"arn:aws:iam::{ACCOUNT}:root"}
+    else:
+        principal = {'AWS': arn('role', rng.choice(roles))}
+    return document({'Effect': 'Allow', 'Principal': principal, 'Action': 'sts:AssumeRole'})
+
+
+def permissions(rng, roles, users):
+    roll = rng.random()
+    if roll < 0.6:
+        return document({'Effect': 'Allow', 'Action': ['s3:GetObject', 'dynamodb:Query'], 'Resource': '*'})
+    if roll < 0.75 and roles:
+        return document({'Effect': 'Allow', 'Action': 'sts:AssumeRole', 'Resource': arn('role', rng.choice(roles))})
+    if roll < 0.85 and roles:
+        return document(
+            {'Effect': 'Allow', 'Action': 'iam:PassRole', 'Resource': arn('role', rng.choice(roles))},
+            {'Effect': 'Allow', 'Action': ['lambda:CreateFunction', 'lambda:InvokeFunction'], 'Resource': '*'}
+        )
+    if roll < 0.9 and users:
+        return document({'Effect': 'Allow', 'Action': 'iam:CreateAccessKey', 'Resource': arn('user', rng.choice(users))})
+    if roll < 0.93:
+        return document(
+            {'Effect': 'Allow', 'Action': 'sts:AssumeRole', 'Resource': arn('role', 'app-*')},
+            {'Effect': 'Deny', 'Action': 'sts:AssumeRole', 'Resource': arn('role', 'app-1*')}
+        )
+    return document({'Effect': 'Allow', 'Action': 'ec2:*', 'Resource': '*'})
+
+
+def synthetic_account(role_count, user_count, seed):
+    rng = random.Random(seed)
+    role_names = [f"app-{index}" for index in range(role_count)]
+    user_names = [f"user-{index}" for index in range(user_count)]
+    policies = [
+        {'PolicyName': 'ReadOnly', 'Arn': 'arn:aws:iam::aws:policy/ReadOnlyAccess', 'DefaultVersionId': 'v1',
+         'PolicyVersionList': [{'VersionId': 'v1', 'IsDefaultVersion': True, 'Document': READ_ONLY}]},
+        {'PolicyName': 'Admin', 'Arn': 'arn:aws:iam::aws:policy/AdministratorAccess', 'DefaultVersionId': 'v1',
+         'PolicyVersionList': [{'VersionId': 'v1', 'IsDefaultVersion': True, 'Document': ADMIN}]},
+    ]
+    groups = [
+        {'GroupName': 'readers', 'Arn': arn('group', 'readers'), 'GroupPolicyList': [],
+         'AttachedManagedPolicies': [{'PolicyName': 'ReadOnly', 'PolicyArn': policies[0]['Arn']}]},
+        {'GroupName': 'devs', 'Arn': arn('group', 'devs'), 'AttachedManagedPolicies': [],
+         'GroupPolicyList': [{'PolicyName': 'assume', 'PolicyDocument': document(
+             {'Effect': 'Allow', 'Action': 'sts:AssumeRole', 'Resource': arn('role', 'app-4*')}
+         )}]},
+    ]
+    roles = []
+    for index, name in enumerate(role_names):
+        attached = [{'PolicyName': 'ReadOnly', 'PolicyArn': policies[0]['Arn']}]
+        if index % 997 == 0:
+            attached.append({'PolicyName': 'Admin', 'PolicyArn': policies[1]['Arn']})
+        roles.append({
+            'RoleName': name,
+            'Arn': arn('role', name),
+            'AssumeRolePolicyDocument': trust_policy(rng, role_names[:index]),
+            'RolePolicyList': [{'PolicyName': 'inline', 'PolicyDocument': permissions(rng, role_names, user_names)}],
+            'AttachedManagedPolicies': attached,
+        })
+    users = [
+        {
+            'UserName': name,
+            'Arn': arn('user', name),
+            'GroupList': ['readers', 'devs'] if index % 10 == 0 else ['readers'],
+            'UserPolicyList': [{'PolicyName': 'inline', 'PolicyDocument': permissions(rng, role_names, user_names)}],
+            'AttachedManagedPolicies': [],
+        }
+        for index, name in enumerate(user_names)
+    ]
+    return {'UserDetailList': users, 'GroupDetailList': groups, 'RoleDetailList': roles, 'Policies': policies}
+
+
+def main():
+    role_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    user_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+
+    snapshot = IAMSnapshot(synthetic_account(role_count, user_count, seed))
+
+    start = time.perf_counter()
+    graph = PolicyGraph(snapshot)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reachable = 0
+    longest = 0
+    for principal_arn in graph.principals:
+        paths = graph.escalation_paths(principal_arn)
+        if paths:
+            reachable += 1
+            longest = max(longest, max(len(path) for path in paths))
+    searched = time.perf_counter() - start
+
+    edges = sum(len(graph.edges(principal_arn)) for principal_arn in graph.principals)
+    print(f"Synthetic account: {role_count} roles, {user_count} users, {edges} escalation edges")
+    print(f"  build graph:            {built * 1000:8.1f} ms")
+    print(f"  paths from every node:  {searched * 1000:8.1f} ms   ({len(graph.principals)} principals)")
+    print(f"  principals that reach admin: {reachable}   longest path: {longest} hops")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start benchmark for single-service invocations.
+
+Compares building every service in AVAILABLE_SERVICES up front (the old
+behaviour of AWSEnumerator) against the lazy registry, for the work done by
+e.g. `awsome-enum -e s3 get-all-buckets`. No AWS calls are made; only client
+construction is timed.
+
+Usage: python benchmarks/startup.py [service] [rounds]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from awsome_enum import AWSEnumerator
+from awsome_enum.services import AVAILABLE_SERVICES
+
+
+def eager_startup(service_name):
+    enumerator = AWSEnumerator()
+    for name in AVAILABLE_SERVICES:
+        service = enumerator.get_service_instance(name)
+        service.client
+        for extra in ('sts', 'ec2_client', 'public_client', 'idp_client'):
+            getattr(service, extra, None)
+    return enumerator.get_service_instance(service_name).client
+
+
+def lazy_startup(service_name):
+    enumerator = AWSEnumerator()
+    return enumerator.get_service_instance(service_name).client
+
+
+def measure(func, service_name, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(service_name)
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    service_name = sys.argv[1] if len(sys.argv) > 1 else 's3'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # Warm botocore's loader caches once so both runs pay the same import cost
+    lazy_startup(service_name)
+
+    eager_best, eager_avg = measure(eager_startup, service_name, rounds)
+    lazy_best, lazy_avg = measure(lazy_startup, service_name, rounds)
+
+    print(f"Single-service startup for '{service_name}' ({rounds} rounds)")
+    print(f"  eager (all services): best {eager_best * 1000:8.1f} ms   avg {eager_avg * 1000:8.1f} ms")
+    print(f"  lazy registry:        best {lazy_best * 1000:8.1f} ms   avg {lazy_avg * 1000:8.1f} ms")
+    print(f"  saved per invocation: {(eager_avg - lazy_avg) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Build src/awsome_enum/action_catalog.jsonl from the installed botocore service models.
+
+Each botocore operation becomes an IAM action under the service's signing
+name (the IAM prefix for nearly every service). Operations authorized by an
+IAM action of another name (s3:ListObjectsV2 -> s3:ListBucket,
+lambda:Invoke -> lambda:InvokeFunction) go through API_ALIASES, which also
+drops operations no IAM action is named after; services whose IAM actions
+are not their operations at all (API Gateway's HTTP verbs) are replaced by
+their real actions. Actions that exist only in IAM (iam:PassRole, ...) and
+those listed in interesting_permissions.json are added on top.
+
+The models carry no IAM metadata, so access levels are still judged from
+the action names.
+
+Re-run after upgrading botocore:
+
+    python scripts/build_action_catalog.py
+"""
+import json
+import os
+import re
+import sys
+
+import botocore
+import botocore.session
+
+PACKAGE = os.path.join(os.path.dirname(__file__), '..', 'src', 'awsome_enum')
+OUTPUT = os.path.join(PACKAGE, 'action_catalog.jsonl')
+PERMISSIONS = os.path.join(PACKAGE, 'interesting_permissions.json')
+
+# Access level -> one-letter code stored per action
+LEVELS = {'List': 'L', 'Read': 'R', 'Write': 'W', 'Permissions management': 'P', 'Tagging': 'T'}
+
+# IAM actions with no API operation of the same name
+IAM_ONLY_ACTIONS = {
+    'iam:PassRole': 'Write',
+    's3:ListBucket': 'List',
+    's3:ListAllMyBuckets': 'List',
+    's3:ListBucketVersions': 'List',
+    's3:ListBucketMultipartUploads': 'List',
+    's3:GetObjectVersion': 'Read',
+    's3:PutObjectAcl': 'Permissions management',
+    's3:DeleteObjectVersion': 'Write',
+    'lambda:InvokeFunction': 'Write',
+    'lambda:InvokeFunctionUrl': 'Write',
+    'sts:SetSourceIdentity': 'Write',
+    'sts:TagSession': 'Tagging',
+    'ec2:CreateTags': 'Tagging',
+    'ec2:DeleteTags': 'Tagging',
+    'ssm:StartSession': 'Write',
+    'ecr:GetAuthorizationToken': 'Read',
+    'kms:Decrypt': 'Write',
+    'apigateway:GET': 'Read',
+    'apigateway:POST': 'Write',
+    'apigateway:PUT': 'Write',
+    'apigateway:PATCH': 'Write',
+    'apigateway:DELETE': 'Write',
+    'execute-api:Invoke': 'Write',
+    'execute-api:InvalidateCache': 'Write',
+    'execute-api:ManageConnections': 'Write',
+}
+
+# Operations authorized by an IAM action of another name, per IAM prefix;
+# None for operations no IAM action of this prefix is named after
+API_ALIASES = {
+    's3': {
+        'CompleteMultipartUpload': 'PutObject',
+        'CopyObject': 'PutObject',
+        'CreateMultipartUpload': 'PutObject',
+        'CreateSession': None,
+        'DeleteBucketAnalyticsConfiguration': 'PutAnalyticsConfiguration',
+        'DeleteBucketCors': 'PutBucketCORS',
+        'DeleteBucketEncryption': 'PutEncryptionConfiguration',
+        'DeleteBucketIntelligentTieringConfiguration': 'PutIntelligentTieringConfiguration',
+        'DeleteBucketInventoryConfiguration': 'PutInventoryConfiguration',
+        'DeleteBucketLifecycle': 'PutLifecycleConfiguration',
+        'DeleteBucketLifecycleConfiguration': 'PutLifecycleConfiguration',
+        'DeleteBucketMetricsConfiguration': 'PutMetricsConfiguration',
+        'DeleteBucketOwnershipControls': 'PutBucketOwnershipControls',
+        'DeleteBucketReplication': 'PutReplicationConfiguration',
+        'DeleteBucketTagging': 'PutBucketTagging',
+        'DeleteObjects': 'DeleteObject',
+        'DeletePublicAccessBlock': 'PutBucketPublicAccessBlock',
+        'GetBucket': None,
+        'GetBucketAccelerateConfiguration': 'GetAccelerateConfiguration',
+        'GetBucketAnalyticsConfiguration': 'GetAnalyticsConfiguration',
+        'GetBucketCors': 'GetBucketCORS',
+        'GetBucketEncryption': 'GetEncryptionConfiguration',
+        'GetBucketIntelligentTieringConfiguration': 'GetIntelligentTieringConfiguration',
+        'GetBucketInventoryConfiguration': 'GetInventoryConfiguration',
+        'GetBucketLifecycle': 'GetLifecycleConfiguration',
+        'GetBucketLifecycleConfiguration': 'GetLifecycleConfiguration',
+        'GetBucketMetricsConfiguration': 'GetMetricsConfiguration',
+        'GetBucketNotificationConfiguration': 'GetBucketNotification',
+        'GetBucketReplication': 'GetReplicationConfiguration',
+        'GetObjectLockConfiguration': 'GetBucketObjectLockConfiguration',
+        'GetPublicAccessBlock': 'GetBucketPublicAccessBlock',
+        'HeadBucket': 'ListBucket',
+        'HeadObject': 'GetObject',
+        'ListBucketAnalyticsConfigurations': 'GetAnalyticsConfiguration',
+        'ListBucketIntelligentTieringConfigurations': 'GetIntelligentTieringConfiguration',
+        'ListBucketInventoryConfigurations': 'GetInventoryConfiguration',
+        'ListBucketMetricsConfigurations': 'GetMetricsConfiguration',
+        'ListBuckets': 'ListAllMyBuckets',
+        'ListDirectoryBuckets': None,
+        'ListMultipartUploads': 'ListBucketMultipartUploads',
+        'ListObjectVersions': 'ListBucketVersions',
+        'ListObjects': 'ListBucket',
+        'ListObjectsV2': 'ListBucket',
+        'ListParts': 'ListMultipartUploadParts',
+        'ListRegionalBuckets': None,
+        'PutBucketAccelerateConfiguration': 'PutAccelerateConfiguration',
+        'PutBucketAnalyticsConfiguration': 'PutAnalyticsConfiguration',
+        'PutBucketCors': 'PutBucketCORS',
+        'PutBucketEncryption': 'PutEncryptionConfiguration',
+        'PutBucketIntelligentTieringConfiguration': 'PutIntelligentTieringConfiguration',
+        'PutBucketInventoryConfiguration': 'PutInventoryConfiguration',
+        'PutBucketLifecycle': 'PutLifecycleConfiguration',
+        'PutBucketLifecycleConfiguration': 'PutLifecycleConfiguration',
+        'PutBucketMetricsConfiguration': 'PutMetricsConfiguration',
+        'PutBucketNotificationConfiguration': 'PutBucketNotification',
+        'PutBucketReplication': 'PutReplicationConfiguration',
+        'PutObjectLockConfiguration': 'PutBucketObjectLockConfiguration',
+        'PutPublicAccessBlock': 'PutBucketPublicAccessBlock',
+        'SelectObjectContent': 'GetObject',
+        'UploadPart': 'PutObject',
+        'UploadPartCopy': 'PutObject',
+        'WriteGetObjectResponse': None,
+    },
+    'lambda': {
+        'GetLayerVersionByArn': 'GetLayerVersion',
+        'Invoke': 'InvokeFunction',
+        'InvokeWithResponseStream': 'InvokeFunction',
+    },
+    'dynamodb': {
+        'BatchExecuteStatement': None,
+        'ExecuteStatement': None,
+        'ExecuteTransaction': None,
+    },
+}
+
+# IAM prefixes whose actions are not named after the operations at all;
+# IAM_ONLY_ACTIONS holds their real actions
+NON_OPERATION_PREFIXES = {'apigateway', 'execute-api'}
+
+# botocore signing names that differ from the service's IAM prefix
+PREFIX_ALIASES = {'monitoring': 'cloudwatch'}
+
+PERMISSIONS_PATTERN = re.compile(
+    r'(Put|Delete|Attach|Detach|Set|Create|Update|Replace)\w*(Policy|Policies|Acl)\b'
+    r'|Permission|Grant|Revoke|Authorize|Share'
+)
+READ_PREFIXES = ('Get', 'Describe', 'Head', 'BatchGet', 'BatchCheck', 'BatchDescribe', 'Query', 'Scan', 'Select',
+                 'Download', 'Check', 'Lookup', 'Search', 'Validate', 'Estimate', 'Preview', 'Simulate', 'Test', 'Export')
+
+
+def access_level(name):
+    """IAM access level of an operation, judged from its name."""
+    if name.startswith(('Tag', 'Untag')):
+        return 'Tagging'
+    if PERMISSIONS_PATTERN.search(name):
+        return 'Permissions management'
+    if name.startswith('List'):
+        return 'List'
+    if name.startswith(READ_PREFIXES):
+        return 'Read'
+    return 'Write'
+
+
+def botocore_actions():
+    session = botocore.session.get_session()
+    loader = session.get_component('data_loader')
+    catalog = {}
+    for service_name in session.get_available_services():
+        model = loader.load_service_model(service_name, 'service-2')
+        metadata = model['metadata']
+        prefix = (metadata.get('signingName') or metadata.get('endpointPrefix') or service_name).lower()
+        prefix = PREFIX_ALIASES.get(prefix, prefix)
+        if prefix in NON_OPERATION_PREFIXES:
+            continue
+        actions = catalog.setdefault(prefix, {})
+        aliases = API_ALIASES.get(prefix, {})
+        for operation in model['operations']:
+            name = aliases.get(operation, operation)
+            if name is not None:
+                actions.setdefault(name, access_level(name))
+    return catalog
+
+
+def main():
+    catalog = botocore_actions()
+    with open(PERMISSIONS, encoding='utf-8') as handle:
+        extra = {action: access_level(action.split(':', 1)[1]) for action in json.load(handle) if ':' in action}
+    extra.update(IAM_ONLY_ACTIONS)
+    for action, level in extra.items():
+        service, name = action.split(':', 1)
+        catalog.setdefault(service.lower(), {})[name] = level
+
+    lines = []
+    index = {}
+    offset = 0
+    for service in sorted(catalog):
+        actions = {name: LEVELS[level] for name, level in sorted(catalog[service].items())}
+        line = (json.dumps({'service': service, 'actions': actions}, separators=(',', ':')) + '\n').encode('utf-8')
+        index[service] = [offset, len(line)]
+        offset += len(line)
+        lines.append(line)
+
+    header = {
+        'botocore': botocore.__version__,
+        'levels': {code: level for level, code in LEVELS.items()},
+        'index': index,
+    }
+    with open(OUTPUT, 'wb') as handle:
+        handle.write((json.dumps(header, separators=(',', ':')) + '\n').encode('utf-8'))
+        handle.writelines(lines)
+
+    total = sum(len(actions) for actions in catalog.values())
+    print(f"Wrote {total} actions of {len(catalog)} services (botocore {botocore.__version__}) to {os.path.normpath(OUTPUT)}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
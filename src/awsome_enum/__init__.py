@@ -1,4 +1,5 @@
 from .enumerator import AWSEnumerator
+from .api import run_enumeration
 from .utils import load_permissions
 
-__all__ = ['AWSEnumerator', 'load_permissions']
\ No newline at end of file
+__all__ = ['AWSEnumerator', 'run_enumeration', 'load_permissions']
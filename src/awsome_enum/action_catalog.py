@@ -0,0 +1,136 @@
+import json
+import threading
+from bisect import bisect_left
+from .matcher import compile_pattern, has_wildcard, split_action
+
+class ActionCatalog:
+    """
+    Every known IAM action with its access level, loaded one service at a time.
+
+    Backed by action_catalog.jsonl, built from the botocore service models
+    by scripts/build_action_catalog.py. The first line is an index of byte
+    ranges, so only the header is parsed up front and a service's actions
+    are decoded the first time they are needed. Expanding a policy action
+    ('ec2:Describe*', 's3:*', '*') to the concrete actions it grants is
+    cached per pattern.
+    """
+
+    def __init__(self, data=b''):
+        """
+        Args:
+            data (bytes): Contents of action_catalog.jsonl (empty for an empty catalog)
+        """
+        header_end = data.find(b'\n') + 1
+        header = json.loads(data[:header_end]) if header_end else {}
+        self.botocore_version = header.get('botocore')
+        self.levels = header.get('levels', {})
+        self._index = header.get('index', {})
+        self._body = memoryview(data)[header_end:]
+        self._services = {}
+        self._names = {}
+        self._expanded = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, action):
+        return self.access_level(action) is not None
+
+    def services(self):
+        return self._index.keys()
+
+    def actions(self, service_prefix):
+        """
+        The actions of one service, decoded on first use.
+
+        Args:
+            service_prefix (str): The IAM service prefix (e.g. 'ec2')
+
+        Returns:
+            dict: Action name -> access level code ('L', 'R', 'W', 'P' or 'T'), empty for an unknown service
+        """
+        service_prefix = service_prefix.lower()
+        actions = self._services.get(service_prefix)
+        if actions is None:
+            span = self._index.get(service_prefix)
+            if span is None:
+                return {}
+            offset, length = span
+            actions = json.loads(bytes(self._body[offset:offset + length]))['actions']
+            with self._lock:
+                actions = self._services.setdefault(service_prefix, actions)
+        return actions
+
+    def _sorted_names(self, service_prefix):
+        """([lower-cased names], [names]) of a service, sorted case-insensitively."""
+        names = self._names.get(service_prefix)
+        if names is None:
+            ordered = sorted(self.actions(service_prefix), key=str.lower)
+            names = self._names[service_prefix] = ([name.lower() for name in ordered], ordered)
+        return names
+
+    def _match_names(self, service_prefix, glob):
+        lowered, names = self._sorted_names(service_prefix)
+        # Names sharing the glob's literal start are one contiguous run of the sorted list
+        head = glob[:min(index for index in (glob.find('*'), glob.find('?'), len(glob)) if index >= 0)].lower()
+        start = bisect_left(lowered, head)
+        end = bisect_left(lowered, head + '\uffff', start) if head else len(lowered)
+        if glob.lower() == head + '*':
+            return names[start:end]
+        pattern = compile_pattern(glob)
+        return [name for name in names[start:end] if pattern.match(name)]
+
+    def access_level(self, action):
+        """The access level of a concrete action ('List', 'Read', 'Write', ...), None if it is not known."""
+        service, name = split_action(action)
+        actions = self.actions(service)
+        code = actions.get(name)
+        if code is None:
+            lowered = name.lower()
+            code = next((level for known, level in actions.items() if known.lower() == lowered), None)
+        return self.levels.get(code) if code else None
+
+    def expand(self, action):
+        """
+        The concrete actions a policy action grants.
+
+        Args:
+            action (str): A policy action, e.g. 'ec2:Describe*', 'iam:*Policy*', '*'
+
+        Returns:
+            tuple: 'service:Action' names, by service then name; a concrete action the catalog does not know is returned as is
+        """
+        key = action.lower()
+        expanded = self._expanded.get(key)
+        if expanded is None:
+            service, name = split_action(action)
+            if not has_wildcard(action):
+                canonical = next((known for known in self.actions(service) if known.lower() == name.lower()), name)
+                expanded = (f"{service}:{canonical}",)
+            else:
+                if service and not has_wildcard(service):
+                    prefixes = [service]
+                elif service:
+                    prefixes = [prefix for prefix in self._index if compile_pattern(service).match(prefix)]
+                else:
+                    prefixes = list(self._index)
+                expanded = tuple(
+                    f"{prefix}:{known}" for prefix in prefixes for known in self._match_names(prefix, name)
+                )
+            self._expanded[key] = expanded
+        return expanded
+
+    def summary(self, action):
+        """
+        How many concrete actions a policy action grants, per access level.
+
+        Returns:
+            dict: Access level name -> number of actions, in catalog level order
+        """
+        counts = {level: 0 for level in self.levels.values()}
+        for concrete in self.expand(action):
+            level = self.access_level(concrete)
+            if level:
+                counts[level] += 1
+        return {level: count for level, count in counts.items() if count}
@@ -0,0 +1,41 @@
+from .enumerator import AWSEnumerator
+from .output import CollectingSink, add_sink, remove_sink
+
+def run_enumeration(profile=None, service=None, deep=True, timeout=None, service_timeout=None, **options):
+    """
+    Run an enumeration end to end without a terminal and return its findings.
+
+    The colored report is still printed to stdout; the findings are also
+    collected as the same records --output-format jsonl writes.
+
+    Args:
+        profile (str): AWS CLI profile to use (None for the default credentials)
+        service (str): Service to enumerate (None for all services, starting from IAM)
+        deep (bool): Whether to run detailed enumeration of the discovered permissions
+        timeout (float): Seconds the whole enumeration may take (None for no limit)
+        service_timeout (float): Seconds each service may take during deep enumeration
+        **options: Any other AWSEnumerator argument (regions, threads, rate_limit, ...)
+
+    Returns:
+        list: resource, policy, interesting_permission and error records, in emission order
+    """
+    sink = CollectingSink()
+    add_sink(sink)
+    try:
+        enumerator = AWSEnumerator(
+            profile=profile,
+            deep=deep,
+            timeout=timeout,
+            service_timeout=service_timeout,
+            **options
+        )
+        try:
+            if service:
+                enumerator.enumerate_service(service.lower())
+            else:
+                enumerator.enumerate_all_services()
+        finally:
+            enumerator.close()
+    finally:
+        remove_sink(sink)
+    return sink.records
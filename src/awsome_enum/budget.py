@@ -0,0 +1,52 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class EnumerationTimeout(BaseException):
+    """
+    Raised by the next API call once the running unit's time budget is spent.
+
+    Derives from BaseException, like KeyboardInterrupt, so the per-action
+    `except Exception` handlers in the services let it through instead of
+    reporting one error for every call that is left.
+    """
+
+_local = threading.local()
+
+def current_deadline():
+    """The time.monotonic() deadline of the calling thread, or None."""
+    return getattr(_local, 'deadline', None)
+
+def check_deadline(**kwargs):
+    """
+    Raise EnumerationTimeout if the calling thread's deadline has passed.
+
+    Accepts and ignores keyword arguments so it can be registered as a
+    botocore 'before-call' handler.
+    """
+    deadline = current_deadline()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise EnumerationTimeout()
+
+@contextmanager
+def deadline_at(deadline):
+    """
+    Run the block under an absolute time.monotonic() deadline.
+
+    Nested deadlines can only tighten the one already in force.
+
+    Args:
+        deadline (float): Monotonic timestamp, or None to keep the current deadline
+    """
+    previous = current_deadline()
+    if previous is not None and (deadline is None or previous < deadline):
+        deadline = previous
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+def time_limit(seconds):
+    """Run the block for at most `seconds` (None or 0 for no limit)."""
+    return deadline_at(time.monotonic() + seconds if seconds else None)
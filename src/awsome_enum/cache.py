@@ -0,0 +1,299 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+DEFAULT_MAX_ENTRIES = 2048
+
+DEFAULT_CACHE_TTL = 3600
+CACHE_FILE = "responses.sqlite"
+# Bumped whenever the stored format changes; older databases are emptied
+CACHE_SCHEMA_VERSION = 2
+
+# Overrides of the --cache-ttl value for operations whose responses age
+# differently from the rest. A TTL of 0 keeps the response out of the disk cache.
+OPERATION_TTLS = {
+    # A policy version is immutable once created
+    'get_policy_version': 7 * 24 * 3600,
+}
+
+# The only responses written to disk, per boto3 service: listings and
+# descriptions of resource metadata and policies. Anything else (function
+# configuration and environment variables, task definitions, build and
+# execution details, user attributes, secret values, ...) is kept in
+# memory for the run and fetched again next time.
+PERSISTED_OPERATIONS = {
+    'codebuild': frozenset({
+        'list_projects', 'list_shared_projects', 'list_builds', 'list_builds_for_project', 'list_build_batches',
+        'list_build_batches_for_project', 'list_reports', 'list_source_credentials',
+    }),
+    'cognito-identity': frozenset({'list_identity_pools', 'describe_identity_pool', 'get_identity_pool_roles'}),
+    'cognito-idp': frozenset({
+        'list_user_pools', 'list_user_pool_clients', 'list_identity_providers', 'list_groups',
+        'get_user_pool_mfa_config', 'describe_risk_configuration',
+    }),
+    'ec2': frozenset({'describe_instances', 'describe_security_groups'}),
+    'ecr': frozenset({
+        'describe_registry', 'describe_repositories', 'get_registry_policy', 'get_repository_policy', 'list_images',
+    }),
+    'ecr-public': frozenset({'describe_registries', 'describe_repositories', 'get_repository_policy'}),
+    'ecs': frozenset({
+        'list_clusters', 'list_container_instances', 'list_services', 'list_task_definition_families',
+        'list_task_definitions', 'list_tasks',
+    }),
+    'efs': frozenset({
+        'describe_access_points', 'describe_file_system_policy', 'describe_file_systems',
+        'describe_mount_target_security_groups', 'describe_mount_targets', 'describe_replication_configurations',
+    }),
+    'elasticbeanstalk': frozenset({
+        'describe_applications', 'describe_application_versions', 'describe_environments', 'describe_events',
+    }),
+    'iam': frozenset({
+        'get_account_authorization_details', 'get_policy', 'get_policy_version', 'get_role', 'get_role_policy',
+        'get_user', 'get_user_policy', 'list_attached_role_policies', 'list_attached_user_policies',
+        'list_role_policies', 'list_roles', 'list_user_policies', 'list_users',
+    }),
+    'kms': frozenset({'list_keys'}),
+    'lambda': frozenset({'get_function_url_config', 'get_policy'}),
+    'lightsail': frozenset({'get_instances', 'get_relational_databases'}),
+    'organizations': frozenset({'describe_organization', 'describe_policy', 'list_parents'}),
+    'rds': frozenset({'describe_db_instances'}),
+    's3': frozenset({'get_bucket_policy', 'list_buckets'}),
+    'scheduler': frozenset({'get_schedule_group', 'list_schedule_groups', 'list_schedules', 'list_tags_for_resource'}),
+    'secretsmanager': frozenset({'list_secrets'}),
+    'sns': frozenset({'list_subscriptions', 'list_subscriptions_by_topic', 'list_topics'}),
+    'sqs': frozenset({'list_queues'}),
+    'stepfunctions': frozenset({
+        'describe_state_machine_alias', 'list_executions', 'list_state_machine_aliases',
+        'list_state_machine_versions', 'list_state_machines',
+    }),
+}
+
+# Listings longer than this are streamed but not kept in memory
+MAX_CACHED_LISTING_ITEMS = 5000
+
+class ResponseCache:
+    """
+    Per-run memoization of AWS API responses shared by every service instance.
+
+    Entries are keyed by (service, region, operation, params) and evicted in
+    least-recently-used order once the cache holds max_entries responses.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, store=None):
+        self.max_entries = max_entries
+        self.store = store
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(service, region, operation, params):
+        """
+        Build a hashable cache key.
+
+        Args:
+            service (str): The boto3 service name (e.g. 'ecr')
+            region (str): The client's region
+            operation (str): The boto3 method name (e.g. 'describe_repositories')
+            params (dict): The API call parameters
+
+        Returns:
+            tuple: The cache key
+        """
+        return (service, region, operation, json.dumps(params, sort_keys=True, default=str))
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss."""
+        return self.lookup(key)[0]
+
+    def lookup(self, key):
+        """
+        Return (response, source) for key.
+
+        source is 'memory' for a response already seen this run, 'disk' for
+        one loaded from the persistent store and None on a miss.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, 'memory'
+
+        value = self.store.get(key) if self.store else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None, None
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value, 'disk'
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.store:
+            self.store.put(key, value)
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': ((self.hits + self.disk_hits) / lookups) if lookups else 0.0,
+        }
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'awsome-enum')
+
+def _encode_value(value):
+    """JSON for the disk cache; datetimes (botocore timestamps) are tagged so they come back as datetimes."""
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {'$datetime': obj.isoformat()}
+        raise TypeError(f"{type(obj).__name__} is not cacheable")
+    return json.dumps(value, default=default, separators=(',', ':'))
+
+def _decode_value(text):
+    def object_hook(obj):
+        if len(obj) == 1 and '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        return obj
+    return json.loads(text, object_hook=object_hook)
+
+class DiskCache:
+    """
+    Persistent response store backing a ResponseCache between runs.
+
+    Responses live in a SQLite database, readable by its owner only, and are
+    scoped to the caller identity (account and principal ARN) they were
+    fetched with, so a rerun under a different profile never sees another
+    principal's view of the account. The identity is looked up on the first
+    read or write, not when the store is opened. Every entry expires after
+    its operation's TTL. Only PERSISTED_OPERATIONS are stored, as JSON.
+    """
+
+    def __init__(self, identity, ttl=DEFAULT_CACHE_TTL, cache_dir=None, operation_ttls=None):
+        """
+        Args:
+            identity (callable): () -> (account ID, principal ARN) the responses are scoped to
+            ttl (int): Seconds an entry stays valid
+            cache_dir (str): Directory of the database (defaults to the XDG cache directory)
+            operation_ttls (dict): Operation -> TTL overrides on top of OPERATION_TTLS
+        """
+        self._identity = identity
+        self._scope = None
+        self.ttl = ttl
+        self.operation_ttls = dict(OPERATION_TTLS)
+        if operation_ttls:
+            self.operation_ttls.update(operation_ttls)
+
+        cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILE)
+        # Create the file owner-only before SQLite opens it with the umask's mode
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(self.path, 0o600)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < CACHE_SCHEMA_VERSION:
+                # Entries of earlier versions were pickled and not restricted to PERSISTED_OPERATIONS
+                self._conn.execute("DROP TABLE IF EXISTS responses")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " account TEXT NOT NULL, principal TEXT NOT NULL,"
+                " service TEXT NOT NULL, region TEXT NOT NULL,"
+                " operation TEXT NOT NULL, params TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, value TEXT NOT NULL,"
+                " PRIMARY KEY (account, principal, service, region, operation, params))"
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+    def ttl_for(self, service, operation):
+        """Seconds the operation's responses are kept on disk, 0 for those never stored."""
+        if operation not in PERSISTED_OPERATIONS.get(service, ()):
+            return 0
+        return self.operation_ttls.get(operation, self.ttl)
+
+    def scope(self):
+        """(account ID, principal ARN) of the caller, looked up once; None while it cannot be."""
+        if self._scope is None:
+            try:
+                self._scope = tuple(self._identity())
+            except Exception:
+                return None
+        return self._scope
+
+    def get(self, key):
+        service, region, operation, params = key
+        scope = self.scope()
+        if self.ttl_for(service, operation) <= 0 or scope is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE account = ? AND principal = ? AND service = ?"
+                " AND region = ? AND operation = ? AND params = ? AND expires_at > ?",
+                scope + (service, region or '', operation, params, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return _decode_value(row[0])
+        except ValueError:
+            return None
+
+    def put(self, key, value):
+        service, region, operation, params = key
+        ttl = self.ttl_for(service, operation)
+        scope = self.scope()
+        if ttl <= 0 or scope is None:
+            return
+        try:
+            text = _encode_value(value)
+        except (TypeError, ValueError):
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                scope + (service, region or '', operation, params, time.time() + ttl, text)
+            )
+
+    def clear(self):
+        scope = self.scope()
+        if scope is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE account = ? AND principal = ?", scope)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,73 @@
+import threading
+from botocore.config import Config
+from .budget import check_deadline
+
+# botocore's own default; the pool never goes below it
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# boto3 sessions are not thread-safe, so client creation is serialized
+_client_creation_lock = threading.Lock()
+
+class ClientPool:
+    """
+    The boto3 clients of a run, one per (service, region).
+
+    Every service instance draws from the same pool, so e.g. the STS client
+    used by IAM, RDS and Elastic Beanstalk, or the S3 client of a region, is
+    built once and its HTTP connections are reused across all of them. Each
+    client keeps up to max_pool_connections connections alive with TCP
+    keep-alive, sized to the enumeration concurrency.
+    """
+
+    def __init__(self, session, endpoint_url=None, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+                 rate_limiter=None):
+        self.session = session
+        self.endpoint_url = endpoint_url
+        self.rate_limiter = rate_limiter
+        self.config = Config(
+            max_pool_connections=max(DEFAULT_MAX_POOL_CONNECTIONS, max_pool_connections),
+            tcp_keepalive=True
+        )
+        if rate_limiter is not None:
+            self.config = rate_limiter.client_config.merge(self.config)
+        self._clients = {}
+
+    def get(self, service_name, region=None):
+        """
+        Return the shared client for a service and region, creating it on first use.
+
+        Args:
+            service_name (str): The boto3 service name (e.g. 'ec2', 'sts')
+            region (str): Region to call (None for the session default)
+        """
+        key = (service_name, region)
+        client = self._clients.get(key)
+        if client is None:
+            with _client_creation_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = self._create_client(service_name, region)
+        return client
+
+    def _create_client(self, service_name, region):
+        client = self.session.client(
+            service_name,
+            region_name=region,
+            endpoint_url=self.endpoint_url,
+            config=self.config
+        )
+        if self.rate_limiter is not None:
+            self.rate_limiter.attach(client)
+        # Stop at the next call once the running unit's time budget is spent
+        client.meta.events.register('before-call', check_deadline)
+        return client
+
+    def __len__(self):
+        return len(self._clients)
+
+    def close(self):
+        with _client_creation_lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
@@ -0,0 +1,177 @@
+import ipaddress
+import re
+from datetime import datetime, timezone
+from .matcher import compile_pattern
+
+# Value of a context key the request is known not to carry (as opposed to a key that is not known at all)
+ABSENT = None
+
+# Operators that are true when none of the policy values match
+NEGATED = {
+    'StringNotEquals', 'StringNotEqualsIgnoreCase', 'StringNotLike', 'ArnNotEquals', 'ArnNotLike',
+    'NumericNotEquals', 'DateNotEquals', 'NotIpAddress'
+}
+
+POLICY_VARIABLE = re.compile(r'\$\{([^}]+)\}')
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def _number(value):
+    return float(value)
+
+def _date(value):
+    value = str(value)
+    if value.replace('.', '', 1).isdigit():
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def _ip(policy_value, value):
+    return ipaddress.ip_address(value) in ipaddress.ip_network(policy_value, strict=False)
+
+def _glob(policy_value, value):
+    return compile_pattern(policy_value, ignore_case=False).match(value) is not None
+
+# Base operator -> (policy value, request value) -> bool, with the negated form mapped to its positive test
+COMPARATORS = {
+    'StringEquals': lambda policy_value, value: policy_value == value,
+    'StringEqualsIgnoreCase': lambda policy_value, value: policy_value.lower() == value.lower(),
+    'StringLike': _glob,
+    'ArnEquals': _glob,
+    'ArnLike': _glob,
+    'NumericEquals': lambda policy_value, value: _number(value) == _number(policy_value),
+    'NumericLessThan': lambda policy_value, value: _number(value) < _number(policy_value),
+    'NumericLessThanEquals': lambda policy_value, value: _number(value) <= _number(policy_value),
+    'NumericGreaterThan': lambda policy_value, value: _number(value) > _number(policy_value),
+    'NumericGreaterThanEquals': lambda policy_value, value: _number(value) >= _number(policy_value),
+    'DateEquals': lambda policy_value, value: _date(value) == _date(policy_value),
+    'DateLessThan': lambda policy_value, value: _date(value) < _date(policy_value),
+    'DateLessThanEquals': lambda policy_value, value: _date(value) <= _date(policy_value),
+    'DateGreaterThan': lambda policy_value, value: _date(value) > _date(policy_value),
+    'DateGreaterThanEquals': lambda policy_value, value: _date(value) >= _date(policy_value),
+    'Bool': lambda policy_value, value: str(policy_value).lower() == str(value).lower(),
+    'BinaryEquals': lambda policy_value, value: policy_value == value,
+    'IpAddress': _ip,
+}
+COMPARATORS.update({
+    'StringNotEquals': COMPARATORS['StringEquals'],
+    'StringNotEqualsIgnoreCase': COMPARATORS['StringEqualsIgnoreCase'],
+    'StringNotLike': COMPARATORS['StringLike'],
+    'ArnNotEquals': COMPARATORS['ArnEquals'],
+    'ArnNotLike': COMPARATORS['ArnLike'],
+    'NumericNotEquals': COMPARATORS['NumericEquals'],
+    'DateNotEquals': COMPARATORS['DateEquals'],
+    'NotIpAddress': COMPARATORS['IpAddress'],
+})
+
+def combine(results):
+    """AND of three-valued results: False wins, then None (undecided), else True."""
+    decided = True
+    for result in results:
+        if result is False:
+            return False
+        if result is None:
+            decided = None
+    return decided
+
+class ConditionClause:
+    """
+    One operator/key test of a Condition block, e.g. {"StringEquals": {"aws:PrincipalTag/team": "ops"}}.
+
+    Evaluation is three-valued so that a policy can be judged from partial
+    knowledge of the request: True or False when the context decides the
+    test, None when a key (or a policy variable in a value) is not known.
+    """
+
+    __slots__ = ('operator', 'key', 'values', 'qualifier', 'if_exists', 'negated', '_compare')
+
+    def __init__(self, operator, key, values):
+        self.key = key.lower()
+        self.values = tuple(str(value) if isinstance(value, bool) else value for value in _as_list(values))
+        qualifier, _, base = operator.rpartition(':')
+        self.qualifier = qualifier.lower()
+        self.if_exists = base.endswith('IfExists')
+        base = base[:-len('IfExists')] if self.if_exists else base
+        self.negated = base in NEGATED
+        self._compare = None if base == 'Null' else COMPARATORS.get(base)
+        self.operator = base
+
+    def evaluate(self, context):
+        """
+        Args:
+            context (dict): Lower-cased condition key -> value or list of values; ABSENT for keys the request lacks
+
+        Returns:
+            bool: The test's result, or None when the context does not decide it
+        """
+        if self.key not in context:
+            return None
+        value = context[self.key]
+
+        if self.operator == 'Null':
+            return str(self.values[0]).lower() == ('true' if value is ABSENT else 'false')
+        if self._compare is None:
+            return None
+        if value is ABSENT:
+            # A missing key fails a positive test, except IfExists and ForAllValues (vacuously true)
+            return self.if_exists or self.negated or self.qualifier == 'forallvalues'
+
+        policy_values = self._resolve(context)
+        if policy_values is None:
+            return None
+        try:
+            if self.qualifier == 'forallvalues':
+                return all(self._test(policy_values, item) for item in _as_list(value))
+            return any(self._test(policy_values, item) for item in _as_list(value))
+        except (AttributeError, TypeError, ValueError):
+            return False
+
+    def _test(self, policy_values, value):
+        matched = any(self._compare(policy_value, value) for policy_value in policy_values)
+        return not matched if self.negated else matched
+
+    def _resolve(self, context):
+        """
+        Substitute ${policy:variables} from the context.
+
+        A value naming a variable the request lacks (and that has no default)
+        matches nothing and is dropped; None means a variable is not known.
+        """
+        resolved = []
+        for policy_value in self.values:
+            if isinstance(policy_value, str) and '${' in policy_value:
+                missing = []
+
+                def substitute(match):
+                    variable, _, default = match.group(1).partition(',')
+                    variable = variable.strip().lower()
+                    if variable not in context:
+                        missing.append('unknown')
+                    elif context[variable] is not ABSENT:
+                        return str(context[variable])
+                    elif default:
+                        return default.strip().strip("'")
+                    else:
+                        missing.append('absent')
+                    return ''
+
+                policy_value = POLICY_VARIABLE.sub(substitute, policy_value)
+                if 'unknown' in missing:
+                    return None
+                if missing:
+                    continue
+            resolved.append(policy_value)
+        return resolved
+
+def compile_conditions(condition):
+    """The clauses of a statement's Condition block, in document order."""
+    return tuple(
+        ConditionClause(operator, key, values)
+        for operator, tests in (condition or {}).items()
+        for key, values in tests.items()
+    )
+
+def evaluate_conditions(clauses, context):
+    """True, False or None (undecided) for all of a statement's clauses against a context."""
+    return combine(clause.evaluate(context) for clause in clauses)
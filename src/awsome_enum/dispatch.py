@@ -0,0 +1,69 @@
+from functools import lru_cache
+from .matcher import compile_pattern, has_wildcard
+
+class DispatchIndex:
+    """
+    Maps IAM actions, concrete or wildcard, to the handlers that cover them.
+
+    Built from a service's ACTION_HANDLERS table (concrete action -> handler
+    method name). A concrete action looks up its handlers directly; a pattern
+    such as 'ecs:*' or 'codebuild:List*' is matched once against every
+    concrete action and the answer is kept, so later lookups are a dict hit.
+    Handlers come back in table order, each named once. Explicit actions
+    (ones that change state) are only reached by naming them, never through
+    a wildcard.
+    """
+
+    def __init__(self, action_handlers, explicit_actions=()):
+        self._explicit = {action.lower() for action in explicit_actions}
+        self._exact = {}
+        self._names = {action.lower(): action for action in action_handlers}
+        for action, handler in action_handlers.items():
+            handlers = self._exact.setdefault(action.lower(), [])
+            if handler not in handlers:
+                handlers.append(handler)
+        self._resolved = {}
+
+    def handlers(self, action):
+        """
+        Handler method names covering an action.
+
+        Args:
+            action (str): An IAM action or pattern from a policy (e.g. 'ecs:ListTasks', 'ecs:*', '*')
+
+        Returns:
+            tuple: The handler names, empty if nothing handles the action
+        """
+        key = action.lower()
+        handlers = self._resolved.get(key)
+        if handlers is None:
+            if has_wildcard(action):
+                pattern = compile_pattern(action)
+                handlers = tuple(dict.fromkeys(
+                    handler
+                    for concrete, names in self._exact.items()
+                    if concrete not in self._explicit and pattern.match(concrete)
+                    for handler in names
+                ))
+            else:
+                handlers = tuple(self._exact.get(key, ()))
+            self._resolved[key] = handlers
+        return handlers
+
+    def actions(self, action, handler):
+        """The concrete actions through which an action (or pattern) reaches a handler."""
+        if not has_wildcard(action):
+            return (self._names[action.lower()],) if handler in self._exact.get(action.lower(), ()) else ()
+        pattern = compile_pattern(action)
+        return tuple(
+            self._names[concrete] for concrete, names in self._exact.items()
+            if handler in names and concrete not in self._explicit and pattern.match(concrete)
+        )
+
+    def __contains__(self, action):
+        return bool(self.handlers(action))
+
+@lru_cache(maxsize=None)
+def dispatch_index(service_class):
+    """The DispatchIndex of a service class, built on first use and shared by all its instances."""
+    return DispatchIndex(service_class.ACTION_HANDLERS, service_class.EXPLICIT_ACTIONS)
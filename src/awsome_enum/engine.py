@@ -0,0 +1,206 @@
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import AsyncExitStack
+from .budget import EnumerationTimeout, current_deadline, deadline_at
+
+ENGINES = ('threads', 'async')
+DEFAULT_ENGINE = 'threads'
+DEFAULT_ASYNC_CONCURRENCY = 32
+DEFAULT_THREAD_FANOUT = 4
+
+class ThreadEngine:
+    """
+    Default execution backend.
+
+    The calls of one call_many() are spread over the calling thread and up
+    to fanout - 1 short-lived daemon helpers, each running under the
+    caller's deadline. Concurrency across resources still comes from the
+    scheduler running several enumeration units at once.
+    """
+
+    name = 'threads'
+
+    def __init__(self, fanout=DEFAULT_THREAD_FANOUT):
+        self.fanout = max(1, fanout)
+        # Batch chunks handed over per call_many(); small enough to keep batched listings streaming
+        self.batch_window = self.fanout
+
+    def call_many(self, client, operation, params_list):
+        """
+        Run one operation for every params dict, up to fanout at a time.
+
+        Returns:
+            list: The responses in params_list order; a failed call yields its exception instead
+        """
+        results = [None] * len(params_list)
+        indexes = iter(range(len(params_list)))
+        lock = threading.Lock()
+        deadline = current_deadline()
+        timeouts = []
+
+        def work():
+            with deadline_at(deadline):
+                while True:
+                    with lock:
+                        index = next(indexes, None)
+                    if index is None:
+                        return
+                    try:
+                        results[index] = getattr(client, operation)(**params_list[index])
+                    except EnumerationTimeout as e:
+                        timeouts.append(e)
+                        return
+                    except Exception as e:
+                        results[index] = e
+
+        helpers = [
+            threading.Thread(target=work, name='awsome-enum-fanout', daemon=True)
+            for _ in range(min(self.fanout, len(params_list)) - 1)
+        ]
+        for helper in helpers:
+            helper.start()
+        work()
+        for helper in helpers:
+            helper.join()
+        if timeouts:
+            raise timeouts[0]
+        return results
+
+    def close(self):
+        pass
+
+# Deadline of the unit whose calls a coroutine runs; the event loop thread has no unit of its own
+_call_deadline = contextvars.ContextVar('call_deadline', default=None)
+
+def _check_call_deadline(**kwargs):
+    """budget.check_deadline for async clients, registered as their 'before-call' handler."""
+    deadline = _call_deadline.get()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise EnumerationTimeout()
+
+class AsyncEngine:
+    """
+    asyncio execution backend built on aiobotocore.
+
+    A single event loop runs on a background thread and every service submits
+    its per-resource follow-up calls to it, so hundreds of requests can be in
+    flight without a thread per call. Async clients mirror the service name,
+    region and credentials of the boto3 client they stand in for, and are set
+    up like the ClientPool's: standard retries, the run's rate limiter and the
+    calling unit's deadline.
+    """
+
+    name = 'async'
+
+    def __init__(self, session, endpoint_url=None, concurrency=DEFAULT_ASYNC_CONCURRENCY, rate_limiter=None):
+        try:
+            from aiobotocore.config import AioConfig
+            from aiobotocore.session import get_session
+        except ImportError:
+            raise RuntimeError("The async engine requires aiobotocore (pip install 'awsome-enum[async]')")
+
+        self.session = session
+        self.endpoint_url = endpoint_url
+        self.concurrency = max(1, concurrency)
+        self.batch_window = self.concurrency
+        self._aio_session = get_session()
+        self.rate_limiter = rate_limiter
+        self._aio_config = AioConfig(
+            max_pool_connections=self.concurrency,
+            retries=rate_limiter.client_config.retries if rate_limiter is not None else None
+        )
+        self._clients = {}
+        self._exit_stack = None
+        self._semaphore = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def call_many(self, client, operation, params_list):
+        """
+        Run one operation for every params dict concurrently on the event loop.
+
+        Args:
+            client: The boto3 client whose service and region should be called
+            operation (str): The boto3 method name (e.g. 'get_function')
+            params_list (list): One dict of API parameters per call
+
+        Returns:
+            list: The responses in params_list order; a failed call yields its exception instead
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self._gather(client, operation, params_list, current_deadline()), loop
+        )
+        return future.result()
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='awsome-enum-async', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def _gather(self, client, operation, params_list, deadline=None):
+        _call_deadline.set(deadline)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._exit_stack = AsyncExitStack()
+        aio_client = await self._get_client(client)
+        return await asyncio.gather(*(self._call(aio_client, operation, params) for params in params_list))
+
+    async def _call(self, aio_client, operation, params):
+        async with self._semaphore:
+            try:
+                return await getattr(aio_client, operation)(**params)
+            except Exception as e:
+                return e
+
+    async def _get_client(self, client):
+        key = (client.meta.service_model.service_name, client.meta.region_name)
+        future = self._clients.get(key)
+        if future is None:
+            # Stored before the first await so concurrent callers share one client
+            future = self._clients[key] = asyncio.ensure_future(self._create_client(*key))
+        return await future
+
+    async def _create_client(self, service_name, region_name):
+        credentials = self.session.get_credentials().get_frozen_credentials()
+        aio_client = await self._exit_stack.enter_async_context(self._aio_session.create_client(
+            service_name,
+            region_name=region_name,
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=credentials.access_key,
+            aws_secret_access_key=credentials.secret_key,
+            aws_session_token=credentials.token,
+            config=self._aio_config
+        ))
+        if self.rate_limiter is not None:
+            self.rate_limiter.attach(aio_client, asynchronous=True)
+        aio_client.meta.events.register('before-call', _check_call_deadline)
+        return aio_client
+
+    async def _close_clients(self):
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._clients.clear()
+
+def create_engine(name, session, endpoint_url=None, rate_limiter=None):
+    if name == 'async':
+        return AsyncEngine(session, endpoint_url=endpoint_url, rate_limiter=rate_limiter)
+    return ThreadEngine()
@@ -1,38 +1,268 @@
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
 import boto3
-from .utils import print_cyan, print_red
+from .utils import print_cyan, print_red, print_yellow
 from .services import AVAILABLE_SERVICES
+from .scheduler import DeepEnumerationScheduler, DEFAULT_MAX_WORKERS
+from .cache import ResponseCache, DiskCache, DEFAULT_MAX_ENTRIES
+from .engine import create_engine, DEFAULT_ENGINE
+from .ratelimit import RateLimiter, DEFAULT_RATE
+from .clients import ClientPool
+from .session_context import SessionContext
+from .budget import EnumerationTimeout, time_limit
+from .output import emit, ERROR
+
+class ServiceRegistry(Mapping):
+    """
+    Lazily instantiated view over AVAILABLE_SERVICES.
+
+    Membership and iteration only look at the service names; a service (and
+    its boto3 clients) is only built the first time it is looked up. Looking
+    a service up by name returns the instance bound to the session's default
+    region, while regional() returns one instance per region to fan out to.
+    """
+
+    def __init__(self, factory, on_create=None, region_resolver=None):
+        self._factory = factory
+        self._on_create = on_create
+        self._region_resolver = region_resolver
+        self._instances = {}
+        self._regions = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, service_name):
+        if service_name not in AVAILABLE_SERVICES:
+            raise KeyError(service_name)
+        return self.get_instance(service_name, None)
+
+    def __contains__(self, service_name):
+        return service_name in AVAILABLE_SERVICES
+
+    def __iter__(self):
+        return iter(AVAILABLE_SERVICES)
+
+    def __len__(self):
+        return len(AVAILABLE_SERVICES)
+
+    def get_instance(self, service_name, region):
+        key = (service_name, region)
+        service = self._instances.get(key)
+        if service is not None:
+            return service
+
+        with self._lock:
+            service = self._instances.get(key)
+            if service is None:
+                service = self._factory(service_name, region)
+                self._instances[key] = service
+                if self._on_create:
+                    self._on_create(service_name, service)
+        return service
+
+    def regions(self, service_name):
+        """Regions the service fans out to, [None] when only the default region is used."""
+        regions = self._regions.get(service_name)
+        if regions is None:
+            resolved = self._region_resolver(self[service_name]) if self._region_resolver else None
+            regions = self._regions[service_name] = list(resolved or [None])
+        return regions
+
+    def regional(self, service_name):
+        if service_name not in AVAILABLE_SERVICES:
+            raise KeyError(service_name)
+        return [self.get_instance(service_name, region) for region in self.regions(service_name)]
+
+    def service_class(self, service_name):
+        """The class implementing a service, without building an instance."""
+        return AVAILABLE_SERVICES.get(service_name)
+
+    def is_loaded(self, service_name):
+        # Scheduler threads may be adding instances while this looks
+        with self._lock:
+            keys = list(self._instances)
+        return any(name == service_name for name, _ in keys)
 
 class AWSEnumerator:
 
-    def __init__(self, profile=None, debug=False):
-        self.session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+    def __init__(self, profile=None, debug=False, threads=DEFAULT_MAX_WORKERS, page_size=None, max_items=None,
+                 cache_size=DEFAULT_MAX_ENTRIES, cache_ttl=None, use_cache=True, regions=None,
+                 engine=DEFAULT_ENGINE, endpoint_url=None, rate_limit=DEFAULT_RATE, deep=None,
+                 timeout=None, service_timeout=None, session=None, plan=False):
+        if session is None:
+            session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+        self.session = session
         self.debug = debug
-        self.services = {}
-        self._initialize_services()
-    
-    def _initialize_services(self):
-        for service_name in AVAILABLE_SERVICES:
-            self.services[service_name] = AVAILABLE_SERVICES[service_name](
-                session=self.session,
-                debug=self.debug    
+        self.endpoint_url = endpoint_url
+        self.page_size = page_size
+        self.max_items = max_items
+        self.deep = deep
+        self.plan = plan
+        self.timeout = timeout
+        self.scheduler = DeepEnumerationScheduler(max_workers=threads, service_budget=service_timeout)
+        self.rate_limiter = RateLimiter(rate=rate_limit) if rate_limit else None
+        self.client_pool = ClientPool(
+            self.session,
+            endpoint_url=endpoint_url,
+            max_pool_connections=threads,
+            rate_limiter=self.rate_limiter
+        )
+        self.session_context = SessionContext(self.client_pool)
+        self.response_cache = self._create_response_cache(cache_size, cache_ttl) if use_cache else None
+        self.engine = create_engine(engine, self.session, endpoint_url=endpoint_url, rate_limiter=self.rate_limiter)
+        self._requested_regions = regions
+        self._regions = None
+        self._regions_lock = threading.Lock()
+        self.services = ServiceRegistry(
+            self._create_service,
+            on_create=self._configure_service,
+            region_resolver=self._regions_for_service
+        )
+
+    def _create_response_cache(self, cache_size, cache_ttl):
+        store = self._open_disk_cache(cache_ttl) if cache_ttl else None
+        if not cache_size and store is None:
+            return None
+        return ResponseCache(max_entries=cache_size, store=store)
+
+    def _open_disk_cache(self, cache_ttl):
+        try:
+            return DiskCache(
+                lambda: (self.session_context.account_id, self.session_context.arn),
+                ttl=cache_ttl
             )
-            
-        # Pass all service instances to the IAM service
-        self.services['iam'].set_available_services(self.services)
-    
-    def get_service_instance(self, service_name):
-        if service_name not in self.services:
-            self.services[service_name] = AVAILABLE_SERVICES[service_name](
-                session=self.session,
-                debug=self.debug    
+        except Exception as e:
+            print_red(f"Persistent cache disabled: {str(e)}")
+            return None
+
+    @property
+    def regions(self):
+        """The regions regional services fan out to, None for the session's own; 'all' is resolved on first use."""
+        if self._regions is None and self._requested_regions:
+            with self._regions_lock:
+                if self._regions is None:
+                    self._regions = self._resolve_regions(self._requested_regions)
+        return self._regions
+
+    def _resolve_regions(self, regions):
+        if regions == 'all':
+            return self._enabled_regions()
+        return list(dict.fromkeys(regions))
+
+    def _enabled_regions(self):
+        try:
+            response = self.client_pool.get('ec2').describe_regions()
+            return sorted(region['RegionName'] for region in response['Regions'])
+        except Exception as e:
+            regions = self.session.get_available_regions('ec2')
+            print_yellow(
+                f"[!] Could not list the account's enabled regions ({str(e)}); "
+                f"falling back to all {len(regions)} regions of the partition, some of which may not be enabled"
             )
-            
+            return regions
+
+    def _regions_for_service(self, service):
+        if not service.REGIONAL or not self.regions:
+            return None
+        available = set(self.session.get_available_regions(service.service_name))
+        return [region for region in self.regions if not available or region in available]
+
+    def _create_service(self, service_name, region=None):
+        service = AVAILABLE_SERVICES[service_name](
+            session=self.session,
+            debug=self.debug
+        )
+        service.set_region(region)
+        service.set_client_pool(self.client_pool)
+        service.set_session_context(self.session_context)
+        service.set_endpoint_url(self.endpoint_url)
+        service.set_engine(self.engine)
+        service.set_rate_limiter(self.rate_limiter)
+        return service
+
+    def _configure_service(self, service_name, service):
+        service.set_pagination(page_size=self.page_size, max_items=self.max_items)
+        service.set_response_cache(self.response_cache)
+        if service_name == 'iam':
+            # Pass all service instances to the IAM service
+            service.set_available_services(self.services)
+            service.set_scheduler(self.scheduler)
+            service.set_deep(self.deep)
+            service.set_plan(self.plan)
+
+    def get_service_instance(self, service_name):
         return self.services[service_name]
-    
+
+    def enumerate_service(self, service_name):
+        """Enumerate a service in every configured region, one region section after another."""
+        with self._time_limit():
+            services = self.services.regional(service_name)
+            if len(services) == 1 and services[0].region is None:
+                with time_limit(self.scheduler.budget_for(service_name)):
+                    return services[0].enumerate()
+
+            for service in services:
+                self.scheduler.submit(service_name, self._enumerate_region, service, region=service.region)
+            self.scheduler.run()
+
+    def _enumerate_region(self, service):
+        print_cyan(f"\n[Region: {service.region}]")
+        service.enumerate()
+
     def enumerate_all_services(self):
         service_name='iam'
         service = self.get_service_instance(service_name)
         if not service:
             return {"error": f"Service '{service_name}' not available"}
-            
-        return service.enumerate()
\ No newline at end of file
+
+        with self._time_limit():
+            return service.enumerate()
+
+    @contextmanager
+    def _time_limit(self):
+        """Bound the block by the overall timeout and report when it runs out."""
+        try:
+            with time_limit(self.timeout):
+                yield
+        except EnumerationTimeout:
+            message = "Time limit reached; enumeration stopped and the results are incomplete"
+            print_red(f"\n[!] {message}")
+            emit(ERROR, code='EnumerationTimeout', message=message)
+
+    def close(self):
+        self.engine.close()
+        self.client_pool.close()
+        if self.response_cache is not None and self.response_cache.store:
+            self.response_cache.store.close()
+
+    def print_run_summary(self):
+        if self.rate_limiter is not None:
+            self._print_rate_summary()
+        if not self.debug:
+            return
+        if self.response_cache is not None:
+            stats = self.response_cache.stats()
+            print_cyan(
+                f"\n[debug] Response cache: {stats['hits']} hits, {stats['disk_hits']} disk hits, "
+                f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+                f"{stats['entries']}/{stats['max_entries']} entries, {stats['evictions']} evictions"
+            )
+            if self.response_cache.store:
+                print_cyan(f"[debug] Persistent cache: {self.response_cache.store.path}")
+
+    def _print_rate_summary(self):
+        summary = self.rate_limiter.summary()
+        # Only worth a line outside --debug when AWS pushed back
+        if not (self.debug or summary['throttles']):
+            return
+        color = print_red if summary['throttles'] else print_cyan
+        color(
+            f"\n[*] API calls: {summary['requests']} requests, {summary['throttles']} throttled, "
+            f"{summary['retries']} retries, {summary['requests_per_second']:.1f} requests/s"
+        )
+        if self.debug:
+            for (service, region), stats in sorted(summary['endpoints'].items(), key=lambda item: (item[0][0], item[0][1] or '')):
+                print_cyan(
+                    f"[debug]   {service} ({region}): {stats['requests']} requests, {stats['throttles']} throttled, "
+                    f"{stats['retries']} retries, {stats['waited']:.1f}s paced, {stats['rate']:.1f} requests/s allowed"
+                )
@@ -0,0 +1,353 @@
+import re
+from .conditions import ABSENT, POLICY_VARIABLE, evaluate_conditions
+from .matcher import compile_pattern, has_wildcard, split_action
+from .policy_store import PolicyStore, Statement
+
+# Decisions, in the order IAM reaches them
+EXPLICIT_DENY = 'ExplicitDeny'
+ALLOWED = 'Allowed'
+CONDITIONAL = 'Conditional'
+IMPLICIT_DENY = 'ImplicitDeny'
+
+def overlaps(statement, resource):
+    """Whether a statement may cover some of the resources a wildcard ARN stands for."""
+    if statement.covers_resource(resource) or statement.not_resources:
+        return True
+    query = compile_pattern(resource, ignore_case=False)
+    return any(query.match(pattern) for pattern in statement.resources)
+
+class ResourceSet:
+    """
+    The resources covered by a group of statements, matched in one step.
+
+    Exact ARNs go in one set and every glob into one combined expression;
+    NotResource statements, which are rare, are checked one by one.
+    """
+
+    __slots__ = ('everything', 'exact', 'globs', 'others', 'patterns')
+
+    def __init__(self, statements):
+        patterns = [pattern for statement in statements if not statement.not_resources for pattern in statement.resources]
+        self.everything = '*' in patterns
+        self.exact = frozenset(pattern for pattern in patterns if not has_wildcard(pattern))
+        globs = [compile_pattern(pattern, ignore_case=False).pattern for pattern in patterns if has_wildcard(pattern)]
+        self.globs = re.compile('|'.join(f"(?:{glob})" for glob in globs), re.DOTALL) if globs else None
+        self.others = tuple(statement for statement in statements if statement.not_resources)
+        self.patterns = tuple(patterns)
+
+    def __bool__(self):
+        return self.everything or bool(self.exact) or self.globs is not None or bool(self.others)
+
+    def covers(self, resource):
+        return (
+            self.everything or resource in self.exact
+            or (self.globs is not None and self.globs.match(resource) is not None)
+            or any(statement.covers_resource(resource) for statement in self.others)
+        )
+
+    def overlaps(self, resource):
+        """Whether some of the resources a wildcard ARN stands for are covered."""
+        if self.covers(resource) or self.others:
+            return True
+        query = compile_pattern(resource, ignore_case=False)
+        return any(query.match(pattern) for pattern in self.patterns)
+
+class PolicyEvaluator:
+    """
+    Answers "is this action on this resource allowed?" for one principal's policies.
+
+    Statements are compiled once: each is filed under the service prefixes of
+    its Action patterns (NotAction statements and patterns with a wildcard
+    service, such as '*', under every service), and its conditions are
+    evaluated up front against the principal's known context. Statements the
+    context rules out are dropped. The statements covering a concrete action
+    are resolved once and their resources merged per outcome, so a query is a
+    dict hit plus at most four set lookups and regular-expression matches.
+
+    An explicit Deny wins over any Allow, and nothing allowed is an implicit
+    deny. Conditions are three-valued: a statement whose condition keys are
+    not all known (tags, source IP, the request's own parameters) yields
+    CONDITIONAL instead of a definite answer.
+    """
+
+    def __init__(self, documents=(), context=None, store=None):
+        """
+        Args:
+            documents (list): Identity policy documents (dicts or URL-encoded JSON)
+            context (dict): Condition key -> value the principal's requests are known to carry
+                            (ABSENT for keys known to be missing); other keys are undecided
+            store (PolicyStore): Interns the parsed statements (defaults to a private store)
+        """
+        store = store or PolicyStore()
+        self.context = {key.lower(): value for key, value in (context or {}).items()}
+        self.statements = []
+        self._by_service = {}
+        self._global = []
+        self._actions = {}
+        for document in documents:
+            self.add_statements(store.statements(document))
+
+    def add_statements(self, statements):
+        """Compile more statements (e.g. another attached policy) into the index."""
+        for statement in statements:
+            state = evaluate_conditions(statement.conditions, self.context) if statement.conditions else True
+            if state is False:
+                continue
+            if any('${' in pattern for pattern in statement.resources + statement.not_resources):
+                parts = self._substitute(statement, state)
+            else:
+                parts = [(statement, state)]
+            for statement, state in parts:
+                self._index(statement, state)
+        self._actions.clear()
+
+    def _index(self, statement, state):
+        entry = (len(self.statements), statement, state)
+        self.statements.append(entry)
+        services = set()
+        for pattern in (statement.actions if not statement.not_actions else ('*',)):
+            service, _ = split_action(pattern)
+            services.add(None if not service or has_wildcard(service) else service)
+        if None in services:
+            self._global.append(entry)
+        else:
+            for service in services:
+                self._by_service.setdefault(service, []).append(entry)
+
+    def _substitute(self, statement, state):
+        """
+        The statement with ${aws:username}-style variables in its resources filled from the context.
+
+        A pattern naming a variable the context knows to be missing matches
+        nothing, as in IAM. A variable the context does not know at all could
+        hold any value, so its pattern is widened to '*' in its place: the
+        statement keeps only what it covers for certain, and an undecided copy
+        covers the resources the widened pattern may match, making their
+        decisions CONDITIONAL instead of dropping the pattern.
+
+        Returns:
+            list: (statement, state) pairs to index
+        """
+        def variable(match):
+            return match.group(1).partition(',')[0].strip().lower()
+
+        def resolve(patterns):
+            resolved, widened = [], []
+            for pattern in patterns:
+                variables = [variable(match) for match in POLICY_VARIABLE.finditer(pattern)]
+                if any(name in self.context and self.context[name] is ABSENT for name in variables):
+                    continue
+                value = POLICY_VARIABLE.sub(lambda match: str(self.context.get(variable(match), '*')), pattern)
+                (resolved if all(name in self.context for name in variables) else widened).append(value)
+            return resolved, widened
+
+        def copy(resources=None, not_resources=None):
+            copied = Statement({
+                'Effect': 'Allow' if statement.allow else 'Deny',
+                'Action': list(statement.actions) or None,
+                'NotAction': list(statement.not_actions) or None,
+                'Resource': resources,
+                'NotResource': not_resources,
+            })
+            copied.conditions = statement.conditions
+            return copied
+
+        if statement.not_resources:
+            resolved, widened = resolve(statement.not_resources)
+            if not resolved and not widened:
+                # Every exclusion names a missing variable and excludes nothing
+                parts = [(copy(resources=['*']), state)]
+            else:
+                # Excluding everything the widened patterns may match leaves what is covered for certain
+                parts = [(copy(not_resources=resolved + widened), state)]
+        else:
+            resolved, widened = resolve(statement.resources)
+            parts = [(copy(resources=resolved), state)] if resolved else []
+        if widened:
+            # A NotResource statement still excludes its resolved patterns for certain
+            excluded = resolved if statement.not_resources else None
+            parts.append((copy(resources=widened, not_resources=excluded or None), None))
+        return parts
+
+    def _for_action(self, action):
+        """
+        The statements covering a concrete action, compiled for that action.
+
+        Returns:
+            tuple: (deny entries, allow entries, and a ResourceSet for each of
+                    definite deny, conditional deny, definite allow and conditional allow)
+        """
+        key = action.lower()
+        compiled = self._actions.get(key)
+        if compiled is None:
+            service, _ = split_action(action)
+            candidates = sorted(self._by_service.get(service, []) + self._global, key=lambda entry: entry[0])
+            covering = [entry for entry in candidates if entry[1].covers_action(action)]
+            denies = tuple(entry for entry in covering if not entry[1].allow)
+            allows = tuple(entry for entry in covering if entry[1].allow)
+            compiled = self._actions[key] = (denies, allows) + tuple(
+                ResourceSet([statement for _, statement, state in entries if state is decided])
+                for entries in (denies, allows) for decided in (True, None)
+            )
+        return compiled
+
+    def evaluate(self, action, resource, context=None):
+        """
+        Decide a request.
+
+        Args:
+            action (str): A concrete action (e.g. 's3:GetObject')
+            resource (str): The resource ARN ('*' for actions that take none, or a
+                            wildcard ARN standing for every resource it matches)
+            context (dict): Extra condition keys of this request (e.g. {'s3:prefix': 'logs/'})
+
+        Returns:
+            str: EXPLICIT_DENY, ALLOWED, CONDITIONAL or IMPLICIT_DENY
+        """
+        denies, allows, denied, maybe_denied, allowed, maybe_allowed = self._for_action(action)
+        if context:
+            return self._evaluate_request(denies, allows, resource, context)
+
+        # A wildcard resource (from a policy) is allowed if any resource it
+        # stands for is, and denied only if a Deny covers all of them
+        grants = ResourceSet.overlaps if has_wildcard(resource) else ResourceSet.covers
+        if denied and denied.covers(resource):
+            return EXPLICIT_DENY
+        if allowed and grants(allowed, resource):
+            return CONDITIONAL if maybe_denied and maybe_denied.covers(resource) else ALLOWED
+        if maybe_allowed and grants(maybe_allowed, resource):
+            return CONDITIONAL
+        return IMPLICIT_DENY
+
+    def _evaluate_request(self, denies, allows, resource, context):
+        """Statement-by-statement evaluation, re-checking conditions against the request's own keys."""
+        request = dict(self.context)
+        request.update((key.lower(), value) for key, value in context.items())
+
+        maybe_denied = False
+        for _, statement, state in denies:
+            if statement.covers_resource(resource):
+                if statement.conditions:
+                    state = evaluate_conditions(statement.conditions, request)
+                if state is True:
+                    return EXPLICIT_DENY
+                if state is None:
+                    maybe_denied = True
+
+        grants = overlaps if has_wildcard(resource) else Statement.covers_resource
+        decision = IMPLICIT_DENY
+        for _, statement, state in allows:
+            if grants(statement, resource):
+                if statement.conditions:
+                    state = evaluate_conditions(statement.conditions, request)
+                if state is True:
+                    decision = ALLOWED
+                    break
+                if state is None:
+                    decision = CONDITIONAL
+
+        if maybe_denied and decision == ALLOWED:
+            return CONDITIONAL
+        return decision
+
+    def allows(self, action, resource, context=None):
+        """True only for a definite Allow."""
+        return self.evaluate(action, resource, context) == ALLOWED
+
+    def may_allow(self, action, resource, context=None):
+        """True unless the request is definitely denied (explicitly or implicitly)."""
+        return self.evaluate(action, resource, context) in (ALLOWED, CONDITIONAL)
+
+def intersect(decisions):
+    """
+    Combine the decisions of policy layers that must all allow a request.
+
+    Any explicit Deny wins, then any implicit deny (a layer that grants
+    nothing), then any undecided layer; only unanimous Allows are allowed.
+    """
+    decisions = set(decisions)
+    for decision in (EXPLICIT_DENY, IMPLICIT_DENY, CONDITIONAL):
+        if decision in decisions:
+            return decision
+    return ALLOWED
+
+class EffectivePermissions:
+    """
+    A principal's identity policies intersected with its permissions boundary
+    and the service control policies (SCPs) above its account.
+
+    Each layer is a PolicyEvaluator compiled once; SCPs form one layer per
+    level of the organization (root, each OU, the account), since a request
+    must be allowed at every level. Decisions for calls without request
+    context are kept, so each (action, resource) is intersected once per
+    principal however many checks ask for it.
+
+    A layer that applies but could not be read (SCPs seen from a member
+    account, say) is named in unread for the caller to report; decisions
+    come from the layers that were read.
+    """
+
+    def __init__(self, identity, boundary=None, scps=(), unread=()):
+        """
+        Args:
+            identity (PolicyEvaluator): The principal's identity policies
+            boundary (PolicyEvaluator): Its permissions boundary, None if it has none
+            scps (list): One PolicyEvaluator per organization level, root first (empty outside an organization)
+            unread (list): Names of the layers that could not be read (e.g. ['SCPs'])
+        """
+        self.identity = identity
+        self.boundary = boundary
+        self.scps = tuple(scps)
+        self.unread = tuple(unread)
+        self.layers = (identity,) + ((boundary,) if boundary is not None else ()) + self.scps
+        self._decisions = {}
+
+    def evaluate(self, action, resource, context=None):
+        """
+        Decide a request against every layer.
+
+        Returns:
+            str: EXPLICIT_DENY, ALLOWED, CONDITIONAL or IMPLICIT_DENY
+        """
+        if context:
+            return intersect(layer.evaluate(action, resource, context) for layer in self.layers)
+        key = (action.lower(), resource)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decisions[key] = intersect(layer.evaluate(action, resource) for layer in self.layers)
+        return decision
+
+    def allows(self, action, resource, context=None):
+        """True only for a definite Allow."""
+        return self.evaluate(action, resource, context) == ALLOWED
+
+    def may_allow(self, action, resource, context=None):
+        """True unless the request is definitely denied (explicitly or implicitly)."""
+        return self.evaluate(action, resource, context) in (ALLOWED, CONDITIONAL)
+
+def principal_context(session_context, role_arn=None):
+    """
+    Global condition keys known for every request of the run's principal.
+
+    Args:
+        session_context (SessionContext): The run's caller identity
+        role_arn (str): The assumed role's own ARN, path included (from iam:GetRole or
+                        the IAM snapshot); without it the ARN is rebuilt with no path
+
+    Returns:
+        dict: Condition key -> value, ABSENT for keys this kind of principal never sends
+    """
+    principal_type = session_context.principal_type
+    arn = session_context.arn
+    if principal_type == 'role' and ':assumed-role/' in arn:
+        arn = role_arn or f"{session_context.arn_prefix('iam')}{session_context.account_id}:role/{session_context.principal_name}"
+    return {
+        'aws:PrincipalArn': arn,
+        'aws:PrincipalAccount': session_context.account_id,
+        'aws:PrincipalType': {
+            'user': 'User', 'role': 'AssumedRole', 'root': 'Account', 'federated-user': 'FederatedUser'
+        }[principal_type],
+        'aws:userid': session_context.user_id,
+        'aws:username': session_context.principal_name if principal_type == 'user' else ABSENT,
+        'aws:SecureTransport': 'true',
+    }
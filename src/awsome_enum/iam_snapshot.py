@@ -0,0 +1,106 @@
+import json
+from urllib.parse import unquote
+
+# Response lists of GetAccountAuthorizationDetails
+DETAIL_KEYS = ('UserDetailList', 'GroupDetailList', 'RoleDetailList', 'Policies')
+
+# Entries of a user/group/role detail that list its policies rather than describe it
+POLICY_KEYS = (
+    'UserPolicyList', 'GroupPolicyList', 'RolePolicyList', 'AttachedManagedPolicies',
+    'InstanceProfileList', 'GroupList'
+)
+
+def load_document(document):
+    """Policy documents arrive as dicts from boto3, or URL-encoded JSON from raw API output."""
+    if isinstance(document, str):
+        return json.loads(unquote(document))
+    return document or {}
+
+class IAMSnapshot:
+    """
+    In-memory copy of an account's IAM configuration.
+
+    Built from the pages of GetAccountAuthorizationDetails, which return every
+    user, group and role with its inline and attached policies, plus every
+    version of the managed policies in use, in a handful of requests. Users,
+    groups and roles are indexed by ARN and by name (IAM names are unique
+    regardless of case) and managed policies by ARN, so lookups that would
+    otherwise cost one API call each are answered locally.
+    """
+
+    def __init__(self, details):
+        self.details = {key: list(details.get(key, [])) for key in DETAIL_KEYS}
+        self.users = {user['Arn']: user for user in self.details['UserDetailList']}
+        self.groups = {group['Arn']: group for group in self.details['GroupDetailList']}
+        self.roles = {role['Arn']: role for role in self.details['RoleDetailList']}
+        self.policies = {policy['Arn']: policy for policy in self.details['Policies']}
+        self._users_by_name = {user['UserName'].lower(): user for user in self.users.values()}
+        self._groups_by_name = {group['GroupName'].lower(): group for group in self.groups.values()}
+        self._roles_by_name = {role['RoleName'].lower(): role for role in self.roles.values()}
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Merge the pages of a GetAccountAuthorizationDetails paginator into one snapshot."""
+        details = {key: [] for key in DETAIL_KEYS}
+        for page in pages:
+            for key, items in details.items():
+                items.extend(page.get(key, []))
+        return cls(details)
+
+    def __repr__(self):
+        return (f"IAMSnapshot({len(self.users)} users, {len(self.groups)} groups, "
+                f"{len(self.roles)} roles, {len(self.policies)} policies)")
+
+    def user(self, name):
+        return self._users_by_name.get(name.lower())
+
+    def group(self, name):
+        return self._groups_by_name.get(name.lower())
+
+    def role(self, name):
+        return self._roles_by_name.get(name.lower())
+
+    def get(self, arn):
+        """The user, group, role or managed policy with the given ARN, None if there is none."""
+        for index in (self.roles, self.users, self.groups, self.policies):
+            if arn in index:
+                return index[arn]
+        return None
+
+    def policy_document(self, policy_arn, version_id=None):
+        """
+        Document of a managed policy version.
+
+        Args:
+            policy_arn (str): The managed policy ARN
+            version_id (str): The version to read (defaults to the policy's default version)
+
+        Returns:
+            dict: The policy document, or None if the snapshot does not hold that version
+        """
+        policy = self.policies.get(policy_arn)
+        if policy is None:
+            return None
+        version_id = version_id or policy.get('DefaultVersionId')
+        for version in policy.get('PolicyVersionList', []):
+            if version['VersionId'] == version_id or (version_id is None and version.get('IsDefaultVersion')):
+                return load_document(version.get('Document'))
+        return None
+
+    @staticmethod
+    def attached_policies(detail):
+        """[{'PolicyName', 'PolicyArn'}] attached to a user, group or role, as ListAttached*Policies returns them."""
+        return list(detail.get('AttachedManagedPolicies', []))
+
+    @staticmethod
+    def inline_policies(detail):
+        """(policy name, document) pairs of a user's, group's or role's inline policies."""
+        for key in ('UserPolicyList', 'GroupPolicyList', 'RolePolicyList'):
+            if key in detail:
+                return [(policy['PolicyName'], load_document(policy.get('PolicyDocument'))) for policy in detail[key]]
+        return []
+
+    @staticmethod
+    def summary(detail):
+        """A user, group or role without its policy lists, as the List* calls describe it."""
+        return {key: value for key, value in detail.items() if key not in POLICY_KEYS}
@@ -4,10 +4,15 @@ from .enumerator import AWSEnumerator
 from .utils import print_compact_logo, print_red, print_cyan, print_yellow
 from .services import AVAILABLE_SERVICES
 from .service_subcommands import SERVICE_SUBCOMMANDS
+from .scheduler import DEFAULT_MAX_WORKERS
+from .cache import DEFAULT_MAX_ENTRIES
+from .engine import ENGINES, DEFAULT_ENGINE
+from .ratelimit import DEFAULT_RATE
+from .output import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, add_sink, create_sink, close_sinks, publish
+from .orchestrator import (DEFAULT_ACCOUNT_WORKERS, parse_targets, read_targets_file, scan_accounts,
+                           print_account_section, print_accounts_report)
 
 def main():
-    print_compact_logo()
-    
     parser = argparse.ArgumentParser(
         description="AWSome-enum: AWS resource enumeration tool",
         add_help=False
@@ -15,13 +20,49 @@ def main():
     parser.add_argument("-h", "--help", action="store_true", help="Show help message and exit")
     parser.add_argument("-p", "--profile", help="Specify an AWS CLI profile")
     parser.add_argument("-d", "--debug", action="store_true", help="Enable debug output")
+    parser.add_argument("-t", "--threads", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Maximum number of concurrent API workers during deep enumeration")
+    parser.add_argument("--page-size", type=int, help="Items requested per page from list/describe APIs")
+    parser.add_argument("--max-items", type=int, help="Stop each listing after this many items")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help="Maximum API responses kept in the per-run cache (0 disables it)")
+    parser.add_argument("--cache-ttl", type=int, metavar="SECONDS",
+                        help="Persist API responses on disk and reuse them for this many seconds on later runs")
+    parser.add_argument("--no-cache", action="store_true", help="Disable all response caching")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE, metavar="RPS",
+                        help="Requests per second allowed per service and region (0 disables pacing)")
+    parser.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE,
+                        help="Backend for per-resource follow-up calls ('async' requires aiobotocore)")
+    parser.add_argument("--endpoint-url", help="Send all API calls to this endpoint (e.g. a local moto server)")
+    parser.add_argument("-y", "--yes", "--deep", dest="deep", action="store_true", default=None,
+                        help="Run detailed enumeration without asking (for cron, CI and other unattended runs)")
+    parser.add_argument("--plan", action="store_true",
+                        help="Print the detailed-enumeration plan and its call budget, then stop")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="Stop the whole enumeration after this many seconds")
+    parser.add_argument("--service-timeout", type=float, metavar="SECONDS",
+                        help="Time budget for each service during detailed enumeration")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT,
+                        help="Also stream findings as JSON Lines or a JSON array")
+    parser.add_argument("--output-file", metavar="PATH",
+                        help="Write structured output to PATH instead of stdout")
+    parser.add_argument("-r", "--regions",
+                        help="Comma-separated regions to enumerate regional services in, or 'all' for every enabled region")
+    parser.add_argument("--accounts",
+                        help="Comma-separated profiles and/or role ARNs to scan, each as its own account")
+    parser.add_argument("--accounts-file", metavar="PATH",
+                        help="File with one profile or role ARN per line to scan")
+    parser.add_argument("--account-workers", type=int, default=DEFAULT_ACCOUNT_WORKERS,
+                        help="Accounts scanned in parallel, each in its own process")
     parser.add_argument("-e", "--enumerate", dest="service", metavar="SERVICE", 
                         nargs="?", const="", 
                         help="Service to enumerate (e.g., iam, s3). Use without a value to enumerate all services.")
     
+    args, remaining = parser.parse_known_args()
+    setup_output(args)
+    print_compact_logo()
+    
     try:
-        args, remaining = parser.parse_known_args()                
-        
         if args.help:
             if args.service == "":
                 print_enumerate_help()
@@ -41,8 +82,10 @@ def main():
             return
 
         if args.service == "":
-            enumerator = AWSEnumerator(profile=args.profile, debug=args.debug)
-            enumerator.enumerate_all_services()
+            if args.accounts or args.accounts_file:
+                run_accounts(args, None)
+                return
+            run_enumeration(args, lambda enumerator: enumerator.enumerate_all_services())
             return
         
         service_name = args.service.lower()
@@ -51,11 +94,12 @@ def main():
             print_enumerate_help()
             return
         
-        enumerator = AWSEnumerator(profile=args.profile, debug=args.debug)
-        service = enumerator.get_service_instance(service_name)
+        if not remaining and (args.accounts or args.accounts_file):
+            run_accounts(args, service_name)
+            return
         
         if not remaining:
-            service.enumerate()
+            run_enumeration(args, lambda enumerator: enumerator.enumerate_service(service_name))
             return
         
         subcommand = remaining[0]
@@ -64,19 +108,118 @@ def main():
         if subcommand.lower() in ['-h', '--help']:
             print_service_subcommands(service_name)
             return
+
+        if args.accounts or args.accounts_file:
+            print_red("Service subcommands run against one account; use -p PROFILE instead of --accounts/--accounts-file.")
+            return
         
-        execute_service_command(service, service_name, subcommand, subcommand_args)
+        run_enumeration(args, lambda enumerator: execute_service_command(
+            enumerator.get_service_instance(service_name), service_name, subcommand, subcommand_args
+        ))
     
     except Exception as e:
         print_red(f"Error: {str(e)}")
         print_general_help()
         return
 
+def run_enumeration(args, work):
+    enumerator = create_enumerator(args)
+    try:
+        work(enumerator)
+        enumerator.print_run_summary()
+    finally:
+        enumerator.close()
+        close_sinks()
+
+def setup_output(args):
+    if args.output_format == DEFAULT_OUTPUT_FORMAT:
+        return
+    add_sink(create_sink(args.output_format, args.output_file))
+    if not args.output_file or args.output_file == '-':
+        # Keep stdout machine-readable; the colored report moves to stderr
+        sys.stdout = sys.stderr
+
+def create_enumerator(args):
+    return AWSEnumerator(profile=args.profile, **enumerator_options(args))
+
+def enumerator_options(args):
+    return dict(
+        debug=args.debug,
+        threads=args.threads,
+        page_size=args.page_size,
+        max_items=args.max_items,
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        use_cache=not args.no_cache,
+        regions=parse_regions(args.regions),
+        engine=args.engine,
+        endpoint_url=args.endpoint_url,
+        rate_limit=args.rate_limit,
+        deep=args.deep,
+        plan=args.plan,
+        timeout=args.timeout,
+        service_timeout=args.service_timeout
+    )
+
+def run_accounts(args, service_name):
+    values = args.accounts.split(',') if args.accounts else []
+    if args.accounts_file:
+        values += read_targets_file(args.accounts_file)
+    targets = parse_targets(values)
+    if not targets:
+        print_red("No accounts to scan.")
+        return
+
+    def show_result(result):
+        print_account_section(result)
+        for record in result['records']:
+            publish(record)
+
+    try:
+        results = scan_accounts(
+            targets,
+            profile=args.profile,
+            service=service_name,
+            account_workers=args.account_workers,
+            on_result=show_result,
+            **enumerator_options(args)
+        )
+        print_accounts_report(results)
+    finally:
+        close_sinks()
+
+def parse_regions(value):
+    if not value:
+        return None
+    if value.strip().lower() == 'all':
+        return 'all'
+    return [region.strip() for region in value.split(',') if region.strip()]
+
 def print_general_help():
     print_cyan("\nUsage: poetry run awsome-enum [-h] [-p PROFILE] [-e [SERVICE]] [subcommand] [args...]")
     print("\nOptions:")
     print("  -h, --help                 # Show help message and exit")
     print("  -p, --profile [PROFILE]    # Specify an AWS CLI profile")
+    print("  -d, --debug                # Enable debug output")
+    print(f"  -t, --threads [N]          # Concurrent API workers for deep enumeration (default: {DEFAULT_MAX_WORKERS})")
+    print("  --page-size [N]            # Items requested per page from list/describe APIs")
+    print("  --max-items [N]            # Stop each listing after N items")
+    print(f"  --cache-size [N]           # API responses kept in the per-run cache (default: {DEFAULT_MAX_ENTRIES}, 0 disables)")
+    print("  --cache-ttl [SECONDS]      # Persist API responses on disk and reuse them on later runs")
+    print("  --no-cache                 # Disable all response caching")
+    print("  -y, --yes, --deep          # Run detailed enumeration without prompting")
+    print("  --plan                     # Print the detailed-enumeration plan and call budget, then stop")
+    print("  --timeout [SECONDS]        # Stop the whole enumeration after SECONDS")
+    print("  --service-timeout [N]      # Give each service N seconds during detailed enumeration")
+    print("  --output-format [FORMAT]   # console (default), jsonl or json structured output")
+    print("  --output-file [PATH]       # Write structured output to PATH instead of stdout")
+    print("  -r, --regions [REGIONS]    # Comma-separated regions for regional services, or 'all'")
+    print(f"  --rate-limit [RPS]         # Requests per second per service and region (default: {DEFAULT_RATE:g}, 0 disables)")
+    print("  --engine [threads|async]   # Backend for per-resource follow-up calls (default: threads)")
+    print("  --endpoint-url [URL]       # Send all API calls to a custom endpoint (e.g. a local moto server)")
+    print("  --accounts [TARGETS]       # Comma-separated profiles and/or role ARNs to scan in parallel")
+    print("  --accounts-file [PATH]     # File with one profile or role ARN per line to scan")
+    print(f"  --account-workers [N]      # Accounts scanned in parallel (default: {DEFAULT_ACCOUNT_WORKERS})")
     print("  -e, --enumerate [SERVICE]  # Service to enumerate (e.g., iam, s3, lambda, etc.)")
     print("                               Use without a value to enumerate all services")
     
@@ -0,0 +1,45 @@
+import re
+from functools import lru_cache
+
+def has_wildcard(pattern):
+    return '*' in pattern or '?' in pattern
+
+@lru_cache(maxsize=8192)
+def compile_pattern(pattern, ignore_case=True):
+    """
+    Compile an IAM glob into an anchored regular expression.
+
+    '*' matches any run of characters (including ':' and '/') and '?' matches
+    exactly one, as in IAM Action and Resource elements. Compiled patterns are
+    cached, so every distinct pattern is translated only once per process.
+
+    Args:
+        pattern (str): The glob (e.g. 'iam:*Policy*', 'arn:aws:s3:::bucket/*')
+        ignore_case (bool): Actions are case-insensitive, resource ARNs are not
+
+    Returns:
+        re.Pattern: The compiled expression
+    """
+    parts = []
+    for char in pattern:
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    flags = re.IGNORECASE | re.DOTALL if ignore_case else re.DOTALL
+    return re.compile(''.join(parts) + r'\Z', flags)
+
+def matches(pattern, value, ignore_case=True):
+    """Return True if value matches the IAM glob pattern."""
+    if not has_wildcard(pattern):
+        return pattern.lower() == value.lower() if ignore_case else pattern == value
+    return compile_pattern(pattern, ignore_case).match(value) is not None
+
+def split_action(action):
+    """Split 'service:Name' into ('service', 'Name'); a bare '*' has no service part."""
+    service, sep, name = action.partition(':')
+    if not sep:
+        return '', action
+    return service.lower(), name
@@ -0,0 +1,198 @@
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+import boto3
+from tabulate import tabulate
+from .enumerator import AWSEnumerator
+from .output import CollectingSink, add_sink, remove_sink, reset_sinks, INTERESTING_PERMISSION, ERROR
+from .utils import print_cyan, print_green, print_red, print_yellow
+
+DEFAULT_ACCOUNT_WORKERS = 4
+ROLE_SESSION_NAME = 'awsome-enum'
+
+def parse_targets(values):
+    """
+    Normalize account targets given on the command line or in a file.
+
+    Args:
+        values (list): Profile names and role ARNs; blank entries and '#' comments are dropped
+
+    Returns:
+        list: The targets in order, without duplicates
+    """
+    targets = []
+    for value in values:
+        value = value.split('#', 1)[0].strip()
+        if value and value not in targets:
+            targets.append(value)
+    return targets
+
+def read_targets_file(path):
+    with open(path, encoding='utf-8') as targets_file:
+        return targets_file.read().splitlines()
+
+def create_target_session(target, profile=None, endpoint_url=None):
+    """
+    Build the boto3 session for one account target.
+
+    Args:
+        target (str): An AWS CLI profile name, or the ARN of a role to assume
+        profile (str): Profile whose credentials assume the role (role ARNs only)
+        endpoint_url (str): Custom STS endpoint (e.g. a local moto server)
+    """
+    if not target.startswith('arn:'):
+        return boto3.Session(profile_name=target)
+
+    base = boto3.Session(profile_name=profile) if profile else boto3.Session()
+    credentials = base.client('sts', endpoint_url=endpoint_url).assume_role(
+        RoleArn=target,
+        RoleSessionName=ROLE_SESSION_NAME
+    )['Credentials']
+    return boto3.Session(
+        aws_access_key_id=credentials['AccessKeyId'],
+        aws_secret_access_key=credentials['SecretAccessKey'],
+        aws_session_token=credentials['SessionToken'],
+        region_name=base.region_name
+    )
+
+def scan_accounts(targets, profile=None, service=None, account_workers=DEFAULT_ACCOUNT_WORKERS,
+                  on_result=None, **options):
+    """
+    Enumerate many accounts concurrently, one worker process per account at a time.
+
+    Worker processes are reused across accounts, so boto3 is imported once per
+    worker rather than once per account. Each account keeps its own enumerator
+    (scheduler, rate limiter, caches), sized by the AWSEnumerator options such
+    as threads. A failing account is recorded and the others carry on.
+
+    Args:
+        targets (list): Profile names and/or role ARNs to scan
+        profile (str): Profile used to assume the role ARNs
+        service (str): Service to enumerate (None for all services, starting from IAM)
+        account_workers (int): Accounts scanned at the same time
+        on_result (callable): Called in the parent with each account's result as it finishes
+        **options: AWSEnumerator arguments applied to every account
+
+    Returns:
+        list: One result dict per target, in target order (see scan_account)
+    """
+    results = [None] * len(targets)
+    if not targets:
+        return results
+
+    workers = max(1, min(account_workers, len(targets)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=reset_sinks) as executor:
+        futures = {
+            executor.submit(scan_account, target, profile, service, options): index
+            for index, target in enumerate(targets)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = _account_result(targets[index])
+                result['status'] = 'failed'
+                result['error'] = str(e) or type(e).__name__
+            results[index] = result
+            if on_result:
+                on_result(result)
+    return results
+
+def scan_account(target, profile=None, service=None, options=None):
+    """
+    Enumerate one account; runs inside a worker process.
+
+    Returns:
+        dict: target, account, status ('ok', 'incomplete' or 'failed'), error,
+              elapsed seconds, the captured console report (output) and the
+              structured records
+    """
+    started = time.monotonic()
+    result = _account_result(target)
+    options = dict(options or {})
+    sink = CollectingSink()
+    console = io.StringIO()
+    add_sink(sink)
+    try:
+        with redirect_stdout(console):
+            session = create_target_session(target, profile, options.get('endpoint_url'))
+            enumerator = AWSEnumerator(session=session, **options)
+            try:
+                result['account'] = enumerator.session_context.account_id
+                if service:
+                    enumerator.enumerate_service(service)
+                else:
+                    enumerator.enumerate_all_services()
+                enumerator.print_run_summary()
+            finally:
+                enumerator.close()
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    finally:
+        remove_sink(sink)
+
+    result['records'] = [dict(record, account=result['account'], target=target) for record in sink.records]
+    if result['status'] == 'ok' and any(record.get('code') == 'EnumerationTimeout' for record in sink.records):
+        result['status'] = 'incomplete'
+    result['output'] = console.getvalue()
+    result['elapsed'] = time.monotonic() - started
+    return result
+
+def _account_result(target):
+    return {
+        'target': target,
+        'account': None,
+        'status': 'ok',
+        'error': None,
+        'elapsed': 0.0,
+        'output': '',
+        'records': [],
+    }
+
+def print_account_section(result):
+    """Print one account's console report under its own header."""
+    print_cyan("\n" + "=" * 100)
+    print_cyan(f"[Account: {result['account'] or 'unknown'} ({result['target']})]")
+    print_cyan("=" * 100)
+    print(result['output'], end='')
+    if result['error']:
+        print_red(f"\nError while scanning {result['target']}: {result['error']}")
+
+def print_accounts_report(results):
+    """Print the aggregate table across every scanned account."""
+    rows = []
+    for result in results:
+        counts = {}
+        for record in result['records']:
+            counts[record['type']] = counts.get(record['type'], 0) + 1
+        rows.append([
+            result['target'],
+            result['account'] or '-',
+            result['status'],
+            counts.get(INTERESTING_PERMISSION, 0),
+            len(result['records']) - counts.get(INTERESTING_PERMISSION, 0) - counts.get(ERROR, 0),
+            counts.get(ERROR, 0),
+            f"{result['elapsed']:.1f}s",
+        ])
+
+    print_cyan("\n" + "*" * 80)
+    print_cyan(f"Scanned {len(results)} accounts")
+    print_cyan("*" * 80)
+    print(tabulate(
+        rows,
+        headers=['Target', 'Account', 'Status', 'Interesting', 'Resources', 'Errors', 'Time'],
+        tablefmt='plain'
+    ))
+
+    failed = [result for result in results if result['status'] == 'failed']
+    incomplete = [result for result in results if result['status'] == 'incomplete']
+    if failed:
+        print_red(f"\n[!] {len(failed)} account(s) failed: {', '.join(result['target'] for result in failed)}")
+    if incomplete:
+        print_yellow(f"[!] {len(incomplete)} account(s) hit a time limit: {', '.join(result['target'] for result in incomplete)}")
+    if not failed and not incomplete:
+        print_green("\n[+] Every account was scanned completely")
@@ -0,0 +1,163 @@
+import base64
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+# Record types
+RESOURCE = 'resource'
+POLICY = 'policy'
+INTERESTING_PERMISSION = 'interesting_permission'
+ERROR = 'error'
+PRIVESC_PATH = 'privesc_path'
+
+OUTPUT_FORMATS = ('console', 'jsonl', 'json')
+DEFAULT_OUTPUT_FORMAT = 'console'
+
+FLUSH_EVERY = 100
+FLUSH_INTERVAL = 1.0
+
+_sinks = []
+_sinks_lock = threading.Lock()
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+class ConsoleSink:
+    """
+    The colored console report.
+
+    Findings already reach the console through the print_* helpers, so this
+    sink only stands in for the default format and drops records.
+    """
+
+    def write(self, record):
+        pass
+
+    def close(self):
+        pass
+
+class CollectingSink:
+    """Keeps every record in memory, for callers using awsome_enum as a library."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def close(self):
+        pass
+
+class JsonLinesSink:
+    """Writes one JSON object per line (NDJSON), flushed in small batches."""
+
+    def __init__(self, stream, close_stream=False):
+        self.stream = stream
+        self.close_stream = close_stream
+        self.records = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=_json_default, separators=(',', ':'))
+        with self._lock:
+            self._buffer.append(self._frame(line))
+            self.records += 1
+            if len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush()
+
+    def _frame(self, line):
+        return line + '\n'
+
+    def _flush(self):
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self.close_stream:
+                self.stream.close()
+
+class JsonSink(JsonLinesSink):
+    """Writes a single JSON array, streamed element by element."""
+
+    def _frame(self, line):
+        return ('[\n' if self.records == 0 else ',\n') + line
+
+    def close(self):
+        with self._lock:
+            self._buffer.append('[]\n' if self.records == 0 else '\n]\n')
+            self._flush()
+            if self.close_stream:
+                self.stream.close()
+
+def create_sink(output_format, path=None):
+    """
+    Build a sink for the given format.
+
+    Args:
+        output_format (str): One of OUTPUT_FORMATS
+        path (str): File to write records to (None or '-' for stdout)
+    """
+    if output_format == 'console':
+        return ConsoleSink()
+    sink_class = JsonSink if output_format == 'json' else JsonLinesSink
+    if not path or path == '-':
+        return sink_class(sys.stdout)
+    return sink_class(open(path, 'w', encoding='utf-8'), close_stream=True)
+
+def add_sink(sink):
+    with _sinks_lock:
+        _sinks.append(sink)
+
+def remove_sink(sink):
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+def has_sinks():
+    return any(not isinstance(sink, ConsoleSink) for sink in _sinks)
+
+def emit(record_type, **fields):
+    """
+    Write a typed record to every structured sink.
+
+    Args:
+        record_type (str): RESOURCE, POLICY, INTERESTING_PERMISSION, PRIVESC_PATH or ERROR
+        **fields: The record's payload (service, region, operation, data, ...)
+    """
+    if not has_sinks():
+        return
+    record = {'type': record_type, 'timestamp': datetime.now(timezone.utc).isoformat()}
+    record.update(fields)
+    publish(record)
+
+def publish(record):
+    """Write an already built record (e.g. one collected in another process) to every sink."""
+    for sink in _sinks:
+        sink.write(record)
+
+def reset_sinks():
+    """Forget every sink without closing it; forked workers inherit the parent's."""
+    with _sinks_lock:
+        _sinks.clear()
+
+def close_sinks():
+    with _sinks_lock:
+        sinks = list(_sinks)
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
@@ -0,0 +1,96 @@
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from .matcher import compile_pattern, has_wildcard, split_action
+
+class PermissionCatalog(Mapping):
+    """
+    Immutable view of interesting_permissions.json, indexed by service prefix.
+
+    Behaves like the original {action: info_url} dict, and additionally lets
+    callers fetch every entry of a single service without scanning the rest,
+    or resolve a (possibly wildcarded) policy action to the entries it covers.
+    """
+
+    def __init__(self, permissions=None):
+        self._permissions = MappingProxyType(dict(permissions or {}))
+        self._canonical = {action.lower(): action for action in self._permissions}
+
+        by_service = {}
+        for action in self._permissions:
+            service, name = split_action(action)
+            by_service.setdefault(service, []).append((action, name))
+        self._by_service = MappingProxyType({
+            service: tuple(entries) for service, entries in by_service.items()
+        })
+
+        self._match_cache = {}
+        self._match_lock = threading.Lock()
+
+    def __getitem__(self, action):
+        return self._permissions[action]
+
+    def __iter__(self):
+        return iter(self._permissions)
+
+    def __len__(self):
+        return len(self._permissions)
+
+    def __contains__(self, action):
+        return action in self._permissions
+
+    def for_service(self, service_prefix):
+        """
+        Return the catalog entries of one service.
+
+        Args:
+            service_prefix (str): The IAM service prefix (e.g. 'iam', 'ec2')
+
+        Returns:
+            tuple: (action, action_name) pairs, e.g. ('iam:PassRole', 'PassRole')
+        """
+        return self._by_service.get(service_prefix.lower(), ())
+
+    def services(self):
+        return self._by_service.keys()
+
+    def match(self, action):
+        """
+        Return every catalog action covered by a policy action.
+
+        Supports the full IAM glob syntax ('*' and '?' anywhere, including in
+        the service prefix, and a bare '*'). Matching is case-insensitive and
+        each distinct pattern is resolved only once.
+
+        Args:
+            action (str): A policy action, e.g. 'iam:PassRole', 'iam:*Policy*', '*'
+
+        Returns:
+            tuple: Matching catalog actions in catalog order
+        """
+        cached = self._match_cache.get(action)
+        if cached is not None:
+            return cached
+
+        if not has_wildcard(action):
+            canonical = self._canonical.get(action.lower())
+            result = (canonical,) if canonical else ()
+        else:
+            result = self._match_wildcard(action)
+
+        with self._match_lock:
+            self._match_cache[action] = result
+        return result
+
+    def _match_wildcard(self, action):
+        service, name = split_action(action)
+
+        if service and not has_wildcard(service):
+            # Service is fixed: only that service's bucket has to be scanned
+            if name == '*':
+                return tuple(entry for entry, _ in self.for_service(service))
+            regex = compile_pattern(name)
+            return tuple(entry for entry, entry_name in self.for_service(service) if regex.match(entry_name))
+
+        regex = compile_pattern(action)
+        return tuple(entry for entry in self._permissions if regex.match(entry))
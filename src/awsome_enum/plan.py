@@ -0,0 +1,173 @@
+from tabulate import tabulate
+from .matcher import has_wildcard, split_action
+from .utils import print_cyan, print_yellow
+
+class WorkUnit:
+    """One handler run: a service handler on a resource, credited to the policy action that asked for it."""
+
+    __slots__ = ('service', 'handler', 'action', 'resource', 'regions')
+
+    def __init__(self, service, handler, action, resource, regions=1):
+        self.service = service
+        self.handler = handler
+        self.action = action
+        self.resource = resource
+        self.regions = regions
+
+class EnumerationPlan:
+    """
+    Deep-enumeration work for a principal's permissions, coalesced per service before anything runs.
+
+    Every (action, resource) pair is resolved to the service handlers its
+    action covers, then the resources requested per handler are merged:
+
+    - a listing handler runs once, whatever resources it was found on;
+    - a bare '*' covers every other resource of a handler that acts on resources;
+    - a bare '*' is dropped for handlers that need a named resource.
+
+    With a PolicyEvaluator, a pair is dropped when its action is denied on
+    its resource (for a wildcard, every concrete action the action catalog
+    expands it to), and a handler when every concrete action behind it is
+    (an explicit Deny, a NotAction or NotResource exclusion, or a condition
+    the caller's context fails). Dropped pairs make no API calls at all.
+
+    An action with a wildcard service ('*', '*:List*') is resolved against
+    every service it can reach.
+
+    Each surviving (handler, resource) run is credited to the first pair that
+    asked for it, so the report keeps its action-by-action layout while the
+    overlapping requests of later pairs are skipped.
+    """
+
+    def __init__(self, resource_actions, service_class=None, regions_for=None, evaluator=None, services_for=None,
+                 expand=None):
+        """
+        Args:
+            resource_actions (dict): resource -> actions, as parsed from the policies
+            service_class (callable): service prefix -> its service class, None if it has none
+            regions_for (callable): (service, action, resource) -> number of regions a run fans out to
+            evaluator (PolicyEvaluator): Drops handler runs the principal's policies deny
+            services_for (callable): action -> the service prefixes it reaches (defaults to its own prefix)
+            expand (callable): wildcard action -> the concrete actions it grants (e.g. ActionCatalog.expand);
+                               without it wildcard pairs are only checked per handler
+        """
+        self.pairs = [(action, resource) for resource, actions in resource_actions.items() for action in actions]
+        self.excluded = []
+        self.units = []
+        self.requested = 0
+        self.unsupported = 0
+        self.denied = 0
+        self._assigned = {}
+        self._evaluator = evaluator
+        self._expand = expand
+        self._build(
+            service_class or (lambda service: None),
+            regions_for or (lambda service, action, resource: 1),
+            services_for or (lambda action: [split_action(action)[0]])
+        )
+
+    def _build(self, service_class, regions_for, services_for):
+        if self._evaluator is not None:
+            pairs, self.pairs = self.pairs, []
+            for pair in pairs:
+                (self.pairs if self._pair_allowed(*pair) else self.excluded).append(pair)
+
+        requests = {}
+        service_classes = {}
+        for action, resource in self.pairs:
+            handled = False
+            for service in services_for(action):
+                if service not in service_classes:
+                    service_classes[service] = service_class(service)
+                handlers = service_classes[service].handlers_for(action) if service_classes[service] else ()
+                handled = handled or bool(handlers)
+                for handler in handlers:
+                    if self._evaluator is not None and not any(
+                        self._evaluator.may_allow(concrete, resource)
+                        for concrete in service_classes[service].handler_actions(action, handler)
+                    ):
+                        self.denied += 1
+                        continue
+                    self.requested += 1
+                    requests.setdefault((service, handler), []).append((action, resource))
+            if not handled:
+                self.unsupported += 1
+
+        for (service, handler), asked in requests.items():
+            scope = service_classes[service].handler_scope(handler)
+            if scope == 'listing':
+                kept = [asked[0]]
+            elif scope == 'concrete':
+                kept = [(action, resource) for action, resource in asked if resource != '*']
+            elif any(resource == '*' for _, resource in asked):
+                kept = [next((action, resource) for action, resource in asked if resource == '*')]
+            else:
+                kept = asked
+
+            seen = set()
+            for action, resource in kept:
+                if resource in seen:
+                    continue
+                seen.add(resource)
+                unit = WorkUnit(service, handler, action, resource, regions_for(service, action, resource))
+                self.units.append(unit)
+                self._assigned.setdefault((service, action, resource), []).append(handler)
+
+        # Runs follow the order the pairs will be enumerated in
+        order = {pair: index for index, pair in enumerate(self.pairs)}
+        self.units.sort(key=lambda unit: order[(unit.action, unit.resource)])
+
+    def _pair_allowed(self, action, resource):
+        """False when the policies definitely deny the action (every action it expands to) on the resource."""
+        if not has_wildcard(action):
+            return self._evaluator.may_allow(action, resource)
+        concrete = self._expand(action) if self._expand else ()
+        return not concrete or any(self._evaluator.may_allow(name, resource) for name in concrete)
+
+    def handlers_for(self, action, resource, service=None):
+        """The handlers the pair runs in a service (its own by default); empty when other pairs already cover its work."""
+        if service is None:
+            service = split_action(action)[0]
+        return self._assigned.get((service, action, resource), [])
+
+    @property
+    def coalesced(self):
+        """Handler requests dropped because another run covers them."""
+        return self.requested - len(self.units)
+
+    def call_budget(self):
+        """
+        Handler runs per service, counting one per region a run fans out to.
+
+        Returns:
+            dict: service -> number of handler runs (each makes one or more API calls)
+        """
+        budget = {}
+        for unit in self.units:
+            budget[unit.service] = budget.get(unit.service, 0) + unit.regions
+        return budget
+
+    def print_plan(self):
+        print_cyan("\n" + "*" * 80)
+        print_cyan("Deep Enumeration Plan")
+        print_cyan("*" * 80 + "\n")
+
+        if self.units:
+            rows = [
+                [unit.service, unit.handler.replace('_handle_', '', 1), unit.action, unit.resource, unit.regions]
+                for unit in self.units
+            ]
+            print(tabulate(rows, headers=['Service', 'Handler', 'Action', 'Resource', 'Regions'], tablefmt='simple'))
+
+            budget = self.call_budget()
+            print_cyan("\n[*] Call budget (handler runs, one or more API calls each):\n")
+            print(tabulate(sorted(budget.items()), headers=['Service', 'Runs'], tablefmt='plain'))
+        else:
+            print_yellow("No handler runs planned.")
+
+        print_yellow(
+            f"\n[*] {len(self.pairs)} action/resource pairs ({len(self.excluded)} more denied by policy) -> "
+            f"{len(self.units)} handler runs "
+            f"({self.coalesced} coalesced, {self.denied} denied by policy, {self.unsupported} without a handler), "
+            f"{sum(self.call_budget().values())} runs across regions"
+        )
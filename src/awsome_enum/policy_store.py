@@ -0,0 +1,148 @@
+import json
+import threading
+from .conditions import compile_conditions
+from .iam_snapshot import load_document
+from .matcher import compile_pattern, has_wildcard, matches
+
+def _as_tuple(value):
+    if value is None:
+        return ()
+    return (value,) if isinstance(value, str) else tuple(value)
+
+def _resource_matcher(patterns):
+    """Exact ARNs go in a set and globs are compiled, so matching a resource costs one lookup plus the globs."""
+    exact = frozenset(pattern for pattern in patterns if not has_wildcard(pattern))
+    globs = tuple(compile_pattern(pattern, ignore_case=False) for pattern in patterns if has_wildcard(pattern))
+    return exact, globs
+
+class Statement:
+    """One parsed policy statement, with its resource patterns compiled for matching."""
+
+    __slots__ = ('allow', 'actions', 'not_actions', 'resources', 'not_resources', 'principals', 'conditions',
+                 '_resource_match', '_not_resource_match')
+
+    def __init__(self, statement):
+        self.allow = statement.get('Effect', '').lower() == 'allow'
+        self.actions = _as_tuple(statement.get('Action'))
+        self.not_actions = _as_tuple(statement.get('NotAction'))
+        self.resources = _as_tuple(statement.get('Resource'))
+        self.not_resources = _as_tuple(statement.get('NotResource'))
+        self._resource_match = _resource_matcher(self.resources)
+        self._not_resource_match = _resource_matcher(self.not_resources)
+        self.conditions = compile_conditions(statement.get('Condition'))
+        # Only trust policies name principals: (kind, value) pairs such as ('AWS', arn)
+        principal = statement.get('Principal')
+        if principal == '*':
+            self.principals = (('AWS', '*'),)
+        else:
+            self.principals = tuple(
+                (kind, value) for kind, values in (principal or {}).items() for value in _as_tuple(values)
+            )
+
+    def covers_action(self, action):
+        if self.not_actions:
+            return not any(matches(pattern, action) for pattern in self.not_actions)
+        return any(matches(pattern, action) for pattern in self.actions)
+
+    def covers_resource(self, resource):
+        # A policy statement has one or the other; a copy derived by the
+        # evaluator may have both and covers its resources minus the excluded
+        if self.not_resources:
+            exact, globs = self._not_resource_match
+            if resource in exact or any(glob.match(resource) for glob in globs):
+                return False
+            if not self.resources:
+                return True
+        exact, globs = self._resource_match
+        return resource in exact or any(glob.match(resource) for glob in globs)
+
+
+class PolicyStore:
+    """
+    Managed-policy documents of a run, keyed by (PolicyArn, VersionId).
+
+    Every IAM code path reads managed policies through one store, so a policy
+    attached to many principals (ReadOnlyAccess on every role, say) costs one
+    GetPolicy and one GetPolicyVersion per run. Concurrent requests for the
+    same version wait for the first fetch instead of repeating it. Parsed
+    statements are interned by document content, so identical documents,
+    managed or inline, share one tuple of Statement objects.
+    """
+
+    def __init__(self, get_policy=None, get_policy_version=None):
+        """
+        Args:
+            get_policy (callable): policy_arn -> GetPolicy 'Policy' dict
+            get_policy_version (callable): (policy_arn, version_id) -> GetPolicyVersion 'PolicyVersion' dict
+        """
+        self._get_policy = get_policy
+        self._get_policy_version = get_policy_version
+        self._default_versions = {}
+        self._documents = {}
+        self._statements = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_snapshot(self, snapshot):
+        """Seed the store with every policy version held by an IAMSnapshot."""
+        with self._lock:
+            for policy_arn, policy in snapshot.policies.items():
+                if policy.get('DefaultVersionId'):
+                    self._default_versions[policy_arn] = policy['DefaultVersionId']
+                for version in policy.get('PolicyVersionList', []):
+                    if 'Document' in version:
+                        self._documents[(policy_arn, version['VersionId'])] = load_document(version['Document'])
+
+    def default_version(self, policy_arn):
+        """The policy's default version id, from GetPolicy on first use."""
+        version_id = self._default_versions.get(policy_arn)
+        if version_id is None:
+            with self._key_lock(policy_arn):
+                version_id = self._default_versions.get(policy_arn)
+                if version_id is None:
+                    version_id = self._default_versions[policy_arn] = self._get_policy(policy_arn)['DefaultVersionId']
+        return version_id
+
+    def document(self, policy_arn, version_id=None):
+        """
+        Document of a managed policy version, fetched at most once per run.
+
+        Args:
+            policy_arn (str): The managed policy ARN
+            version_id (str): The version to read (defaults to the policy's default version)
+
+        Returns:
+            dict: The policy document
+        """
+        key = (policy_arn, version_id or self.default_version(policy_arn))
+        document = self._documents.get(key)
+        if document is None:
+            with self._key_lock(key):
+                document = self._documents.get(key)
+                if document is None:
+                    document = load_document(self._get_policy_version(*key)['Document'])
+                    self._documents[key] = document
+        return document
+
+    def statements(self, document):
+        """The document's statements, parsed once per distinct document."""
+        document = load_document(document)
+        key = json.dumps(document, sort_keys=True)
+        statements = self._statements.get(key)
+        if statements is None:
+            raw = document.get('Statement', [])
+            if isinstance(raw, dict):
+                raw = [raw]
+            statements = self._statements.setdefault(key, tuple(Statement(statement) for statement in raw))
+        return statements
+
+    def policy_statements(self, policy_arn, version_id=None):
+        """Interned statements of a managed policy version."""
+        return self.statements(self.document(policy_arn, version_id))
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
@@ -0,0 +1,337 @@
+from collections import deque
+from .matcher import has_wildcard
+from .policy_store import PolicyStore
+
+DEFAULT_MAX_DEPTH = 5
+
+# Services that run code as a passed role, and the calls needed to make them do it
+PASSROLE_TECHNIQUES = {
+    'lambda.amazonaws.com': ('lambda:CreateFunction', 'lambda:InvokeFunction'),
+    'ec2.amazonaws.com': ('ec2:RunInstances',),
+    'ecs-tasks.amazonaws.com': ('ecs:RunTask',),
+    'cloudformation.amazonaws.com': ('cloudformation:CreateStack',),
+    'glue.amazonaws.com': ('glue:CreateDevEndpoint',),
+    'sagemaker.amazonaws.com': ('sagemaker:CreateNotebookInstance',),
+    'codebuild.amazonaws.com': ('codebuild:CreateProject', 'codebuild:StartBuild'),
+}
+
+# Calls on another user that hand over that user's credentials
+USER_TAKEOVER_ACTIONS = ('iam:CreateAccessKey', 'iam:CreateLoginProfile', 'iam:UpdateLoginProfile')
+
+class Principal:
+    """A user or role with the identity-policy statements that apply to it."""
+
+    __slots__ = ('arn', 'name', 'type', 'account', 'statements', 'groups', 'managed_policies', 'trust')
+
+    def __init__(self, arn, name, principal_type):
+        self.arn = arn
+        self.name = name
+        self.type = principal_type
+        self.account = arn.split(':')[4]
+        self.statements = []
+        self.groups = []
+        self.managed_policies = []
+        self.trust = []
+
+class EscalationPath:
+    """
+    How a principal reaches administrator access.
+
+    steps is a list of (source_arn, technique, target_arn) hops; admin_via is
+    how the last principal becomes an administrator.
+    """
+
+    __slots__ = ('steps', 'admin_arn', 'admin_via')
+
+    def __init__(self, steps, admin_arn, admin_via):
+        self.steps = steps
+        self.admin_arn = admin_arn
+        self.admin_via = admin_via
+
+    def __len__(self):
+        return len(self.steps)
+
+class PolicyGraph:
+    """
+    Privilege-escalation graph of an account's users and roles.
+
+    Built from an IAMSnapshot of the account. Nodes are principals;
+    an edge A -> B means A can obtain B's permissions (assume it, pass it to a
+    compute service, or take over its credentials). Role trust policies are
+    indexed by the principal, account and service they trust, so a node's
+    outgoing edges only look at roles that could accept it. Edges and
+    administrator checks are computed on first use and cached, so searches
+    from many start principals share the work.
+
+    Conditions are assumed to be satisfiable, and SCPs and permission
+    boundaries are not applied, so paths are candidates to verify.
+    """
+
+    def __init__(self, snapshot, store=None):
+        self.principals = {}
+        self.users = {}
+        self.roles = {}
+        self.groups = {}
+        self._trusted_by_arn = {}
+        self._trusted_by_account = {}
+        self._trusted_by_service = {}
+        self._trusted_by_anyone = []
+        self._store = store or PolicyStore()
+        self._by_action = {}
+        self._selections = {}
+        self._edges = {}
+        self._admin = {}
+        self._paths = {}
+        self._load(snapshot)
+
+    def _load(self, snapshot):
+        policies = {arn: self._statements(snapshot.policy_document(arn)) for arn in snapshot.policies}
+
+        for group in snapshot.groups.values():
+            statements = []
+            for policy in group.get('GroupPolicyList', []):
+                statements.extend(self._statements(policy.get('PolicyDocument')))
+            attached = [policy['PolicyArn'] for policy in group.get('AttachedManagedPolicies', [])]
+            for policy_arn in attached:
+                statements.extend(policies.get(policy_arn, ()))
+            self.groups[group['GroupName']] = (group['Arn'], statements, attached)
+
+        for user in snapshot.users.values():
+            principal = self._add(Principal(user['Arn'], user['UserName'], 'user'), user, 'UserPolicyList', policies)
+            for group_name in user.get('GroupList', []):
+                group = self.groups.get(group_name)
+                if group:
+                    principal.groups.append(group[0])
+                    principal.statements.extend(group[1])
+                    principal.managed_policies.extend(group[2])
+            self.users[principal.arn] = principal
+
+        for role in snapshot.roles.values():
+            principal = self._add(Principal(role['Arn'], role['RoleName'], 'role'), role, 'RolePolicyList', policies)
+            principal.trust = self._statements(role.get('AssumeRolePolicyDocument'))
+            self._index_trust(principal)
+            self.roles[principal.arn] = principal
+
+    def _add(self, principal, detail, inline_key, policies):
+        for policy in detail.get(inline_key, []):
+            principal.statements.extend(self._statements(policy.get('PolicyDocument')))
+        for policy in detail.get('AttachedManagedPolicies', []):
+            principal.managed_policies.append(policy['PolicyArn'])
+            principal.statements.extend(policies.get(policy['PolicyArn'], ()))
+        self.principals[principal.arn] = principal
+        return principal
+
+    def _statements(self, document):
+        # Identical documents (the same managed policy, copy-pasted inline
+        # policies) share one tuple of statement objects
+        return self._store.statements(document)
+
+    def _index_trust(self, role):
+        for statement in role.trust:
+            if not statement.allow or not statement.covers_action('sts:AssumeRole'):
+                continue
+            for kind, value in statement.principals:
+                if kind == 'Service':
+                    self._trusted_by_service.setdefault(value, []).append(role)
+                elif kind != 'AWS':
+                    continue
+                elif value == '*':
+                    self._trusted_by_anyone.append(role)
+                elif value.isdigit() or value.endswith(':root'):
+                    account = value if value.isdigit() else value.split(':')[4]
+                    self._trusted_by_account.setdefault(account, []).append(role)
+                else:
+                    self._trusted_by_arn.setdefault(value, []).append(role)
+
+    def find(self, name, principal_type='role'):
+        """ARN of the user or role with the given name, None if there is none."""
+        principals = self.users if principal_type == 'user' else self.roles
+        for principal in principals.values():
+            if principal.name == name:
+                return principal.arn
+        return None
+
+    def admin_technique(self, arn):
+        """How the principal already is, or can make itself, an administrator; None if it cannot."""
+        if arn not in self._admin:
+            self._admin[arn] = self._find_admin_technique(self.principals[arn])
+        return self._admin[arn]
+
+    def _find_admin_technique(self, principal):
+        # '*' on '*' with nothing denied; any Deny falls through to the checks below
+        if all(statement.allow for statement in principal.statements) and any(
+            '*' in statement.actions and '*' in statement.resources for statement in principal.statements
+        ):
+            return 'AdministratorAccess'
+
+        if principal.type == 'user':
+            for action in ('iam:AttachUserPolicy', 'iam:PutUserPolicy'):
+                if self.allows(principal, action, principal.arn):
+                    return action
+            for group_arn in principal.groups:
+                for action in ('iam:AttachGroupPolicy', 'iam:PutGroupPolicy'):
+                    if self.allows(principal, action, group_arn):
+                        return action
+            if self._statements_for(principal, 'iam:AddUserToGroup'):
+                for group_arn, _, _ in self.groups.values():
+                    if self.allows(principal, 'iam:AddUserToGroup', group_arn):
+                        return 'iam:AddUserToGroup'
+        else:
+            for action in ('iam:AttachRolePolicy', 'iam:PutRolePolicy'):
+                if self.allows(principal, action, principal.arn):
+                    return action
+
+        for policy_arn in principal.managed_policies:
+            if ':aws:policy/' not in policy_arn and self.allows(principal, 'iam:CreatePolicyVersion', policy_arn):
+                return 'iam:CreatePolicyVersion'
+        return None
+
+    def allows(self, principal, action, resource):
+        """Whether the principal's identity policies allow the call (an explicit Deny wins)."""
+        return self._evaluate(self._statements_for(principal, action), resource)
+
+    @staticmethod
+    def _evaluate(statements, resource):
+        allowed = False
+        for statement in statements:
+            if statement.covers_resource(resource):
+                if not statement.allow:
+                    return False
+                allowed = True
+        return allowed
+
+    def _statements_for(self, principal, action):
+        """The principal's statements that mention the action, cached per (principal, action)."""
+        key = (principal.arn, action)
+        statements = self._by_action.get(key)
+        if statements is None:
+            statements = self._by_action[key] = tuple(
+                statement for statement in principal.statements if statement.covers_action(action)
+            )
+        return statements
+
+    def _permitted(self, principal, action, candidates, scope, index=None):
+        """
+        The candidate principals the principal may call the action on.
+
+        Principals whose policies are identical share statement objects, so
+        the selection is cached per (scope, action, statements) and computed
+        once for all of them.
+
+        Args:
+            principal (Principal): The caller
+            action (str): The IAM action, e.g. 'sts:AssumeRole'
+            candidates (list): Principals the action could target
+            scope (tuple): Identifies the candidate list in the cache
+            index (dict): ARN -> principal lookup covering the candidates
+        """
+        statements = self._statements_for(principal, action)
+        if not any(statement.allow for statement in statements):
+            return []
+        key = (scope, action, statements)
+        targets = self._selections.get(key)
+        if targets is None:
+            targets = self._selections[key] = self._select(statements, candidates, index)
+        return [target for target in targets if target is not principal]
+
+    def _select(self, statements, candidates, index):
+        # Only Allows on exact ARNs: look them up instead of evaluating every candidate
+        if all(statement.allow and not statement.not_resources for statement in statements):
+            if any('*' in statement.resources for statement in statements):
+                return list(candidates)
+            if not any(has_wildcard(resource) for statement in statements for resource in statement.resources):
+                arns = {resource for statement in statements for resource in statement.resources}
+                if index is not None:
+                    return [index[arn] for arn in arns if arn in index]
+                return [target for target in candidates if target.arn in arns]
+        return [target for target in candidates if self._evaluate(statements, target.arn)]
+
+    def edges(self, arn):
+        """Outgoing (technique, target_arn) edges of a principal."""
+        edges = self._edges.get(arn)
+        if edges is None:
+            edges = self._edges[arn] = self._find_edges(self.principals[arn])
+        return edges
+
+    def _find_edges(self, principal):
+        edges = {}
+
+        # Roles whose trust policy names the principal can be assumed without
+        # an identity policy; account-wide trust also needs sts:AssumeRole
+        for role in self._trusted_by_arn.get(principal.arn, ()):
+            if role is not principal and not any(
+                not statement.allow and statement.covers_resource(role.arn)
+                for statement in self._statements_for(principal, 'sts:AssumeRole')
+            ):
+                edges.setdefault(role.arn, 'sts:AssumeRole')
+        trusting = self._trusted_by_account.get(principal.account, []) + self._trusted_by_anyone
+        for role in self._permitted(principal, 'sts:AssumeRole', trusting, ('account', principal.account)):
+            edges.setdefault(role.arn, 'sts:AssumeRole')
+
+        if self._statements_for(principal, 'iam:PassRole'):
+            for service_principal, actions in PASSROLE_TECHNIQUES.items():
+                roles = self._trusted_by_service.get(service_principal)
+                if not roles or not all(
+                    any(statement.allow for statement in self._statements_for(principal, action))
+                    for action in actions
+                ):
+                    continue
+                technique = f"iam:PassRole + {' + '.join(actions)}"
+                for role in self._permitted(principal, 'iam:PassRole', roles, ('service', service_principal)):
+                    edges.setdefault(role.arn, technique)
+
+        for action in USER_TAKEOVER_ACTIONS:
+            for user in self._permitted(principal, action, self.users.values(), 'users', self.users):
+                edges.setdefault(user.arn, action)
+
+        for role in self._permitted(principal, 'iam:UpdateAssumeRolePolicy', self.roles.values(), 'roles', self.roles):
+            if self.allows(principal, 'sts:AssumeRole', role.arn):
+                edges.setdefault(role.arn, 'iam:UpdateAssumeRolePolicy + sts:AssumeRole')
+
+        return [(technique, target) for target, technique in edges.items()]
+
+    def escalation_paths(self, arn, max_depth=DEFAULT_MAX_DEPTH):
+        """
+        Shortest escalation path from a principal to every administrator it can reach.
+
+        Args:
+            arn (str): ARN of the starting user or role
+            max_depth (int): Maximum number of hops to follow
+
+        Returns:
+            list: EscalationPath objects, shortest first; a principal that is
+                  already an administrator yields only a zero-hop path
+        """
+        key = (arn, max_depth)
+        if key in self._paths:
+            return self._paths[key]
+
+        paths = []
+        parents = {arn: None}
+        queue = deque([(arn, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            technique = self.admin_technique(node)
+            if technique:
+                # Nothing beyond an administrator is worth reporting
+                paths.append(EscalationPath(self._steps(parents, node), node, technique))
+                continue
+            if depth == max_depth:
+                continue
+            for edge_technique, target in self.edges(node):
+                if target not in parents:
+                    parents[target] = (node, edge_technique)
+                    queue.append((target, depth + 1))
+
+        self._paths[key] = paths
+        return paths
+
+    @staticmethod
+    def _steps(parents, node):
+        steps = []
+        while parents[node] is not None:
+            source, technique = parents[node]
+            steps.append((source, technique, node))
+            node = source
+        steps.reverse()
+        return steps
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from botocore.config import Config
+
+DEFAULT_RATE = 20.0
+MIN_RATE = 0.5
+
+# Requests per second per (service, region) for control planes that throttle early
+SERVICE_RATES = {
+    'iam': 5.0,
+    'sts': 10.0,
+}
+
+MAX_ATTEMPTS = 8
+
+THROTTLE_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'SlowDown',
+    'BandwidthLimitExceeded',
+    'PriorRequestNotComplete',
+    'EC2ThrottledException',
+}
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate adapts to throttling (AIMD).
+
+    Every throttle halves the rate down to MIN_RATE; every successful call
+    wins back a fiftieth of the ceiling until the configured rate is reached.
+    """
+
+    def __init__(self, rate):
+        self.ceiling = rate
+        self.rate = rate
+        self.tokens = max(1.0, rate)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Take a token if one is available; otherwise return the seconds until one is (None once taken)."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return None
+            return (1.0 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available and return the seconds spent waiting."""
+        waited = 0.0
+        delay = self.take()
+        while delay is not None:
+            time.sleep(delay)
+            waited += delay
+            delay = self.take()
+        return waited
+
+    async def acquire_async(self):
+        """acquire() for an event loop: waits without blocking the loop's other calls."""
+        waited = 0.0
+        delay = self.take()
+        while delay is not None:
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self.take()
+        return waited
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.ceiling:
+                self.rate = min(self.ceiling, self.rate + self.ceiling / 50)
+
+class _EndpointStats:
+    __slots__ = ('requests', 'throttles', 'retries', 'waited')
+
+    def __init__(self):
+        self.requests = 0
+        self.throttles = 0
+        self.retries = 0
+        self.waited = 0.0
+
+class RateLimiter:
+    """
+    Shared request pacing for every boto3 client of a run.
+
+    attach() hooks a client's event system so each HTTP attempt (including
+    botocore's own retries) takes a token from the bucket of the client's
+    (service, region), and throttling responses slow that bucket down.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, service_rates=None):
+        self.rate = rate
+        self.service_rates = dict(SERVICE_RATES)
+        if service_rates:
+            self.service_rates.update(service_rates)
+        self.client_config = Config(retries={'max_attempts': MAX_ATTEMPTS, 'mode': 'standard'})
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._started = None
+        self._finished = None
+
+    def rate_for(self, service):
+        return min(self.service_rates.get(service, self.rate), self.rate)
+
+    def bucket(self, service, region):
+        key = (service, region)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate_for(service))
+                self._stats[key] = _EndpointStats()
+            return bucket
+
+    def attach(self, client, asynchronous=False):
+        """
+        Pace every request the client sends.
+
+        Args:
+            client: A boto3 client, ideally created with self.client_config
+            asynchronous (bool): The client is an aiobotocore client, whose requests wait on its event loop
+        """
+        service = client.meta.service_model.endpoint_prefix
+        key = (service, client.meta.region_name)
+        bucket = self.bucket(*key)
+        stats = self._stats[key]
+
+        def record(waited):
+            with self._lock:
+                now = time.monotonic()
+                self._started = self._started or now
+                self._finished = now
+                stats.requests += 1
+                stats.waited += waited
+
+        def before_send(**kwargs):
+            record(bucket.acquire())
+
+        async def before_send_async(**kwargs):
+            record(await bucket.acquire_async())
+
+        def needs_retry(response=None, **kwargs):
+            if response is not None and _is_throttle(response):
+                bucket.on_throttle()
+                with self._lock:
+                    stats.throttles += 1
+
+        def after_call(parsed=None, **kwargs):
+            parsed = parsed or {}
+            with self._lock:
+                self._finished = time.monotonic()
+                stats.retries += parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            if 'Error' not in parsed:
+                bucket.on_success()
+
+        client.meta.events.register('before-send', before_send_async if asynchronous else before_send)
+        client.meta.events.register('needs-retry', needs_retry)
+        client.meta.events.register('after-call', after_call)
+        return client
+
+    def summary(self):
+        with self._lock:
+            endpoints = {
+                key: {
+                    'requests': stats.requests,
+                    'throttles': stats.throttles,
+                    'retries': stats.retries,
+                    'waited': stats.waited,
+                    'rate': self._buckets[key].rate,
+                }
+                for key, stats in self._stats.items()
+            }
+            elapsed = (self._finished - self._started) if self._started else 0.0
+        requests = sum(stats['requests'] for stats in endpoints.values())
+        return {
+            'requests': requests,
+            'throttles': sum(stats['throttles'] for stats in endpoints.values()),
+            'retries': sum(stats['retries'] for stats in endpoints.values()),
+            'elapsed': elapsed,
+            'requests_per_second': (requests / elapsed) if elapsed else float(requests),
+            'endpoints': endpoints,
+        }
+
+def _is_throttle(response):
+    http_response, parsed = response
+    if http_response is not None and http_response.status_code == 429:
+        return True
+    return (parsed or {}).get('Error', {}).get('Code') in THROTTLE_ERROR_CODES
@@ -0,0 +1,295 @@
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from .utils import print_red, print_yellow
+from .output import emit, ERROR
+from .budget import EnumerationTimeout, current_deadline, deadline_at, check_deadline
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_SERVICE_CONCURRENCY = 4
+
+# IAM and STS throttle far earlier than the data plane services
+SERVICE_CONCURRENCY_LIMITS = {
+    'iam': 2,
+    'sts': 1,
+}
+
+# Seconds a unit may keep running past its deadline before it is abandoned.
+# Units normally stop on their own at their next API call.
+ABANDON_GRACE = 5.0
+
+
+class _ThreadBufferedStdout:
+    """
+    Stand-in for sys.stdout that diverts writes from worker threads into a
+    per-thread buffer, while writes from any other thread go straight through.
+    Writes from the threads of abandoned units are dropped.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+        self._dropped = set()
+
+    def drop(self, thread_ident):
+        """Discard everything the thread writes from now on."""
+        self._dropped.add(thread_ident)
+
+    def start_capture(self):
+        self._local.buffer = []
+
+    def stop_capture(self):
+        buffer = getattr(self._local, 'buffer', None)
+        self._local.buffer = None
+        return ''.join(buffer or [])
+
+    def write(self, text):
+        if self._dropped and threading.get_ident() in self._dropped:
+            return len(text)
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return self._stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _Task:
+    __slots__ = ('service', 'region', 'func', 'args', 'output', 'done', 'deadline', 'thread', 'abandoned')
+
+    def __init__(self, service, region, func, args):
+        self.service = service
+        self.region = region
+        self.func = func
+        self.args = args
+        self.output = ''
+        self.done = False
+        self.deadline = None
+        self.thread = None
+        self.abandoned = False
+
+    @property
+    def slot(self):
+        return (self.service, self.region)
+
+
+class DeepEnumerationScheduler:
+    """
+    Runs enumeration work units on a bounded set of daemon threads.
+
+    Each unit is tagged with the service (and region) it talks to so no more
+    than the service's concurrency limit run at once against one endpoint. Everything a unit prints is
+    buffered and released in submission order, so the console report reads
+    exactly as it would have if the units had run one after another.
+
+    A service can be given a time budget: its clock starts with its first
+    unit, and once it runs out the service's remaining units are skipped.
+    The caller's own deadline (see budget.time_limit) bounds every unit too.
+    A unit still running well past its deadline is abandoned: its thread is
+    a daemon, so a hung call cannot keep the interpreter alive, and anything
+    it prints afterwards is dropped.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, service_limits=None,
+                 service_budget=None, service_budgets=None):
+        self.max_workers = max(1, max_workers)
+        self.service_limits = dict(SERVICE_CONCURRENCY_LIMITS)
+        if service_limits:
+            self.service_limits.update(service_limits)
+        self.service_budget = service_budget
+        self.service_budgets = dict(service_budgets or {})
+        self._tasks = []
+        self._started = {}
+        self._expired = set()
+        self._lock = threading.Lock()
+
+    def submit(self, service, func, *args, region=None):
+        """
+        Queue a work unit.
+
+        Args:
+            service (str): Service prefix the unit calls (e.g. 'iam', 's3')
+            func (callable): The work to run
+            *args: Positional arguments passed to func
+            region (str): Region the unit calls (None for the session default)
+        """
+        self._tasks.append(_Task(service, region, func, args))
+
+    def limit_for(self, service):
+        return min(self.service_limits.get(service, DEFAULT_SERVICE_CONCURRENCY), self.max_workers)
+
+    def budget_for(self, service):
+        """Seconds the service may spend in total, None when unlimited."""
+        return self.service_budgets.get(service, self.service_budget)
+
+    def run(self):
+        """
+        Execute every queued unit and stream their output in submission order.
+
+        Raises:
+            EnumerationTimeout: If the caller's deadline passed while the units ran
+        """
+        tasks, self._tasks = self._tasks, []
+        if not tasks:
+            return
+
+        overall = current_deadline()
+        if self.max_workers == 1:
+            for task in tasks:
+                if self._start(task, overall):
+                    self._invoke(task)
+            check_deadline()
+            return
+
+        real_stdout = sys.stdout
+        buffered_stdout = _ThreadBufferedStdout(real_stdout)
+        sys.stdout = buffered_stdout
+
+        pending = deque(tasks)
+        in_flight = set()
+        finished = queue.Queue()
+        running_per_service = {}
+        next_to_print = 0
+
+        try:
+            while pending or in_flight:
+                self._dispatch(buffered_stdout, pending, in_flight, finished, running_per_service, overall)
+                if not in_flight:
+                    continue
+
+                done = []
+                try:
+                    done.append(finished.get(timeout=self._next_abandon(in_flight)))
+                    while True:
+                        done.append(finished.get_nowait())
+                except queue.Empty:
+                    pass
+                for task, output in done:
+                    if task not in in_flight:
+                        continue
+                    in_flight.discard(task)
+                    task.output = output
+                    task.done = True
+                    running_per_service[task.slot] -= 1
+                self._abandon_overdue(buffered_stdout, in_flight, running_per_service)
+
+                while next_to_print < len(tasks) and tasks[next_to_print].done:
+                    real_stdout.write(tasks[next_to_print].output)
+                    tasks[next_to_print].output = ''
+                    next_to_print += 1
+                real_stdout.flush()
+        finally:
+            # Units still running are abandoned and the caller gets its stdout
+            # back; an abandoned unit stops quietly at its next API call
+            for task in in_flight:
+                task.abandoned = True
+                buffered_stdout.drop(task.thread.ident)
+            if sys.stdout is buffered_stdout:
+                sys.stdout = real_stdout
+        check_deadline()
+
+    def _dispatch(self, buffered_stdout, pending, in_flight, finished, running_per_service, overall):
+        # Walk the queue in order, starting every unit whose service still has
+        # headroom. Units for saturated services keep their place in line.
+        skipped = deque()
+        while pending and len(in_flight) < self.max_workers:
+            task = pending.popleft()
+            if running_per_service.get(task.slot, 0) >= self.limit_for(task.service):
+                skipped.append(task)
+                continue
+            buffered_stdout.start_capture()
+            started = self._start(task, overall)
+            output = buffered_stdout.stop_capture()
+            if not started:
+                task.output = output
+                task.done = True
+                continue
+            running_per_service[task.slot] = running_per_service.get(task.slot, 0) + 1
+            task.thread = threading.Thread(
+                target=self._run_captured, args=(buffered_stdout, task, finished),
+                name=f"awsome-enum-{task.service}", daemon=True
+            )
+            in_flight.add(task)
+            task.thread.start()
+        skipped.extend(pending)
+        pending.clear()
+        pending.extend(skipped)
+
+    def _start(self, task, overall):
+        """Work out the unit's deadline; False (after noting why) if it has already passed."""
+        now = time.monotonic()
+        task.deadline = overall
+        budget = self.budget_for(task.service)
+        if budget:
+            with self._lock:
+                started = self._started.setdefault(task.service, now)
+            if task.deadline is None or started + budget < task.deadline:
+                task.deadline = started + budget
+        if task.deadline is None or now < task.deadline:
+            return True
+        self._report_expired(task)
+        return False
+
+    def _next_abandon(self, in_flight):
+        deadlines = [task.deadline for task in in_flight if task.deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) + ABANDON_GRACE - time.monotonic())
+
+    def _abandon_overdue(self, buffered_stdout, in_flight, running_per_service):
+        now = time.monotonic()
+        for task in list(in_flight):
+            if task.deadline is None or now < task.deadline + ABANDON_GRACE:
+                continue
+            in_flight.discard(task)
+            running_per_service[task.slot] -= 1
+            task.abandoned = True
+            buffered_stdout.drop(task.thread.ident)
+            task.output = f"\033[93m[!] Abandoned a {task.service} unit still running past its time budget\033[0m\n"
+            task.done = True
+
+    def _report_expired(self, task):
+        # One notice per service (or one for the whole run), not one per unit
+        budget = self.budget_for(task.service)
+        with self._lock:
+            started = self._started.get(task.service)
+            over_budget = bool(budget) and started is not None and time.monotonic() >= started + budget
+            key = task.service if over_budget else None
+            if key in self._expired:
+                return
+            self._expired.add(key)
+        if over_budget:
+            message = f"{task.service} used up its {budget:g}s time budget; skipping its remaining work"
+        else:
+            message = "Time limit reached; skipping the remaining enumeration units"
+        print_yellow(f"\n[!] {message}")
+        emit(ERROR, service=task.service, region=task.region, code='EnumerationTimeout', message=message)
+
+    def _run_captured(self, buffered_stdout, task, finished):
+        buffered_stdout.start_capture()
+        try:
+            self._invoke(task)
+        finally:
+            finished.put((task, buffered_stdout.stop_capture()))
+
+    def _invoke(self, task):
+        try:
+            with deadline_at(task.deadline):
+                task.func(*task.args)
+        except EnumerationTimeout:
+            # An abandoned unit stops at its next API call; it has already been reported
+            if not task.abandoned:
+                self._report_expired(task)
+        except Exception as e:
+            if task.abandoned:
+                return
+            print_red(f"Error while enumerating {task.service}: {str(e)}")
+            emit(ERROR, service=task.service, region=task.region, code=type(e).__name__, message=str(e))
@@ -5,6 +5,11 @@ SERVICE_SUBCOMMANDS = {
             'description': 'Finds an IAM role with matching name',
             'usage': 'find-role [role-name]',
             'requires_args': True
+        },
+        'find-privesc-paths': {
+            'description': 'Finds multi-hop privilege escalation paths to administrator access',
+            'usage': 'find-privesc-paths [principal-arn]',
+            'requires_args': False
         }
     },
     's3': {
@@ -1,59 +1,367 @@
 from abc import ABC, abstractmethod
+import threading
 import boto3
 import yaml
-from ..utils import load_permissions, print_green, print_red
+from botocore.exceptions import ClientError, PaginationError
+from ..utils import load_permissions, print_green, print_red, print_yellow
+from ..cache import ResponseCache, MAX_CACHED_LISTING_ITEMS
+from ..engine import ThreadEngine
+from ..clients import ClientPool
+from ..session_context import SessionContext
+from ..dispatch import dispatch_index
+from ..evaluator import ALLOWED, CONDITIONAL
+from ..budget import check_deadline
+from ..output import emit, has_sinks, RESOURCE, POLICY, INTERESTING_PERMISSION, ERROR
+
+_client_pool_lock = threading.Lock()
 
 class AWSServiceInterface(ABC):
     """Base interface for all AWS services to implement."""
     
+    # Whether the service keeps separate resources in every region
+    REGIONAL = True
+    
+    # Concrete IAM action -> name of the method handling it, in enumeration order
+    ACTION_HANDLERS = {}
+    # Actions in ACTION_HANDLERS that wildcards such as 'sqs:*' do not reach
+    EXPLICIT_ACTIONS = ()
+    # Handlers that list the whole service whatever resource they are given
+    LISTING_HANDLERS = ()
+    # Handlers that act on one named resource; a wildcard resource gives them nothing to do
+    CONCRETE_HANDLERS = ()
+    
     def __init__(self, session=None, service_name=None, debug=False):
         self.session = session
         self.service_name = service_name
         self.debug = debug
+        self.region = None
+        self.endpoint_url = None
+        self.engine = ThreadEngine()
+        self.rate_limiter = None
         self.interesting_permissions = load_permissions()
-        self.client = self._initialize_client()
+        self.client_pool = None
+        self.session_context = None
+        self.page_size = None
+        self.max_items = None
+        self.response_cache = None
+        self._handled = set()
+        self._handled_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """The boto3 client for this aws service, created on first use."""
+        return self.get_client(self.service_name)
+    
+    def get_client(self, service_name):
+        """
+        Return the boto3 client for the given service in this instance's region.
+        
+        Args:
+            service_name (str): The boto3 service name (e.g. 'ec2', 'sts')
+        """
+        return self._get_client_pool().get(service_name, self.region)
     
-    def _initialize_client(self):
-        """Initialize the boto3 client for this aws service."""
-        return self.session.client(self.service_name)
+    def _get_client_pool(self):
+        if self.client_pool is None:
+            # Standalone use; AWSEnumerator hands every service one shared pool
+            with _client_pool_lock:
+                if self.client_pool is None:
+                    self.client_pool = ClientPool(
+                        self.session,
+                        endpoint_url=self.endpoint_url,
+                        rate_limiter=self.rate_limiter
+                    )
+        return self.client_pool
     
-    def check_interesting_permissions(self, action, resource, print_line):
+    def set_region(self, region):
+        """
+        Pin this service instance to a region.
+        
+        Args:
+            region (str): The region to create clients in (None for the session default)
+        """
+        self.region = region
+    
+    def set_endpoint_url(self, endpoint_url):
+        """Send every API call to a custom endpoint (e.g. a local moto server)."""
+        self.endpoint_url = endpoint_url
+    
+    def set_rate_limiter(self, rate_limiter):
+        """Pace every client this service creates through a shared RateLimiter."""
+        self.rate_limiter = rate_limiter
+    
+    def set_client_pool(self, client_pool):
+        """Draw clients from a ClientPool shared with the other services of the run."""
+        self.client_pool = client_pool
+    
+    def set_session_context(self, session_context):
+        """Share the run's SessionContext (caller identity, account, partition)."""
+        self.session_context = session_context
+    
+    def get_session_context(self):
+        """The caller identity of this service's session, resolved once."""
+        if self.session_context is None:
+            with _client_pool_lock:
+                if self.session_context is None:
+                    self.session_context = SessionContext(self._get_client_pool())
+        return self.session_context
+    
+    def set_engine(self, engine):
+        """Select the backend that runs call_api_many() fan-outs."""
+        self.engine = engine
+    
+    def set_pagination(self, page_size=None, max_items=None):
+        """
+        Tune how list/describe wrappers page through results.
+        
+        Args:
+            page_size (int): Items requested per API call (None for the service default)
+            max_items (int): Stop after this many items per listing (None for no cap)
+        """
+        self.page_size = page_size
+        self.max_items = max_items
+    
+    def set_response_cache(self, response_cache):
+        """Share a per-run ResponseCache between this service and its siblings."""
+        self.response_cache = response_cache
+    
+    def _cache_key(self, client, operation, params):
+        return ResponseCache.make_key(
+            client.meta.service_model.service_name,
+            client.meta.region_name,
+            operation,
+            params
+        )
+    
+    def call_api(self, operation, client=None, **params):
+        """
+        Call a read-only API operation, answering repeats from the response cache.
+        
+        Args:
+            operation (str): The boto3 method name (e.g. 'get_bucket_policy')
+            client: The boto3 client to call (defaults to this service's client)
+            **params: Parameters passed to the API call
+        
+        Returns:
+            dict: The API response
+        """
+        client = client or self.client
+        key = None
+        if self.response_cache is not None:
+            key = self._cache_key(client, operation, params)
+            response, source = self.response_cache.lookup(key)
+            if response is not None:
+                if source == 'disk':
+                    self._emit_response(client, operation, params, response)
+                return response
+    
+        try:
+            response = getattr(client, operation)(**params)
+        except ClientError as e:
+            self._emit_error(client, operation, params, e)
+            raise
+        if key is not None:
+            self.response_cache.put(key, response)
+        self._emit_response(client, operation, params, response)
+        return response
+    
+    def call_api_many(self, operation, params_list, client=None):
+        """
+        Issue the same read-only call once per resource, concurrently through the engine.
+        
+        Args:
+            operation (str): The boto3 method name (e.g. 'get_function')
+            params_list (list): One dict of API parameters per resource
+            client: The boto3 client to call (defaults to this service's client)
+        
+        Returns:
+            list: The responses in params_list order; a failed call yields its exception instead
+        """
+        client = client or self.client
+        results = [None] * len(params_list)
+        pending = []
+        for index, params in enumerate(params_list):
+            if self.response_cache is not None:
+                results[index], source = self.response_cache.lookup(self._cache_key(client, operation, params))
+                if source == 'disk':
+                    self._emit_response(client, operation, params, results[index])
+            if results[index] is None:
+                pending.append(index)
+    
+        if pending:
+            # The async engine's calls run on its own thread, outside the caller's deadline
+            check_deadline()
+            responses = self.engine.call_many(client, operation, [params_list[index] for index in pending])
+            for index, response in zip(pending, responses):
+                results[index] = response
+                params = params_list[index]
+                if isinstance(response, Exception):
+                    self._emit_error(client, operation, params, response)
+                    continue
+                if self.response_cache is not None:
+                    self.response_cache.put(self._cache_key(client, operation, params), response)
+                self._emit_response(client, operation, params, response)
+        return results
+    
+    def call_api_batched(self, operation, batch_key, values, batch_size, result_key, client=None, **params):
+        """
+        Look up many resources through a batch API in as few requests as possible.
+        
+        Values are de-duplicated and split into batch_size chunks; the chunks are
+        fetched through call_api_many(), a window of them at a time on either
+        engine, and items are yielded as each window completes.
+        
+        Args:
+            operation (str): The batch method name (e.g. 'describe_tasks')
+            batch_key (str): The parameter taking the list of identifiers (e.g. 'tasks')
+            values (iterable): The identifiers to look up
+            batch_size (int): The API's maximum identifiers per request
+            result_key (str): The response key holding the items (e.g. 'tasks')
+            client: The boto3 client to call (defaults to this service's client)
+            **params: Parameters shared by every request (e.g. cluster)
+        
+        Yields:
+            The items found under result_key, chunk by chunk
+        """
+        values = list(dict.fromkeys(values))
+        chunks = [values[start:start + batch_size] for start in range(0, len(values), batch_size)]
+        window = max(1, self.engine.batch_window)
+        for start in range(0, len(chunks), window):
+            params_list = [dict(params, **{batch_key: chunk}) for chunk in chunks[start:start + window]]
+            for response in self.call_api_many(operation, params_list, client=client):
+                if isinstance(response, Exception):
+                    raise response
+                yield from response.get(result_key, [])
+    
+    def paginate(self, operation, result_key, client=None, page_size=None, max_items=None, **params):
+        """
+        Lazily yield every item of a list/describe call across all pages.
+        
+        Uses the botocore paginator when the operation has one and falls back to
+        a single call otherwise. Pages are fetched only as the caller consumes
+        items, so large listings can be printed while they are still streaming.
+        
+        Args:
+            operation (str): The boto3 method name (e.g. 'list_functions')
+            result_key (str): The response key holding the items (e.g. 'Functions')
+            client: The boto3 client to call (defaults to this service's client)
+            page_size (int): Override the service's page size for this call
+            max_items (int): Override the service's item cap for this call
+            **params: Parameters passed to the API call
+        
+        Yields:
+            The items found under result_key, in API order
+        """
+        client = client or self.client
+        page_size = page_size or self.page_size
+        max_items = max_items or self.max_items
+    
+        if self.response_cache is None:
+            yield from self._fetch_items(client, operation, result_key, page_size, max_items, params)
+            return
+    
+        # Page size only changes how results are fetched, not what they are
+        key = self._cache_key(client, operation, dict(params, MaxItems=max_items, ResultKey=result_key))
+        cached, source = self.response_cache.lookup(key)
+        if cached is not None:
+            for item in cached:
+                if source == 'disk':
+                    self._emit_item(client, operation, item)
+                yield item
+            return
+    
+        items = []
+        for item in self._fetch_items(client, operation, result_key, page_size, max_items, params):
+            if items is not None:
+                items.append(item)
+                if len(items) > MAX_CACHED_LISTING_ITEMS:
+                    items = None
+            yield item
+        if items is not None:
+            self.response_cache.put(key, tuple(items))
+    
+    def _fetch_items(self, client, operation, result_key, page_size, max_items, params):
+        try:
+            for item in self._iter_items(client, operation, result_key, page_size, max_items, params):
+                self._emit_item(client, operation, item)
+                yield item
+        except ClientError as e:
+            self._emit_error(client, operation, params, e)
+            raise
+    
+    def _iter_items(self, client, operation, result_key, page_size, max_items, params):
+        if not client.can_paginate(operation):
+            items = getattr(client, operation)(**params).get(result_key, [])
+            yield from (items[:max_items] if max_items else items)
+            return
+    
+        paginator = client.get_paginator(operation)
+        config = {}
+        if max_items:
+            config['MaxItems'] = max_items
+        try:
+            pages = paginator.paginate(PaginationConfig=dict(config, PageSize=page_size) if page_size else config, **params)
+        except PaginationError:
+            # The operation has no page size parameter
+            pages = paginator.paginate(PaginationConfig=config, **params)
+    
+        for page in pages:
+            yield from page.get(result_key, [])
+    
+    def _emit_item(self, client, operation, item):
+        if has_sinks():
+            emit(
+                RESOURCE,
+                service=client.meta.service_model.service_name,
+                region=client.meta.region_name,
+                operation=operation,
+                data=item
+            )
+    
+    def _emit_response(self, client, operation, params, response):
+        if has_sinks():
+            emit(
+                POLICY if 'policy' in operation else RESOURCE,
+                service=client.meta.service_model.service_name,
+                region=client.meta.region_name,
+                operation=operation,
+                params=params,
+                data={key: value for key, value in response.items() if key != 'ResponseMetadata'}
+            )
+    
+    def _emit_error(self, client, operation, params, error):
+        if has_sinks():
+            emit(
+                ERROR,
+                service=client.meta.service_model.service_name,
+                region=client.meta.region_name,
+                operation=operation,
+                params=params,
+                code=error.response['Error'].get('Code') if isinstance(error, ClientError) else type(error).__name__,
+                message=str(error)
+            )
+    
+    def check_interesting_permissions(self, action, resource, print_line=False, evaluator=None):
         """
         Check if a permission action is interesting and print a message if it is.
-        Handles actions with wildcards (e.g., 'ssm:*' or 'ssm:Get*')
+        Handles actions with IAM wildcards (e.g., 'ssm:*', 'ssm:Get*', 'iam:*Policy*', '*')
     
         Args:
             action (str): The AWS IAM action to check (e.g., 'iam:PassRole', 'ssm:*')
             resource (str): The AWS resource ARN the action applies to
             print_line (bool): Whether to print a separator line
+            evaluator: The caller's EffectivePermissions; interesting actions it denies are not reported
+                       and ones it cannot settle are marked conditional
         """
-        # Check exact matches first
-        if action in self.interesting_permissions:
-            self._print_interesting_permission(action, resource, print_line)
-            return
-    
-        # Handle wildcard actions
-        action_service, action_pattern = action.split(':') if ':' in action else ('', '')
-        if '*' in action_pattern:
-            # Find all matching interesting permissions
-            for interesting_action in self.interesting_permissions:
-                interesting_service, interesting_name = interesting_action.split(':')
-                
-                # Skip if services don't match
-                if action_service != interesting_service:
-                    continue
-                    
-                # Full service wildcard (e.g., ssm:*)
-                if action_pattern == '*':
-                    self._print_interesting_permission(interesting_action, resource, print_line)
-                    continue
-                    
-                # Partial wildcard (e.g., ssm:Get*)
-                wildcard_prefix = action_pattern.replace('*', '')
-                if interesting_name.startswith(wildcard_prefix):
-                    self._print_interesting_permission(interesting_action, resource, print_line)
+        for interesting_action in self.interesting_permissions.match(action):
+            decision = evaluator.evaluate(interesting_action, resource) if evaluator is not None else ALLOWED
+            if decision not in (ALLOWED, CONDITIONAL):
+                if self.debug:
+                    print_yellow(f"\n[*] '{interesting_action}' on {resource} is denied by policy, boundary or SCP")
+                continue
+            self._print_interesting_permission(interesting_action, resource, print_line, decision)
 
-    def _print_interesting_permission(self, action, resource, print_line):
+    def _print_interesting_permission(self, action, resource, print_line, decision=ALLOWED):
         """Helper method to print interesting permission details."""
         if print_line:
             print("\n" + "-" * 100)
@@ -61,11 +369,25 @@ class AWSServiceInterface(ABC):
         print_green(f"[!] '{action}' is an Interesting Permission for possible privilege escalation.")
         print_green(f"➡️  More info: {self.interesting_permissions[action]}")
         print_green(f"🎯 Resource: {resource}")
+        if decision == CONDITIONAL:
+            print_yellow("⚖️  Conditional: depends on policy conditions or on policy layers that could not be read")
+        emit(
+            INTERESTING_PERMISSION,
+            service=self.service_name,
+            action=action,
+            resource=resource,
+            reference=self.interesting_permissions[action],
+            decision=decision
+        )
 
     def parse_policy_document(self, policy_document):
         """
         Parse a policy document and extract the actions and resources.
         
+        Allow statements are collected, conditional ones included; Deny
+        statements, NotAction / NotResource exclusions and conditions are
+        settled by the PolicyEvaluator before anything is enumerated.
+        
         Args:
             policy_document (dict): The policy document to parse
         
@@ -73,24 +395,28 @@ class AWSServiceInterface(ABC):
             dict: A dictionary mapping resources to actions
         """
         resource_actions = {}
+        statements = policy_document.get('Statement', [])
+        if isinstance(statements, dict):
+            statements = [statements]
     
-        for statement in policy_document.get('Statement', []):
+        for statement in statements:
             if statement.get('Effect', '').lower() == 'deny':
                 print("\n" + "-" * 100)
-                print_red(f"\n⛔ Skipping enumeration - Effect is DENY")
+                print_red(f"\n⛔ Effect is DENY - denied actions are left out of detailed enumeration")
                 continue
             
             if statement.get('Condition'):
                 print("\n" + "-" * 100)
-                print_red(f"\n🔍 Conditions exist on this policy. Manual intervention needed.")
+                print_red(f"\n🔍 Conditions exist on this policy. They are checked against the caller's context before enumeration.")
                 print(yaml.dump(statement))
-                continue
             
-            actions = statement.get('Action', [])
+            # NotAction / NotResource grant everything but the listed entries;
+            # the policy evaluator drops the excluded ones before enumeration
+            actions = statement.get('Action', [] if 'NotAction' not in statement else ['*'])
             if isinstance(actions, str):
                 actions = [actions]
     
-            resources = statement.get('Resource', [])
+            resources = statement.get('Resource', [] if 'NotResource' not in statement else ['*'])
             if isinstance(resources, str):
                 resources = [resources]
     
@@ -117,17 +443,61 @@ class AWSServiceInterface(ABC):
         """
         pass
     
-    @abstractmethod
-    def handle_permission_action(self, action, resource):
+    @classmethod
+    def handles(cls, action):
+        """Whether any handler of this service covers the action (concrete or wildcard)."""
+        return action in dispatch_index(cls)
+    
+    @classmethod
+    def handlers_for(cls, action):
+        """Names of the handler methods covering an action, in ACTION_HANDLERS order."""
+        return dispatch_index(cls).handlers(action)
+    
+    @classmethod
+    def handler_actions(cls, action, handler):
+        """Concrete actions through which an action (or pattern) reaches one of the handlers."""
+        return dispatch_index(cls).actions(action, handler)
+    
+    @classmethod
+    def handler_scope(cls, handler):
+        """
+        How a handler uses its resource.
+        
+        Returns:
+            str: 'listing' (ignores it), 'concrete' (needs a named resource) or
+                 'resource' (acts on it, a bare '*' meaning every resource)
+        """
+        if handler in cls.LISTING_HANDLERS:
+            return 'listing'
+        if handler in cls.CONCRETE_HANDLERS:
+            return 'concrete'
+        return 'resource'
+    
+    def handle_permission_action(self, action, resource, handlers=None):
         """
         Handle a specific permission action that's been discovered.
         This allows for targeted enumeration based on permissions found in policy documents.
         
+        Every handler the action covers runs, so 'ecs:*' or 'codebuild:List*'
+        reach all of them, and each (handler, resource) pair runs at most once
+        per run however many policy actions overlap on it. A listing handler
+        runs once whatever resources it is found on.
+        
         Args:
             action (str): The permission action (e.g., 's3:ListBuckets')
             resource (str): The resource ARN or wildcard
+            handlers (list): Run only these handlers (an EnumerationPlan's share
+                             of the work); defaults to every handler covering the action
             
         Returns:
             None
         """
-        pass
\ No newline at end of file
+        if handlers is None:
+            handlers = self.handlers_for(action)
+        for handler in handlers:
+            key = (handler, '*' if handler in self.LISTING_HANDLERS else resource)
+            with self._handled_lock:
+                if key in self._handled:
+                    continue
+                self._handled.add(key)
+            getattr(self, handler)(action, resource)
@@ -2,27 +2,37 @@ from tabulate import tabulate
 from .aws_service_interface import AWSServiceInterface
 from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
-import boto3
+
+# BatchGetProjects, BatchGetBuilds and BatchGetBuildBatches accept up to 100 names/IDs
+BATCH_SIZE = 100
 
 class CodeBuildService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "codebuild:ListSourceCredentials": "_handle_list_source_credentials",
+        "codebuild:ListSharedProjects": "_handle_list_shared_projects",
+        "codebuild:ListProjects": "_handle_list_projects",
+        "codebuild:ListBuilds": "_handle_list_builds",
+        "codebuild:ListBuildsForProject": "_handle_list_builds_for_project",
+        "codebuild:ListBuildBatches": "_handle_list_build_batches",
+        "codebuild:ListBuildBatchesForProject": "_handle_list_build_batches_for_project",
+        "codebuild:ListReports": "_handle_list_reports",
+        "codebuild:BatchGetProjects": "_handle_batch_get_projects",
+        "codebuild:BatchGetBuilds": "_handle_list_builds",
+        "codebuild:BatchGetBuildBatches": "_handle_list_build_batches",
+        "codebuild:DescribeTestCases": "_handle_describe_test_cases",
+    }
+    LISTING_HANDLERS = (
+        "_handle_list_source_credentials",
+        "_handle_list_projects",
+        "_handle_list_shared_projects",
+        "_handle_list_builds",
+        "_handle_list_build_batches",
+        "_handle_list_reports",
+    )
+    CONCRETE_HANDLERS = ("_handle_describe_test_cases",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'codebuild', debug)
-        self.supported_actions = [
-            "codebuild:*",
-            "codebuild:List*",
-            "codebuild:BatchGet*",
-            "codebuild:Describe*",
-            "codebuild:ListSourceCredentials",
-            "codebuild:ListSharedProjects",
-            "codebuild:ListProjects",
-            "codebuild:BatchGetProjects",
-            "codebuild:ListBuilds",
-            "codebuild:ListBuildsForProject",
-            "codebuild:ListBuildBatches",
-            "codebuild:ListBuildBatchesForProject",
-            "codebuild:ListReports",
-            "codebuild:DescribeTestCases"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -36,39 +46,15 @@ class CodeBuildService(AWSServiceInterface):
             self._handle_list_builds("codebuild:ListBuilds", "*")
             self._handle_list_build_batches("codebuild:ListBuildBatches", "*")
             self._handle_list_reports("codebuild:ListReports", "*")
-            self._handle_list_builds_for_project("codebuild:ListBuildsForProject", "*")
-            self._handle_list_build_batches_for_project("codebuild:ListBuildBatchesForProject", "*")
             self._handle_batch_get_projects("codebuild:BatchGetProjects", "*")
             self._handle_describe_test_cases("codebuild:DescribeTestCases", "*")
         except Exception as e:
             print_red(f"Error enumerating CodeBuild resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "codebuild:ListSourceCredentials" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_source_credentials(action, resource)
-        elif "codebuild:ListSharedProjects" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_shared_projects(action, resource)
-        elif "codebuild:ListProjects" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_projects(action, resource)
-        elif "codebuild:ListBuilds" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_builds(action, resource)
-        elif "codebuild:ListBuildsForProject" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_builds_for_project(action, resource)
-        elif "codebuild:ListBuildBatches" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_build_batches(action, resource)
-        elif "codebuild:ListBuildBatchesForProject" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_build_batches_for_project(action, resource)
-        elif "codebuild:ListReports" in action or "codebuild:List*" in action or "codebuild:*" in action:
-            self._handle_list_reports(action, resource)
-        elif "codebuild:BatchGetProjects" in action or "codebuild:BatchGet*" in action or "codebuild:*" in action:
-            self._handle_batch_get_projects(action, resource)
-        elif "codebuild:DescribeTestCases" in action or "codebuild:Describe*" in action or "codebuild:*" in action:
-            self._handle_describe_test_cases(action, resource)
-
     def _handle_list_source_credentials(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing source credentials")
         try:
-            creds = self.list_source_credentials()
+            creds = list(self.list_source_credentials())
             if creds:
                 print_yellow("\nSource Credentials:")
                 creds_data = [[
@@ -84,28 +70,37 @@ class CodeBuildService(AWSServiceInterface):
     def _handle_list_projects(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing projects")
         try:
-            projects = self.list_projects()
+            projects = list(self.list_projects())
             if projects:
                 print_yellow("\nProjects:")
+                shown = set()
+                try:
+                    # Details arrive 100 projects per request and print as each batch lands
+                    for detail in self.batch_get_projects(projects):
+                        shown.add(detail.get('name'))
+                        print_green(f"\nProject: {detail.get('name')}")
+                        self._display_environment_variables(detail.get('environment', {}))
+                except Exception as e:
+                    # Without codebuild:BatchGetProjects only the names are known
+                    if self.debug:
+                        print_red(f"Error getting project details: {str(e)}")
                 for project in projects:
-                    print_green(f"\nProject: {project}")
-                    # Get detailed project info
-                    project_details = self.batch_get_projects([project])
-                    if project_details:
-                        for detail in project_details:
-                            env = detail.get('environment', {})
-                            print_yellow("\nEnvironment Variables:")
-                            if env.get('environmentVariables'):
-                                env_vars = [[var['name'], var['value']] for var in env['environmentVariables']]
-                                print(tabulate(env_vars, headers=['Name', 'Value'], tablefmt='simple'))
+                    if project not in shown:
+                        print_green(f"\nProject: {project}")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in projects handler: {str(e)}")
 
+    def _display_environment_variables(self, environment):
+        print_yellow("\nEnvironment Variables:")
+        if env_vars := environment.get('environmentVariables'):
+            env_data = [[var.get('name'), var.get('value'), var.get('type', 'PLAINTEXT')] for var in env_vars]
+            print(tabulate(env_data, headers=['Name', 'Value', 'Type'], tablefmt='simple'))
+
     def _handle_list_shared_projects(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing shared projects")
         try:
-            shared_projects = self.list_shared_projects()
+            shared_projects = list(self.list_shared_projects())
             if shared_projects:
                 print_yellow("\nShared Projects:")
                 for project in shared_projects:
@@ -117,51 +112,114 @@ class CodeBuildService(AWSServiceInterface):
     def _handle_list_builds(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing builds")
         try:
-            builds = self.list_builds()
+            builds = list(self.list_builds())
             if builds:
-                print_yellow("\nBuilds:")
-                print(tabulate([[build] for build in builds], headers=['Build ID'], tablefmt='simple'))
+                self._display_builds(builds, "Builds")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in builds handler: {str(e)}")
 
-    def _handle_list_builds_for_project(self, action, project_name):
-        print_yellow(f"\n[*] Found {action} permission - Listing builds for project {project_name}")
+    def _handle_list_builds_for_project(self, action, resource):
+        if '*' in resource:
+            # Every project's builds are already in the account-wide listing
+            return self._handle_list_builds(action, resource)
         try:
-            builds = self.list_builds_for_project(project_name)
-            if builds:
-                print_yellow(f"\nBuilds for project {project_name}:")
-                print(tabulate([[build] for build in builds], headers=['Build ID'], tablefmt='simple'))
+            for project_name in self._project_names(resource):
+                print_yellow(f"\n[*] Found {action} permission - Listing builds for project {project_name}")
+                builds = list(self.list_builds_for_project(project_name))
+                if builds:
+                    self._display_builds(builds, f"Builds for project {project_name}")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in project builds handler: {str(e)}")
 
+    def _display_builds(self, build_ids, title):
+        print_yellow(f"\n{title}:")
+        shown = set()
+        try:
+            for build in self.batch_get_builds(build_ids):
+                shown.add(build.get('id'))
+                logs = build.get('logs', {})
+                print_green(f"\nBuild: {build.get('id')}")
+                build_data = [
+                    ['Project', build.get('projectName')],
+                    ['Status', build.get('buildStatus')],
+                    ['Started', build.get('startTime')],
+                    ['Initiator', build.get('initiator')],
+                    ['Log Group', logs.get('groupName')],
+                    ['Log Stream', logs.get('streamName')],
+                    ['S3 Logs', logs.get('s3LogsArn') or logs.get('s3Logs', {}).get('location')],
+                    ['Logs URL', logs.get('deepLink')]
+                ]
+                print(tabulate([row for row in build_data if row[1]], tablefmt='simple'))
+                if build.get('environment', {}).get('environmentVariables'):
+                    self._display_environment_variables(build['environment'])
+        except Exception as e:
+            # Without codebuild:BatchGetBuilds only the IDs are known
+            if self.debug:
+                print_red(f"Error getting build details: {str(e)}")
+            remaining = [build for build in build_ids if build not in shown]
+            if remaining:
+                print(tabulate([[build] for build in remaining], headers=['Build ID'], tablefmt='simple'))
+
     def _handle_list_build_batches(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing build batches")
         try:
-            batches = self.list_build_batches()
+            batches = list(self.list_build_batches())
             if batches:
-                print_yellow("\nBuild Batches:")
-                print(tabulate([[batch] for batch in batches], headers=['Batch ID'], tablefmt='simple'))
+                self._display_build_batches(batches, "Build Batches")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in build batches handler: {str(e)}")
 
-    def _handle_list_build_batches_for_project(self, action, project_name):
-        print_yellow(f"\n[*] Found {action} permission - Listing build batches for project {project_name}")
+    def _handle_list_build_batches_for_project(self, action, resource):
+        if '*' in resource:
+            return self._handle_list_build_batches(action, resource)
         try:
-            batches = self.list_build_batches_for_project(project_name)
-            if batches:
-                print_yellow(f"\nBuild Batches for project {project_name}:")
-                print(tabulate([[batch] for batch in batches], headers=['Batch ID'], tablefmt='simple'))
+            for project_name in self._project_names(resource):
+                print_yellow(f"\n[*] Found {action} permission - Listing build batches for project {project_name}")
+                batches = list(self.list_build_batches_for_project(project_name))
+                if batches:
+                    self._display_build_batches(batches, f"Build Batches for project {project_name}")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in project build batches handler: {str(e)}")
 
+    def _display_build_batches(self, batch_ids, title):
+        print_yellow(f"\n{title}:")
+        shown = set()
+        try:
+            for batch in self.batch_get_build_batches(batch_ids):
+                shown.add(batch.get('id'))
+                log_config = batch.get('logConfig', {})
+                print_green(f"\nBuild Batch: {batch.get('id')}")
+                batch_data = [
+                    ['Project', batch.get('projectName')],
+                    ['Status', batch.get('buildBatchStatus')],
+                    ['Started', batch.get('startTime')],
+                    ['Initiator', batch.get('initiator')],
+                    ['Log Group', log_config.get('cloudWatchLogs', {}).get('groupName')],
+                    ['Log Stream', log_config.get('cloudWatchLogs', {}).get('streamName')],
+                    ['S3 Logs', log_config.get('s3Logs', {}).get('location')]
+                ]
+                print(tabulate([row for row in batch_data if row[1]], tablefmt='simple'))
+        except Exception as e:
+            if self.debug:
+                print_red(f"Error getting build batch details: {str(e)}")
+            remaining = [batch for batch in batch_ids if batch not in shown]
+            if remaining:
+                print(tabulate([[batch] for batch in remaining], headers=['Batch ID'], tablefmt='simple'))
+
+    def _project_names(self, resource):
+        """Projects a resource refers to: every project for wildcards, else the one in the ARN."""
+        if '*' in resource:
+            return list(self.list_projects())
+        return [resource.split('project/')[-1]] if resource.startswith('arn:') else [resource]
+
     def _handle_list_reports(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing reports")
         try:
-            reports = self.list_reports()
+            reports = list(self.list_reports())
             if reports:
                 print_yellow("\nReports:")
                 for report in reports:
@@ -173,7 +231,7 @@ class CodeBuildService(AWSServiceInterface):
 
     def _handle_describe_test_cases(self, action, report_arn):
         try:
-            test_cases = self.describe_test_cases(report_arn)
+            test_cases = list(self.describe_test_cases(report_arn))
             if test_cases:
                 print_yellow("\nTest Cases:")
                 test_data = [[
@@ -189,56 +247,50 @@ class CodeBuildService(AWSServiceInterface):
     def _handle_batch_get_projects(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Getting project details")
         try:
-            projects = self.list_projects()
+            projects = self._project_names(resource)
             if projects:
-                project_details = self.batch_get_projects(projects)
-                if project_details:
-                    print_yellow("\nProject Details:")
-                    for detail in project_details:
-                        print_green(f"\nProject Name: {detail.get('name')}")
-                        print_yellow(f"Description: {detail.get('description')}")
-                        print_yellow(f"Source Type: {detail.get('source', {}).get('type')}")
+                print_yellow("\nProject Details:")
+                for detail in self.batch_get_projects(projects):
+                    print_green(f"\nProject Name: {detail.get('name')}")
+                    print_yellow(f"Description: {detail.get('description')}")
+                    print_yellow(f"Source Type: {detail.get('source', {}).get('type')}")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in batch get projects handler: {str(e)}")
 
     # API wrapper methods
     def list_source_credentials(self):
-        response = self.client.list_source_credentials()
-        return response.get('sourceCredentialsInfos', [])
+        return self.paginate('list_source_credentials', 'sourceCredentialsInfos')
 
     def list_projects(self):
-        response = self.client.list_projects()
-        return response.get('projects', [])
+        return self.paginate('list_projects', 'projects')
 
     def list_shared_projects(self):
-        response = self.client.list_shared_projects()
-        return response.get('projects', [])
+        return self.paginate('list_shared_projects', 'projects')
 
     def batch_get_projects(self, names):
-        response = self.client.batch_get_projects(names=names)
-        return response.get('projects', [])
+        return self.call_api_batched('batch_get_projects', 'names', names, BATCH_SIZE, 'projects')
+
+    def batch_get_builds(self, ids):
+        return self.call_api_batched('batch_get_builds', 'ids', ids, BATCH_SIZE, 'builds')
+
+    def batch_get_build_batches(self, ids):
+        return self.call_api_batched('batch_get_build_batches', 'ids', ids, BATCH_SIZE, 'buildBatches')
 
     def list_builds(self):
-        response = self.client.list_builds()
-        return response.get('ids', [])
+        return self.paginate('list_builds', 'ids')
 
     def list_builds_for_project(self, project_name):
-        response = self.client.list_builds_for_project(projectName=project_name)
-        return response.get('ids', [])
+        return self.paginate('list_builds_for_project', 'ids', projectName=project_name)
 
     def list_build_batches(self):
-        response = self.client.list_build_batches()
-        return response.get('ids', [])
+        return self.paginate('list_build_batches', 'ids')
 
     def list_build_batches_for_project(self, project_name):
-        response = self.client.list_build_batches_for_project(projectName=project_name)
-        return response.get('ids', [])
+        return self.paginate('list_build_batches_for_project', 'ids', projectName=project_name)
 
     def list_reports(self):
-        response = self.client.list_reports()
-        return response.get('reports', [])
+        return self.paginate('list_reports', 'reports')
 
     def describe_test_cases(self, report_arn):
-        response = self.client.describe_test_cases(reportArn=report_arn)
-        return response.get('testCases', [])
+        return self.paginate('describe_test_cases', 'testCases', reportArn=report_arn)
@@ -6,9 +6,13 @@ import base64
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class EC2Service(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "ec2:DescribeInstances": "_handle_describe_instances",
+    }
+    LISTING_HANDLERS = ("_handle_describe_instances",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'ec2', debug)
-        self.supported_actions = ["ec2:DescribeInstances", "ec2:Describe*", "ec2:*"]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -20,14 +24,13 @@ class EC2Service(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating EC2 resources: {str(e)}")
     
-    def handle_permission_action(self, action, resource):
-        if "ec2:DescribeInstances" in action or "ec2:Describe*" in action or "ec2:*" in action:
-            print_yellow(f"\n[*] Found {action} permission - Listing all instances:\n")
-            self._list_and_display_instances()
+    def _handle_describe_instances(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all instances:\n")
+        self._list_and_display_instances()
     
     def _list_and_display_instances(self):
         try:
-            instances = self.describe_instances()
+            instances = list(self.describe_instances())
             if not instances:
                 print_yellow("No EC2 instances found.")
                 return
@@ -59,7 +62,8 @@ class EC2Service(AWSServiceInterface):
     # subcommand methods
     def describe_instance_attribute(self, instance_id, attribute):
         try:
-            response = self.client.describe_instance_attribute(
+            response = self.call_api(
+                'describe_instance_attribute',
                 InstanceId=instance_id,
                 Attribute=attribute
             )
@@ -80,8 +84,5 @@ class EC2Service(AWSServiceInterface):
 
     # Wrapper methods for EC2 API calls
     def describe_instances(self):
-        response = self.client.describe_instances()
-        instances = []
-        for reservation in response.get('Reservations', []):
-            instances.extend(reservation.get('Instances', []))
-        return instances
\ No newline at end of file
+        for reservation in self.paginate('describe_instances', 'Reservations'):
+            yield from reservation.get('Instances', [])
\ No newline at end of file
@@ -4,18 +4,26 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class ECRService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "ecr:DescribeRegistry": "_handle_describe_registry",
+        "ecr:DescribeRepositories": "_handle_describe_repositories",
+        "ecr:ListImages": "_handle_list_images",
+        "ecr:DescribeImages": "_handle_list_images",
+        "ecr:GetRepositoryPolicy": "_handle_get_repository_policy",
+        "ecr-public:DescribeRepositories": "_handle_describe_public_repositories",
+    }
+    LISTING_HANDLERS = (
+        "_handle_describe_registry",
+        "_handle_describe_repositories",
+        "_handle_describe_public_repositories",
+    )
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'ecr', debug)
-        self.public_client = session.client('ecr-public') if session else None
-        self.supported_actions = [
-            "ecr:*",
-            "ecr:DescribeRegistry",
-            "ecr:DescribeRepositories",
-            "ecr:ListImages",
-            "ecr:DescribeImages",
-            "ecr:GetRepositoryPolicy",
-            "ecr-public:DescribeRepositories"
-        ]
+
+    @property
+    def public_client(self):
+        return self.get_client('ecr-public') if self.session else None
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -29,18 +37,6 @@ class ECRService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating ECR resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if action in ("ecr:DescribeRegistry", "ecr:*"):
-            self._handle_describe_registry(action, resource)
-        elif action in ("ecr:DescribeRepositories", "ecr:*"):
-            self._handle_describe_repositories(action, resource)
-        elif action in ("ecr:ListImages", "ecr:*"):
-            self._handle_list_images(action, resource)
-        elif action in ("ecr:GetRepositoryPolicy", "ecr:*"):
-            self._handle_get_repository_policy(action, resource)
-        elif action in ("ecr-public:DescribeRepositories", "ecr:*"):
-            self._handle_describe_public_repositories(action, resource)
-
     def _handle_describe_registry(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Checking registry details")
         try:
@@ -64,19 +60,19 @@ class ECRService(AWSServiceInterface):
     def _handle_describe_repositories(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing repositories")
         try:
-            repositories = self.describe_repositories()
-            if repositories:
-                for repo in repositories:
-                    print_yellow(f"\n[*] Repository: {repo.get('repositoryName')}")
-                    repo_data = [
-                        ['ARN', repo.get('repositoryArn')],
-                        ['URI', repo.get('repositoryUri')],
-                        ['Created', repo.get('createdAt')],
-                        ['Image Tags Mutability', repo.get('imageTagMutability')],
-                        ['Encryption Type', repo.get('encryptionConfiguration', {}).get('encryptionType', 'N/A')]
-                    ]
-                    print(tabulate(repo_data, tablefmt='simple'))
-            else:
+            found = False
+            for repo in self.describe_repositories():
+                found = True
+                print_yellow(f"\n[*] Repository: {repo.get('repositoryName')}")
+                repo_data = [
+                    ['ARN', repo.get('repositoryArn')],
+                    ['URI', repo.get('repositoryUri')],
+                    ['Created', repo.get('createdAt')],
+                    ['Image Tags Mutability', repo.get('imageTagMutability')],
+                    ['Encryption Type', repo.get('encryptionConfiguration', {}).get('encryptionType', 'N/A')]
+                ]
+                print(tabulate(repo_data, tablefmt='simple'))
+            if not found:
                 print_yellow("No repositories found.")
         except Exception as e:
             if self.debug:
@@ -98,7 +94,7 @@ class ECRService(AWSServiceInterface):
                 print_red(f"Error in images handler: {str(e)}")
 
     def _display_images(self, repo_name):
-        images = self.list_images(repo_name)
+        images = list(self.list_images(repo_name))
         if images:
             print_yellow(f"\nImages in {repo_name}:")
             for image in images:
@@ -133,17 +129,18 @@ class ECRService(AWSServiceInterface):
     def _handle_describe_public_repositories(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Checking public repositories")
         try:
-            public_repos = self.describe_public_repositories()
-            if public_repos:
-                print_yellow("\nPublic Repositories:")
-                for repo in public_repos:
-                    repo_data = [
-                        ['Name', repo.get('repositoryName')],
-                        ['URI', repo.get('repositoryUri')],
-                        ['ARN', repo.get('repositoryArn')]
-                    ]
-                    print(tabulate(repo_data, tablefmt='simple'))
-            else:
+            found = False
+            for repo in self.describe_public_repositories():
+                if not found:
+                    print_yellow("\nPublic Repositories:")
+                    found = True
+                repo_data = [
+                    ['Name', repo.get('repositoryName')],
+                    ['URI', repo.get('repositoryUri')],
+                    ['ARN', repo.get('repositoryArn')]
+                ]
+                print(tabulate(repo_data, tablefmt='simple'))
+            if not found:
                 print_yellow("No public repositories found.")
         except Exception as e:
             if self.debug:
@@ -151,25 +148,23 @@ class ECRService(AWSServiceInterface):
 
     # API wrapper methods
     def describe_registry(self):
-        response = self.client.describe_registry()
+        response = self.call_api('describe_registry')
         return response
 
     def describe_repositories(self):
-        response = self.client.describe_repositories()
-        return response.get('repositories', [])
+        return self.paginate('describe_repositories', 'repositories')
 
     def describe_public_repositories(self):
         if self.public_client:
-            response = self.public_client.describe_repositories()
-            return response.get('repositories', [])
-        return []
+            return self.paginate('describe_repositories', 'repositories', client=self.public_client)
+        return iter(())
 
     def list_images(self, repository_name):
-        response = self.client.list_images(repositoryName=repository_name)
-        return response.get('imageIds', [])
+        return self.paginate('list_images', 'imageIds', repositoryName=repository_name)
 
     def describe_images(self, repository_name, image_digest):
-        response = self.client.describe_images(
+        response = self.call_api(
+            'describe_images',
             repositoryName=repository_name,
             imageIds=[{'imageDigest': image_digest}]
         )
@@ -177,14 +172,14 @@ class ECRService(AWSServiceInterface):
 
     def get_registry_policy(self):
         try:
-            response = self.client.get_registry_policy()
+            response = self.call_api('get_registry_policy')
             return response.get('policyText')
         except ClientError:
             return None
 
     def get_repository_policy(self, repository_name):
         try:
-            response = self.client.get_repository_policy(repositoryName=repository_name)
+            response = self.call_api('get_repository_policy', repositoryName=repository_name)
             return response.get('policyText')
         except ClientError:
             return None
\ No newline at end of file
@@ -3,24 +3,38 @@ from .aws_service_interface import AWSServiceInterface
 from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
+# Maximum identifiers accepted per request by the ECS describe APIs
+DESCRIBE_BATCH_SIZES = {
+    'describe_clusters': 100,
+    'describe_services': 10,
+    'describe_tasks': 100,
+    'describe_container_instances': 100,
+}
+
 class ECSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "ecs:ListClusters": "_handle_list_clusters",
+        "ecs:DescribeClusters": "_handle_describe_clusters",
+        "ecs:ListContainerInstances": "_handle_list_container_instances",
+        "ecs:DescribeContainerInstances": "_handle_list_container_instances",
+        "ecs:ListServices": "_handle_list_services",
+        "ecs:DescribeServices": "_handle_describe_services",
+        "ecs:DescribeTaskSets": "_handle_describe_task_sets",
+        "ecs:ListTaskDefinitionFamilies": "_handle_list_task_definition_families",
+        "ecs:ListTaskDefinitions": "_handle_list_task_definitions",
+        "ecs:DescribeTaskDefinition": "_handle_describe_task_definition",
+        "ecs:ListTasks": "_handle_list_tasks",
+        "ecs:DescribeTasks": "_handle_list_tasks",
+    }
+    LISTING_HANDLERS = (
+        "_handle_list_clusters",
+        "_handle_list_task_definitions",
+        "_handle_list_task_definition_families",
+    )
+    CONCRETE_HANDLERS = ("_handle_describe_task_definition",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'ecs', debug)
-        self.supported_actions = [
-            "ecs:*",
-            "ecs:ListClusters",
-            "ecs:DescribeClusters",
-            "ecs:ListContainerInstances",
-            "ecs:DescribeContainerInstances",
-            "ecs:ListServices",
-            "ecs:DescribeServices",
-            "ecs:DescribeTaskSets",
-            "ecs:ListTaskDefinitionFamilies",
-            "ecs:ListTaskDefinitions",
-            "ecs:ListTasks",
-            "ecs:DescribeTasks",
-            "ecs:DescribeTaskDefinition"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -38,34 +52,12 @@ class ECSService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating ECS resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "ecs:ListClusters" == action or "ecs:*" == action:
-            self._handle_list_clusters(action, resource)
-        elif "ecs:DescribeClusters" == action or "ecs:*" == action:
-            self._handle_describe_clusters(action, resource)
-        elif "ecs:ListContainerInstances" == action or "ecs:*" == action:
-            self._handle_list_container_instances(action, resource)
-        elif "ecs:ListServices" == action or "ecs:*" == action:
-            self._handle_list_services(action, resource)
-        elif "ecs:DescribeServices" == action or "ecs:*" == action:
-            self._handle_describe_services(action, resource)
-        elif "ecs:DescribeTaskSets" == action or "ecs:*" == action:
-            self._handle_describe_task_sets(action, resource)
-        elif "ecs:ListTaskDefinitions" == action or "ecs:*" == action:
-            self._handle_list_task_definitions(action, resource)
-        elif "ecs:DescribeTaskDefinition" == action or "ecs:*" == action:
-            self._handle_describe_task_definition(action, resource)
-        elif "ecs:ListTasks" == action or "ecs:*" == action:
-            self._handle_list_tasks(action, resource)
-
     def _handle_list_clusters(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing clusters")
         try:
-            clusters = self.list_clusters()
+            clusters = list(self.list_clusters())
             if clusters:
-                for cluster_arn in clusters:
-                    cluster_name = cluster_arn.split('/')[-1]
-                    self._handle_describe_clusters("ecs:DescribeClusters", cluster_name)
+                self._display_clusters(self.describe_clusters(clusters))
             else:
                 print_yellow("No clusters found.")
         except Exception as e:
@@ -74,49 +66,95 @@ class ECSService(AWSServiceInterface):
 
     def _handle_describe_clusters(self, action, resource):
         try:
-            clusters = self.describe_clusters([resource])
-            if clusters:
-                for cluster in clusters:
-                    print_yellow(f"\n[*] Cluster: {cluster.get('clusterName')}")
-                    cluster_data = [
-                        ['ARN', cluster.get('clusterArn')],
-                        ['Status', cluster.get('status')],
-                        ['Running Tasks', cluster.get('runningTasksCount')],
-                        ['Pending Tasks', cluster.get('pendingTasksCount')],
-                        ['Active Services', cluster.get('activeServicesCount')],
-                        ['Container Instances', cluster.get('registeredContainerInstancesCount')]
-                    ]
-                    print(tabulate(cluster_data, tablefmt='simple'))
+            self._display_clusters(self.describe_clusters(self._cluster_names(resource)))
         except Exception as e:
             if self.debug:
                 print_red(f"Error in describe clusters handler: {str(e)}")
 
-    def _handle_list_services(self, action, cluster):
-        print_yellow(f"\n[*] Found {action} permission - Listing services for cluster {cluster}")
+    def _display_clusters(self, clusters):
+        for cluster in clusters:
+            print_yellow(f"\n[*] Cluster: {cluster.get('clusterName')}")
+            cluster_data = [
+                ['ARN', cluster.get('clusterArn')],
+                ['Status', cluster.get('status')],
+                ['Running Tasks', cluster.get('runningTasksCount')],
+                ['Pending Tasks', cluster.get('pendingTasksCount')],
+                ['Active Services', cluster.get('activeServicesCount')],
+                ['Container Instances', cluster.get('registeredContainerInstancesCount')]
+            ]
+            print(tabulate(cluster_data, tablefmt='simple'))
+
+    def _cluster_names(self, resource):
+        """Clusters a resource refers to: every cluster for wildcards, else the one in the ARN."""
+        if '*' in resource:
+            return [cluster_arn.split('/')[-1] for cluster_arn in self.list_clusters()]
+        if resource.startswith('arn:'):
+            # cluster/NAME, service/CLUSTER/NAME, task/CLUSTER/ID, ...
+            path = resource.split(':', 5)[-1].split('/')
+            return [path[1]] if len(path) > 1 else []
+        return [resource]
+
+    def _handle_list_services(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing services for cluster {resource}")
+        self._display_cluster_services(resource)
+
+    def _handle_describe_services(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Describing services")
+        self._display_cluster_services(resource)
+
+    def _display_cluster_services(self, resource):
         try:
-            services = self.list_services(cluster)
-            if services:
-                # Only call describe_services if we have the permission
-                self._handle_describe_services("ecs:DescribeServices", cluster)
+            for cluster_name in self._cluster_names(resource):
+                services = list(self.list_services(cluster_name))
+                if services:
+                    self._display_services(cluster_name, services)
         except Exception as e:
             if self.debug:
                 print_red(f"Error in services handler: {str(e)}")
 
+    def _display_services(self, cluster_name, service_arns):
+        try:
+            for service in self.describe_services(cluster_name, service_arns):
+                print_yellow(f"\nService: {service.get('serviceName')} (cluster {cluster_name})")
+                service_data = [
+                    ['Status', service.get('status')],
+                    ['Task Definition', (service.get('taskDefinition') or '').split('/')[-1]],
+                    ['Desired/Running', f"{service.get('desiredCount')}/{service.get('runningCount')}"],
+                    ['Launch Type', service.get('launchType')],
+                    ['Role', service.get('roleArn')]
+                ]
+                print(tabulate(service_data, tablefmt='simple'))
+        except Exception as e:
+            # Without ecs:DescribeServices the ARNs are all we can show
+            if self.debug:
+                print_red(f"Error describing services: {str(e)}")
+            print_yellow(f"\nServices in cluster {cluster_name}:")
+            for service_arn in service_arns:
+                print(f"- {service_arn.split('/')[-1]}")
+
     def _handle_list_task_definitions(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing task definitions")
         try:
-            task_defs = self.list_task_definitions()
-            if task_defs:
-                for task_def_arn in task_defs:
-                    task_def = task_def_arn.split('/')[-1]
-                    self._handle_describe_task_definition("ecs:DescribeTaskDefinition", task_def)
+            # family:revision, de-duplicated before describing
+            task_defs = list(dict.fromkeys(arn.split('/')[-1] for arn in self.list_task_definitions()))
+            responses = self.call_api_many(
+                'describe_task_definition',
+                [{'taskDefinition': task_def} for task_def in task_defs]
+            )
+            for task_def, response in zip(task_defs, responses):
+                self._handle_describe_task_definition("ecs:DescribeTaskDefinition", task_def, response)
         except Exception as e:
             if self.debug:
                 print_red(f"Error in task definitions handler: {str(e)}")
 
-    def _handle_describe_task_definition(self, action, task_def):
+    def _handle_describe_task_definition(self, action, task_def, response=None):
         try:
-            task_def_details = self.describe_task_definition(task_def)
+            if isinstance(response, Exception):
+                raise response
+            if response:
+                task_def_details = response.get('taskDefinition')
+            else:
+                task_def_details = self.describe_task_definition(task_def)
             if task_def_details:
                 print_yellow(f"\nTask Definition: {task_def_details.get('family')}:{task_def_details.get('revision')}")
                 for container in task_def_details.get('containerDefinitions', []):
@@ -133,15 +171,15 @@ class ECSService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in task definition handler: {str(e)}")
 
-    def _handle_list_tasks(self, action, cluster):
-        print_yellow(f"\n[*] Found {action} permission - Listing tasks for cluster {cluster}")
+    def _handle_list_tasks(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing tasks for cluster {resource}")
         try:
-            tasks = self.list_tasks(cluster)
-            if tasks:
-                task_details = self.describe_tasks(cluster, tasks)
-                for task in task_details:
+            for cluster_name in self._cluster_names(resource):
+                tasks = list(self.list_tasks(cluster_name))
+                for task in self.describe_tasks(cluster_name, tasks):
                     print_yellow(f"\nTask: {task.get('taskArn').split('/')[-1]}")
                     task_data = [
+                        ['Cluster', cluster_name],
                         ['Status', task.get('lastStatus')],
                         ['Task Definition', task.get('taskDefinitionArn').split('/')[-1]],
                         ['Started At', task.get('startedAt')],
@@ -155,24 +193,17 @@ class ECSService(AWSServiceInterface):
     def _handle_list_container_instances(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing container instances")
         try:
-            if resource == '*':
-                clusters = self.list_clusters()
-                for cluster_arn in clusters:
-                    cluster_name = cluster_arn.split('/')[-1]
-                    self._display_container_instances(cluster_name)
-            else:
-                cluster_name = resource.split('/')[-1]
+            for cluster_name in self._cluster_names(resource):
                 self._display_container_instances(cluster_name)
         except Exception as e:
             if self.debug:
                 print_red(f"Error in container instances handler: {str(e)}")
 
     def _display_container_instances(self, cluster_name):
-        instances = self.list_container_instances(cluster_name)
+        instances = list(self.list_container_instances(cluster_name))
         if instances:
-            instance_details = self.describe_container_instances(cluster_name, instances)
             print_yellow(f"\nContainer Instances in cluster {cluster_name}:")
-            for instance in instance_details:
+            for instance in self.describe_container_instances(cluster_name, instances):
                 instance_data = [
                     ['Instance ID', instance.get('ec2InstanceId')],
                     ['Status', instance.get('status')],
@@ -185,15 +216,16 @@ class ECSService(AWSServiceInterface):
     def _handle_describe_task_sets(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Describing task sets")
         try:
-            if resource == '*':
-                clusters = self.list_clusters()
-                for cluster_arn in clusters:
-                    cluster_name = cluster_arn.split('/')[-1]
+            if '*' in resource:
+                for cluster_name in self._cluster_names(resource):
                     # Don't automatically call list_services
-                    services = self.list_services(cluster_name)
-                    for service_arn in services:
-                        service_name = service_arn.split('/')[-1]
-                        self._display_task_sets(cluster_name, service_name)
+                    service_names = [service_arn.split('/')[-1] for service_arn in self.list_services(cluster_name)]
+                    task_sets = self.call_api_many(
+                        'describe_task_sets',
+                        [{'cluster': cluster_name, 'service': service_name} for service_name in service_names]
+                    )
+                    for service_name, response in zip(service_names, task_sets):
+                        self._display_task_sets(cluster_name, service_name, response)
             else:
                 cluster_name, service_name = resource.split('/')[-2:]
                 self._display_task_sets(cluster_name, service_name)
@@ -201,9 +233,11 @@ class ECSService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in task sets handler: {str(e)}")
 
-    def _display_task_sets(self, cluster_name, service_name):
+    def _display_task_sets(self, cluster_name, service_name, response=None):
         try:
-            task_sets = self.describe_task_sets(cluster_name, service_name)
+            if isinstance(response, Exception):
+                raise response
+            task_sets = response.get('taskSets', []) if response else self.describe_task_sets(cluster_name, service_name)
             if task_sets:
                 print_yellow(f"\nTask Sets for service {service_name} in cluster {cluster_name}:")
                 for task_set in task_sets:
@@ -222,7 +256,7 @@ class ECSService(AWSServiceInterface):
     def _handle_list_task_definition_families(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing task definition families")
         try:
-            families = self.list_task_definition_families()
+            families = list(self.list_task_definition_families())
             if families:
                 print_yellow("\nTask Definition Families:")
                 for family in families:
@@ -236,89 +270,70 @@ class ECSService(AWSServiceInterface):
     # API wrapper methods
     def list_clusters(self):
         try:
-            clusters = []
-            paginator = self.client.get_paginator('list_clusters')
-            for page in paginator.paginate():
-                clusters.extend(page.get('clusterArns', []))
-            return clusters
+            yield from self.paginate('list_clusters', 'clusterArns')
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing clusters: {e.response['Error']['Message']}")
-            return []
 
     def describe_clusters(self, clusters):
-        response = self.client.describe_clusters(clusters=clusters)
-        return response.get('clusters', [])
+        return list(self.call_api_batched(
+            'describe_clusters', 'clusters', clusters, DESCRIBE_BATCH_SIZES['describe_clusters'], 'clusters'
+        ))
 
     def list_services(self, cluster):
         try:
-            services = []
-            paginator = self.client.get_paginator('list_services')
-            for page in paginator.paginate(cluster=cluster):
-                services.extend(page.get('serviceArns', []))
-            return services
+            yield from self.paginate('list_services', 'serviceArns', cluster=cluster)
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing services: {e.response['Error']['Message']}")
-            return []
 
     def describe_services(self, cluster, services):
-        response = self.client.describe_services(cluster=cluster, services=services)
-        return response.get('services', [])
+        return self.call_api_batched(
+            'describe_services', 'services', services, DESCRIBE_BATCH_SIZES['describe_services'], 'services',
+            cluster=cluster
+        )
 
     def list_tasks(self, cluster):
         try:
-            tasks = []
-            paginator = self.client.get_paginator('list_tasks')
-            for page in paginator.paginate(cluster=cluster):
-                tasks.extend(page.get('taskArns', []))
-            return tasks
+            yield from self.paginate('list_tasks', 'taskArns', cluster=cluster)
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing tasks: {e.response['Error']['Message']}")
-            return []
 
     def describe_tasks(self, cluster, tasks):
-        response = self.client.describe_tasks(cluster=cluster, tasks=tasks)
-        return response.get('tasks', [])
+        return self.call_api_batched(
+            'describe_tasks', 'tasks', tasks, DESCRIBE_BATCH_SIZES['describe_tasks'], 'tasks',
+            cluster=cluster
+        )
 
     def list_task_definitions(self):
         try:
-            task_defs = []
-            paginator = self.client.get_paginator('list_task_definitions')
-            for page in paginator.paginate():
-                task_defs.extend(page.get('taskDefinitionArns', []))
-            return task_defs
+            yield from self.paginate('list_task_definitions', 'taskDefinitionArns')
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing task definitions: {e.response['Error']['Message']}")
-            return []
 
     def describe_task_definition(self, task_definition):
-        response = self.client.describe_task_definition(taskDefinition=task_definition)
+        response = self.call_api('describe_task_definition', taskDefinition=task_definition)
         return response.get('taskDefinition')
 
     def list_container_instances(self, cluster):
         try:
-            instances = []
-            paginator = self.client.get_paginator('list_container_instances')
-            for page in paginator.paginate(cluster=cluster):
-                instances.extend(page.get('containerInstanceArns', []))
-            return instances
+            yield from self.paginate('list_container_instances', 'containerInstanceArns', cluster=cluster)
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing container instances: {e.response['Error']['Message']}")
-            return []
 
     def describe_container_instances(self, cluster, instances):
-        response = self.client.describe_container_instances(
-            cluster=cluster,
-            containerInstances=instances
+        return self.call_api_batched(
+            'describe_container_instances', 'containerInstances', instances,
+            DESCRIBE_BATCH_SIZES['describe_container_instances'], 'containerInstances',
+            cluster=cluster
         )
-        return response.get('containerInstances', [])
 
     def describe_task_sets(self, cluster, service):
-        response = self.client.describe_task_sets(
+        response = self.call_api(
+            'describe_task_sets',
             cluster=cluster,
             service=service
         )
@@ -326,12 +341,7 @@ class ECSService(AWSServiceInterface):
 
     def list_task_definition_families(self):
         try:
-            families = []
-            paginator = self.client.get_paginator('list_task_definition_families')
-            for page in paginator.paginate():
-                families.extend(page.get('families', []))
-            return families
+            yield from self.paginate('list_task_definition_families', 'families')
         except ClientError as e:
             if self.debug:
                 print_red(f"Error listing task definition families: {e.response['Error']['Message']}")
-            return families
@@ -5,18 +5,26 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class EFSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "efs:DescribeFileSystems": "_handle_describe_filesystems",
+        "efs:DescribeFileSystemPolicy": "_handle_describe_policy",
+        "efs:DescribeMountTargets": "_handle_describe_mount_targets",
+        "efs:DescribeMountTargetSecurityGroups": "_handle_describe_security_groups",
+        "efs:DescribeAccessPoints": "_handle_describe_access_points",
+        "efs:DescribeReplicationConfigurations": "_handle_describe_replication",
+    }
+    LISTING_HANDLERS = (
+        "_handle_describe_filesystems",
+        "_handle_describe_access_points",
+        "_handle_describe_replication",
+    )
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'efs', debug)
-        self.ec2_client = session.client('ec2') if session else None
-        self.supported_actions = [
-            "efs:Describe*",
-            "efs:DescribeFileSystems",
-            "efs:DescribeFileSystemPolicy",
-            "efs:DescribeMountTargets",
-            "efs:DescribeMountTargetSecurityGroups",
-            "efs:DescribeAccessPoints",
-            "efs:DescribeReplicationConfigurations"
-        ]
+
+    @property
+    def ec2_client(self):
+        return self.get_client('ec2')
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -24,12 +32,9 @@ class EFSService(AWSServiceInterface):
         print_cyan("*" * 80)
         
         try:
-            filesystems = self.describe_file_systems()
-            if not filesystems:
-                print_yellow("No EFS filesystems found.")
-                return
-
-            for fs in filesystems:
+            found = False
+            for fs in self.describe_file_systems():
+                found = True
                 fs_id = fs.get('FileSystemId')
                 self._display_filesystem_info(fs)
                 
@@ -47,9 +52,13 @@ class EFSService(AWSServiceInterface):
                     if self.debug:
                         print_red(f"Error getting mount targets for filesystem {fs_id}: {str(e)}")
 
+            if not found:
+                print_yellow("No EFS filesystems found.")
+                return
+
             # Check access points
             try:
-                access_points = self.describe_access_points()
+                access_points = list(self.describe_access_points())
                 if access_points:
                     self._display_access_points(access_points)
             except Exception as e:
@@ -58,7 +67,7 @@ class EFSService(AWSServiceInterface):
 
             # Check replication configurations
             try:
-                replication_configs = self.describe_replication_configurations()
+                replication_configs = list(self.describe_replication_configurations())
                 if replication_configs:
                     self._display_replication_configs(replication_configs)
             except Exception as e:
@@ -68,41 +77,16 @@ class EFSService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating EFS resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if action == "efs:Describe*":
-            print_yellow(f"\n[*] Found {action} permission - Full EFS access")
-            self._handle_describe_filesystems(action)
-            self._handle_describe_policy(action, resource)
-            self._handle_describe_mount_targets(action, resource)
-            self._handle_describe_security_groups(action, resource)
-            self._handle_describe_access_points(action)
-            self._handle_describe_replication(action)
-            return
-
-        # Handle specific Describe permissions
-        if action == "efs:DescribeFileSystems":
-            self._handle_describe_filesystems(action)
-        elif action == "efs:DescribeFileSystemPolicy":
-            self._handle_describe_policy(action, resource)
-        elif action == "efs:DescribeMountTargets":
-            self._handle_describe_mount_targets(action, resource)
-        elif action == "efs:DescribeMountTargetSecurityGroups":
-            self._handle_describe_security_groups(action, resource)
-        elif action == "efs:DescribeAccessPoints":
-            self._handle_describe_access_points(action)
-        elif action == "efs:DescribeReplicationConfigurations":
-            self._handle_describe_replication(action)
-
-    def _handle_describe_filesystems(self, action):
+    def _handle_describe_filesystems(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Running 'describe_file_systems'")
         try:
-            filesystems = self.describe_file_systems()
-            if not filesystems:
-                print_yellow("No EFS filesystems found.")
-                return
-            
-            for fs in filesystems:
+            found = False
+            for fs in self.describe_file_systems():
+                found = True
                 self._display_filesystem_info(fs)
+            
+            if not found:
+                print_yellow("No EFS filesystems found.")
         except Exception as e:
             if self.debug:
                 print_red(f"Error in filesystems handler: {str(e)}")
@@ -175,20 +159,20 @@ class EFSService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in security groups handler: {str(e)}")
 
-    def _handle_describe_access_points(self, action):
+    def _handle_describe_access_points(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Running 'describe_access_points'")
         try:
-            access_points = self.describe_access_points()
+            access_points = list(self.describe_access_points())
             if access_points:
                 self._display_access_points(access_points)
         except Exception as e:
             if self.debug:
                 print_red(f"Error in access points handler: {str(e)}")
 
-    def _handle_describe_replication(self, action):
+    def _handle_describe_replication(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Running 'describe_replication_configurations'")
         try:
-            configs = self.describe_replication_configurations()
+            configs = list(self.describe_replication_configurations())
             if configs:
                 self._display_replication_configs(configs)
         except Exception as e:
@@ -200,7 +184,7 @@ class EFSService(AWSServiceInterface):
         print(yaml.dump(policy))
 
     def _display_mount_targets(self, fs_id):
-        mount_targets = self.describe_mount_targets(fs_id)
+        mount_targets = list(self.describe_mount_targets(fs_id))
         if mount_targets:
             print_yellow("\nMount Targets:")
 
@@ -286,12 +270,11 @@ class EFSService(AWSServiceInterface):
 
     # API wrapper methods
     def describe_file_systems(self):
-        response = self.client.describe_file_systems()
-        return response.get('FileSystems', [])
+        return self.paginate('describe_file_systems', 'FileSystems')
 
     def describe_filesystem_policy(self, fs_id):
         try:
-            response = self.client.describe_file_system_policy(FileSystemId=fs_id)
+            response = self.call_api('describe_file_system_policy', FileSystemId=fs_id)
             return response.get('Policy')
         except ClientError as e:
             if e.response['Error']['Code'] == 'PolicyNotFound':
@@ -299,21 +282,18 @@ class EFSService(AWSServiceInterface):
             raise
 
     def describe_mount_targets(self, fs_id):
-        response = self.client.describe_mount_targets(FileSystemId=fs_id)
-        return response.get('MountTargets', [])
+        return self.paginate('describe_mount_targets', 'MountTargets', FileSystemId=fs_id)
 
     def describe_mount_target_security_groups(self, mt_id):
-        response = self.client.describe_mount_target_security_groups(MountTargetId=mt_id)
+        response = self.call_api('describe_mount_target_security_groups', MountTargetId=mt_id)
         return response.get('SecurityGroups', [])
 
     def describe_security_groups(self, group_id):
-        response = self.ec2_client.describe_security_groups(GroupIds=[group_id])
+        response = self.call_api('describe_security_groups', client=self.ec2_client, GroupIds=[group_id])
         return response.get('SecurityGroups', [])[0] if response.get('SecurityGroups') else None
 
     def describe_access_points(self):
-        response = self.client.describe_access_points()
-        return response.get('AccessPoints', [])
+        return self.paginate('describe_access_points', 'AccessPoints')
 
     def describe_replication_configurations(self):
-        response = self.client.describe_replication_configurations()
-        return response.get('ReplicationConfigurations', [])
\ No newline at end of file
+        return self.paginate('describe_replication_configurations', 'ReplicationConfigurations')
\ No newline at end of file
@@ -5,16 +5,18 @@ from ..utils import print_cyan, print_yellow, print_red, print_green, print_mage
 import boto3
 
 class EventBridgeSchedulerService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "scheduler:ListSchedules": "_handle_list_schedules",
+        "scheduler:ListScheduleGroups": "_handle_list_schedule_groups",
+        "scheduler:GetSchedule": "_handle_get_schedule",
+        "scheduler:GetScheduleGroup": "_handle_get_schedule_group",
+        "scheduler:ListTagsForResource": "_handle_list_tags",
+    }
+    LISTING_HANDLERS = ("_handle_list_schedules", "_handle_list_schedule_groups")
+    CONCRETE_HANDLERS = ("_handle_get_schedule", "_handle_get_schedule_group", "_handle_list_tags")
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'scheduler', debug)
-        self.supported_actions = [
-            "scheduler:*",
-            "scheduler:ListSchedules",
-            "scheduler:ListScheduleGroups",
-            "scheduler:GetSchedule",
-            "scheduler:GetScheduleGroup",
-            "scheduler:ListTagsForResource"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -27,22 +29,10 @@ class EventBridgeSchedulerService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating EventBridge Scheduler resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "scheduler:ListSchedules" == action or "scheduler:List*" == action or "scheduler:*" == action:
-            self._handle_list_schedules(action, resource)
-        elif "scheduler:ListScheduleGroups" == action or "scheduler:List*" == action or "scheduler:*" == action:
-            self._handle_list_schedule_groups(action, resource)
-        elif "scheduler:GetSchedule" == action or "scheduler:Get*" == action or "scheduler:*" == action:
-            self._handle_get_schedule(action, resource)
-        elif "scheduler:GetScheduleGroup" == action or "scheduler:Get*" == action or "scheduler:*" == action:
-            self._handle_get_schedule_group(action, resource)
-        elif "scheduler:ListTagsForResource" == action or "scheduler:List*" == action or "scheduler:*" == action:
-            self._handle_list_tags(action, resource)
-
     def _handle_list_schedules(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing schedules")
         try:
-            schedules = self.list_schedules()
+            schedules = list(self.list_schedules())
             if schedules:
                 print_yellow("\nAvailable Schedules:")
                 schedule_data = [[s.get('Name'), s.get('GroupName'), s.get('State')] for s in schedules]
@@ -59,7 +49,7 @@ class EventBridgeSchedulerService(AWSServiceInterface):
     def _handle_list_schedule_groups(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing schedule groups")
         try:
-            groups = self.list_schedule_groups()
+            groups = list(self.list_schedule_groups())
             if groups:
                 print_yellow("\nSchedule Groups:")
                 group_data = [[g.get('Name'), g.get('Arn')] for g in groups]
@@ -122,21 +112,19 @@ class EventBridgeSchedulerService(AWSServiceInterface):
 
     # API wrapper methods
     def list_schedules(self):
-        response = self.client.list_schedules()
-        return response.get('Schedules', [])
+        return self.paginate('list_schedules', 'Schedules')
 
     def list_schedule_groups(self):
-        response = self.client.list_schedule_groups()
-        return response.get('ScheduleGroups', [])
+        return self.paginate('list_schedule_groups', 'ScheduleGroups')
 
     def get_schedule(self, name):
-        response = self.client.get_schedule(Name=name)
+        response = self.call_api('get_schedule', Name=name)
         return response
 
     def get_schedule_group(self, name):
-        response = self.client.get_schedule_group(Name=name)
+        response = self.call_api('get_schedule_group', Name=name)
         return response
 
     def list_tags_for_resource(self, resource_arn):
-        response = self.client.list_tags_for_resource(ResourceArn=resource_arn)
+        response = self.call_api('list_tags_for_resource', ResourceArn=resource_arn)
         return response.get('Tags', {})
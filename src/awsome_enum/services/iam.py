@@ -1,92 +1,145 @@
+import sys
+import threading
 import yaml
 import json
+from functools import partial
 from tabulate import tabulate
+from botocore.exceptions import ClientError
 from .aws_service_interface import AWSServiceInterface
-from ..utils import print_cyan, print_yellow, print_green, print_red, print_magenta
+from ..scheduler import DeepEnumerationScheduler
+from ..matcher import compile_pattern, has_wildcard, matches, split_action
+from ..iam_snapshot import IAMSnapshot
+from ..evaluator import EffectivePermissions, PolicyEvaluator, principal_context
+from ..plan import EnumerationPlan
+from ..policy_store import PolicyStore
+from ..privesc import PolicyGraph
+from ..output import emit, ERROR, PRIVESC_PATH
+from ..utils import load_action_catalog, print_cyan, print_yellow, print_green, print_red, print_magenta
+
+# Organizations answers these to anyone but the management account and delegated administrators
+ACCESS_DENIED_CODES = ('AccessDenied', 'AccessDeniedException')
 
 class IAMService(AWSServiceInterface):
     """Implementation of AWS IAM service enumeration and exploitation."""
     
+    REGIONAL = False
+    
+    ACTION_HANDLERS = {
+        "iam:ListRoles": "_handle_list_roles",
+        "iam:ListUsers": "_handle_list_users",
+        "iam:GetPolicyVersion": "_handle_get_policy_version",
+        "iam:ListAttachedRolePolicies": "_handle_list_attached_role_policies",
+        "iam:GetAccountAuthorizationDetails": "_handle_get_account_authorization_details",
+    }
+    LISTING_HANDLERS = ("_handle_list_roles", "_handle_list_users", "_handle_get_account_authorization_details")
+    CONCRETE_HANDLERS = ("_handle_get_policy_version", "_handle_list_attached_role_policies")
+    
     def __init__(self, session=None, debug=False):
         super().__init__(session=session, service_name='iam', debug=debug)
-        self.sts = self.session.client('sts')
         self.available_services = None
+        self.scheduler = None
+        self.deep = None
+        self.plan_only = False
+        self.plan = None
         self.all_resource_actions = {}
-        self.supported_actions = [
-            "iam:ListRoles", "iam:ListUsers", "iam:GetPolicyVersion", "iam:ListAttachedRolePolicies", "iam:*"
-        ]
+        self.policy_documents = []
+        self.evaluator = None
+        self._layers = {}
+        self.snapshot = None
+        self._snapshot_loaded = False
+        self._snapshot_lock = threading.Lock()
+        self.policy_store = PolicyStore(self.get_policy, self.get_policy_version)
 
     def enumerate(self):
         return self._enumerate_permissions()
     
-    def handle_permission_action(self, action, resource):
-        if action in ("iam:ListRoles", "iam:*"):
-            print_yellow("\n[*] Found iam:ListRoles permission - Listing all roles:\n")
-            try:
-                roles = self.list_roles()
-                if roles:
-                    role_data = [[role['RoleName'], role['Arn']] for role in roles]
-                    print(tabulate(role_data, headers=['Role Name', 'ARN'], tablefmt='plain'))
-                    print_magenta("\n💡 Tip: Use 'awsome-enum --profile [profile] -e iam find-role [role-name]' to enumerate permissions for specific roles")
-                else:
-                    print_yellow("  No roles found.")
-            except Exception as e:
-                print_red(f"Error listing roles: {str(e)}")
+    def _handle_list_roles(self, action, resource):
+        print_yellow("\n[*] Found iam:ListRoles permission - Listing all roles:\n")
+        try:
+            roles = list(self.snapshot.roles.values()) if self.snapshot else list(self.list_roles())
+            if roles:
+                role_data = [[role['RoleName'], role['Arn']] for role in roles]
+                print(tabulate(role_data, headers=['Role Name', 'ARN'], tablefmt='plain'))
+                print_magenta("\n💡 Tip: Use 'awsome-enum --profile [profile] -e iam find-role [role-name]' to enumerate permissions for specific roles")
+            else:
+                print_yellow("  No roles found.")
+        except Exception as e:
+            print_red(f"Error listing roles: {str(e)}")
 
-        elif action in ("iam:ListUsers", "iam:*"):
-            print_yellow("\n[*] Found iam:ListUsers permission - Listing all users:\n")
+    def _handle_list_users(self, action, resource):
+        print_yellow("\n[*] Found iam:ListUsers permission - Listing all users:\n")
+        try:
+            users = list(self.snapshot.users.values()) if self.snapshot else list(self.list_users())
+            if users:
+                user_data = [[user['UserName'], user['Arn']] for user in users]
+                print(tabulate(user_data, headers=['User Name', 'ARN'], tablefmt='plain'))
+            else:
+                print_yellow("  No users found.")
+        except Exception as e:
+            print_red(f"Error listing users: {str(e)}")
+
+    def _handle_get_policy_version(self, action, resource):
+        if resource.startswith(self.get_session_context().arn_prefix('iam')) and '*' not in resource:
+            print_yellow(f"\n[*] Found iam:GetPolicyVersion permissions on '{resource}'. Listing policy details:\n")
             try:
-                users = self.client.list_users()['Users']
-                if users:
-                    user_data = [[user['UserName'], user['Arn']] for user in users]
-                    print(tabulate(user_data, headers=['User Name', 'ARN'], tablefmt='plain'))
-                else:
-                    print_yellow("  No users found.")
+                print(yaml.dump(self._get_managed_policy_document(resource)))
             except Exception as e:
-                print_red(f"Error listing users: {str(e)}")
+                print_red(f"Error listing policies: {str(e)}")
 
-        elif action in ("iam:GetPolicyVersion", "iam:*"):
-            if resource.startswith('arn:aws:iam::'):
-                print_yellow(f"\n[*] Found iam:GetPolicyVersion permissions on '{resource}'. Listing policy details:\n")
-                try:
-                    policy_arn = resource
-                    policy = self.get_policy(policy_arn)
-                    policy_version = self.get_policy_version(policy_arn, policy['DefaultVersionId'])
-                    policy_document = policy_version['Document']
-                    print(yaml.dump(policy_document))
-                except Exception as e:
-                    print_red(f"Error listing policies: {str(e)}")
-        
-        elif action in ("iam:ListAttachedRolePolicies", "iam:*"):
-            try:
-                role_name = resource.split('/')[-1]
-                print_yellow(f"\n[*] Found iam:ListAttachedRolePolicies permission for role: {role_name}")
-                policies = self.list_attached_role_policies(role_name)
+    def _handle_list_attached_role_policies(self, action, resource):
+        role_name = resource.split('/')[-1]
+        if '*' in role_name:
+            # A wildcard names no single role; find-role looks one up
+            return
+        try:
+            print_yellow(f"\n[*] Found iam:ListAttachedRolePolicies permission for role: {role_name}")
+            policies = self._get_attached_role_policies(role_name)
+            
+            if policies:
+                policy_data = [[p['PolicyName'], p['PolicyArn']] for p in policies]
+                print(tabulate(policy_data, headers=['Policy Name', 'Policy ARN'], tablefmt='simple'))
                 
-                if policies:
-                    policy_data = [[p['PolicyName'], p['PolicyArn']] for p in policies]
-                    print(tabulate(policy_data, headers=['Policy Name', 'Policy ARN'], tablefmt='simple'))
-                    
-                    # Process each policy
-                    for policy in policies:
-                        try:
-                            attached_policy = self.get_policy(policy_arn=policy['PolicyArn'])
-                            policy_version = self.get_policy_version(
-                                policy['PolicyArn'], 
-                                attached_policy['DefaultVersionId']
-                            )
-                            print_yellow(f"\nPolicy Document for: {policy['PolicyName']}")
-                            print(yaml.dump(policy_version['Document']))
-                        except Exception as e:
-                            if self.debug:
-                                print_red(f"Error getting policy {policy['PolicyName']}: {str(e)}")
-                else:
-                    print_yellow(f"No attached policies found for role: {role_name}")
-            except Exception as e:
-                print_red(f"Error handling ListAttachedRolePolicies: {str(e)}")
+                # Process each policy
+                for policy in policies:
+                    try:
+                        policy_document = self._get_managed_policy_document(policy['PolicyArn'])
+                        print_yellow(f"\nPolicy Document for: {policy['PolicyName']}")
+                        print(yaml.dump(policy_document))
+                    except Exception as e:
+                        if self.debug:
+                            print_red(f"Error getting policy {policy['PolicyName']}: {str(e)}")
+            else:
+                print_yellow(f"No attached policies found for role: {role_name}")
+        except Exception as e:
+            print_red(f"Error handling ListAttachedRolePolicies: {str(e)}")
+
+    def _handle_get_account_authorization_details(self, action, resource):
+        print_yellow("\n[*] Found iam:GetAccountAuthorizationDetails permission - Searching for escalation paths")
+        self.find_privesc_paths()
     
     def set_available_services(self, services_dict):
         self.available_services = services_dict
+
+    def set_scheduler(self, scheduler):
+        self.scheduler = scheduler
+
+    def set_deep(self, deep):
+        """
+        Decide up front whether detailed enumeration runs.
+        
+        Args:
+            deep (bool): True to run it, False to skip it, None to ask on the terminal
+        """
+        self.deep = deep
+
+    def set_plan(self, plan_only):
+        """
+        Print the deep-enumeration plan and its call budget instead of running it.
+        
+        Args:
+            plan_only (bool): True to stop after printing the plan
+        """
+        self.plan_only = plan_only
     
     def _enumerate_permissions(self):
         print_cyan("\n" + "*" * 80)
@@ -96,7 +149,7 @@ class IAMService(AWSServiceInterface):
         self.all_resource_actions = {}
 
         identity = self.get_caller_identity()
-        principal_type = self._determine_principal_type(identity)
+        principal_type = self.get_session_context().principal_type
 
         self._display_principal_info(identity, principal_type)
 
@@ -116,31 +169,26 @@ class IAMService(AWSServiceInterface):
 
         self._execute_deep_enumeration()
 
-    def _determine_principal_type(self, identity):
-        return 'user' if 'user/' in identity.get('Arn', '') else 'role'
-    
     def _display_principal_info(self, identity, principal_type):
         print_cyan(f"\n[*] Fetching {principal_type} information:\n")
         principal_info = self._extract_principal_info(identity, principal_type)
         print(yaml.dump(principal_info, default_flow_style=False))
 
     def _extract_principal_info(self, identity, principal_type):
+        principal_name = self.get_session_context().principal_name
         if principal_type == 'user':
-            user_name = identity["Arn"].split('/')[-1]
             return {
                 "UserId": identity["UserId"],
                 "Account": identity["Account"],
                 "Arn": identity["Arn"],
-                "UserName": user_name
+                "UserName": principal_name
             }
         else:
-            role_arn = identity["Arn"]
-            role_name = role_arn.split('/')[-2] if 'assumed-role' in role_arn else role_arn.split('/')[-1]
             return {
                 "RoleId": identity["UserId"],
                 "Account": identity["Account"],
                 "Arn": identity["Arn"],
-                "RoleName": role_name
+                "RoleName": principal_name
             }
         
     def _fetch_principal_policies(self, identity, principal_type):
@@ -151,18 +199,17 @@ class IAMService(AWSServiceInterface):
                 'principal_name': None
             }
 
+            principal_name = self.get_session_context().principal_name
             if principal_type == 'user':
-                user_name = identity["Arn"].split('/')[-1]
-                result['attached_policies'] = self.list_attached_user_policies(user_name)
-                result['inline_policies'] = self.list_user_policies(user_name)
-                result['principal_name'] = user_name
+                result['attached_policies'] = self.list_attached_user_policies(principal_name)
+                result['inline_policies'] = self.list_user_policies(principal_name)
+                result['principal_name'] = principal_name
+            elif principal_type != 'role':
+                print_yellow(f"  [*] A {principal_type} principal has no IAM policies to list")
             else:
-                role_arn = identity["Arn"]
-                role_name = role_arn.split('/')[-2] if 'assumed-role' in role_arn else role_arn.split('/')[-1]
-
-                result['attached_policies'] = self.list_attached_role_policies(role_name)
-                result['inline_policies'] = self.list_role_policies(role_name)
-                result['principal_name'] = role_name
+                result['attached_policies'] = self.list_attached_role_policies(principal_name)
+                result['inline_policies'] = self.list_role_policies(principal_name)
+                result['principal_name'] = principal_name
 
             return result
         
@@ -224,17 +271,13 @@ class IAMService(AWSServiceInterface):
             )
 
     def _get_managed_policy_document(self, policy_arn):
-        policy = self.get_policy(policy_arn=policy_arn)
-        policy_version = self.get_policy_version(
-            policy_arn=policy_arn,
-            version_id=policy['DefaultVersionId']
-        )
-        return policy_version['Document']
+        return self.policy_store.document(policy_arn)
     
     def _display_policy_document(self, policy_document):
         print(yaml.dump(policy_document))
 
     def _parse_policy_document(self, policy_document):
+        self.policy_documents.append(policy_document)
         resource_actions = self.parse_policy_document(policy_document)
         
         for resource, actions in resource_actions.items():
@@ -249,6 +292,8 @@ class IAMService(AWSServiceInterface):
             print_yellow("\n[*] No permissions found to enumerate.")
             return
             
+        self.plan = self._build_plan()
+
         print_cyan("\n" + "*" * 80)
         print_cyan(f"Found {len(self.all_resource_actions)} resources with permissions")
         print_cyan("*" * 80)
@@ -256,48 +301,283 @@ class IAMService(AWSServiceInterface):
         for i, (resource, actions) in enumerate(self.all_resource_actions.items()):
             print_yellow(f"\n[{i+1}] Resource: {resource}")
             print_yellow(f"    Actions: {', '.join(sorted(actions))}")
-        
-        print("\nWould you like to perform detailed enumeration of all permissions in the identified policies? (y/n): ", end="")
-        user_choice = input().strip().lower()
+            for action in sorted(actions):
+                if has_wildcard(action):
+                    print_yellow(f"      {action} -> {self._describe_wildcard(action, resource)}")
 
-        if user_choice == 'y' or user_choice == 'yes':
+        if self.plan_only:
+            self.plan.print_plan()
+            return
+        
+        deep = self.deep if self.deep is not None else self._confirm_deep_enumeration()
+        if deep:
             # print(yaml.dump(self.all_resource_actions))
-            for resource, actions in self.all_resource_actions.items():
-                is_wildcard = '*' in resource
-                for action in actions:
-                    self._enumerate_and_list_resources(action, resource, is_wildcard)
+            if self._can_load_snapshot():
+                self.load_snapshot()
+            print_yellow(
+                f"\n[*] Plan: {len(self.plan.units)} handler runs across {len(self.plan.call_budget())} services "
+                f"({self.plan.coalesced} overlapping requests coalesced, {self.plan.denied} denied by policy)"
+            )
+            if self.plan.excluded:
+                print_yellow(
+                    f"[*] Skipping {len(self.plan.excluded)} action/resource pairs denied by policy, boundary or SCP: "
+                    + ', '.join(f"{action} on {resource}" for action, resource in self.plan.excluded)
+                )
+            scheduler = self.scheduler or DeepEnumerationScheduler()
+            for action, resource in self.plan.pairs:
+                self._schedule_resource_action(scheduler, action, resource, '*' in resource)
+            scheduler.run()
         else:
             print_red("\nDetailed permission enumeration cancelled. Thank you for using AWSome-enum.")
             return
 
-    def _enumerate_and_list_resources(self, action, resource, is_resource_wildcard=False):
-        service_prefix = action.split(':')[0] if ':' in action else None
-        print_line = True
-        
+    def _describe_wildcard(self, action, resource):
+        catalog = load_action_catalog()
+        concrete = catalog.expand(action)
+        levels = ', '.join(f"{count} {level}" for level, count in catalog.summary(action).items())
+        if self.evaluator is not None:
+            allowed = sum(1 for name in concrete if self.evaluator.may_allow(name, resource))
+            levels = f"{levels or 'none known'}; {allowed} not denied here"
+        handled = sum(
+            len(self.available_services.service_class(name).handlers_for(action))
+            for name in self._target_services(action)
+        )
+        return f"{len(concrete)} actions ({levels or 'none known'}), {handled} detailed-enumeration handlers"
+
+    def _build_plan(self):
+        self.evaluator = self.build_evaluator()
+        service_class = self.available_services.service_class if self.available_services is not None else None
+        return EnumerationPlan(
+            self.all_resource_actions,
+            service_class,
+            lambda service_prefix, action, resource: len(self._regional_services(service_prefix, action, resource)) or 1,
+            self.evaluator,
+            self._target_services,
+            load_action_catalog().expand
+        )
+
+    def _target_services(self, action):
+        """
+        The loaded services an action reaches.
+
+        A bare '*' reaches every service and a wildcard prefix ('*:List*',
+        'code*:Get*') every service it matches; any other action only its own.
+        """
+        service_prefix, _ = split_action(action)
+        if self.available_services is None:
+            return []
         if not service_prefix:
+            return list(self.available_services) if has_wildcard(action) else []
+        if has_wildcard(service_prefix):
+            pattern = compile_pattern(service_prefix)
+            return [name for name in self.available_services if pattern.match(name)]
+        return [service_prefix] if service_prefix in self.available_services else []
+
+    def build_evaluator(self):
+        """
+        Compile the caller's effective permissions.
+
+        The identity policies parsed so far are intersected with the caller's
+        permissions boundary and the SCPs above its account. The boundary and
+        SCP layers are compiled once per run. A missing boundary is left out,
+        and so are SCPs that cannot be read (from a member account, say):
+        they are reported as unknown and the decisions come from the layers
+        that could be read.
+
+        Returns:
+            EffectivePermissions: Decides actions with explicit-deny precedence and the caller's known condition keys
+        """
+        try:
+            session_context = self.get_session_context()
+            context = principal_context(session_context, self._role_arn(session_context))
+        except Exception as e:
+            context = {}
+            if self.debug:
+                print_red(f"Error resolving the caller's condition context: {str(e)}")
+        identity = PolicyEvaluator(self.policy_documents, context, self.policy_store)
+        boundary = self._boundary_layer(context)
+        scps = self._scp_layers(context)
+
+        layers = ['identity policies']
+        if boundary is not None:
+            layers.append('permissions boundary')
+        if scps:
+            layers.append(f"SCPs ({len(scps)} organization levels)")
+        elif scps is None:
+            layers.append("SCPs (unknown)")
+        print_yellow(f"\n[*] Effective permissions: {' ∩ '.join(layers)}")
+        return EffectivePermissions(identity, boundary, scps or (), unread=['SCPs'] if scps is None else ())
+
+    def _role_arn(self, session_context):
+        """The caller's role ARN, path included, None when the caller is not a role or it cannot be read."""
+        if session_context.principal_type != 'role':
+            return None
+        try:
+            return self.get_principal_detail()['Arn']
+        except Exception as e:
+            if self.debug:
+                print_red(f"Error reading the caller's role: {str(e)}")
+            return None
+
+    def _boundary_layer(self, context):
+        if 'boundary' not in self._layers:
+            layer = None
+            try:
+                boundary_arn = self.get_permissions_boundary()
+                if boundary_arn:
+                    print_yellow(f"\n[*] Permissions boundary: {boundary_arn}")
+                    layer = PolicyEvaluator([self.policy_store.document(boundary_arn)], context, self.policy_store)
+            except Exception as e:
+                if self.debug:
+                    print_red(f"Error reading the permissions boundary: {str(e)}")
+            self._layers['boundary'] = layer
+        return self._layers['boundary']
+
+    def _scp_layers(self, context):
+        """One PolicyEvaluator per organization level, None when the SCPs could not be read."""
+        if 'scps' not in self._layers:
+            layers = None
+            try:
+                account_id = self.get_session_context().account_id
+                layers = [
+                    PolicyEvaluator(documents, context, self.policy_store)
+                    for documents in self.get_service_control_policies(account_id)
+                ]
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code', 'ClientError')
+                if code in ACCESS_DENIED_CODES:
+                    self._report_unknown_scps(code, "only the management account or a delegated administrator can read them")
+                else:
+                    self._report_unknown_scps(code, str(e))
+            except Exception as e:
+                self._report_unknown_scps(type(e).__name__, str(e))
+            self._layers['scps'] = layers
+        return self._layers['scps']
+
+    def _report_unknown_scps(self, code, reason):
+        message = f"SCPs above this account are unknown ({reason}); decisions reflect the other layers only"
+        print_yellow(f"\n[!] {message}")
+        emit(ERROR, service='organizations', code=code, message=message)
+
+    def _can_load_snapshot(self):
+        if self.evaluator is not None:
+            return self.evaluator.may_allow('iam:GetAccountAuthorizationDetails', '*')
+        return any(
+            matches(action, 'iam:GetAccountAuthorizationDetails')
+            for actions in self.all_resource_actions.values() for action in actions
+        )
+
+    def load_snapshot(self):
+        """
+        Fetch the account's IAM configuration in bulk, once per run.
+
+        Later role, user and policy lookups are answered from the snapshot
+        instead of one List/Get call each.
+
+        Returns:
+            IAMSnapshot: The snapshot, or None if GetAccountAuthorizationDetails is not allowed
+        """
+        with self._snapshot_lock:
+            if not self._snapshot_loaded:
+                self._snapshot_loaded = True
+                try:
+                    self.snapshot = self.get_account_authorization_details()
+                    self.policy_store.add_snapshot(self.snapshot)
+                    print_yellow(
+                        f"\n[*] Loaded IAM snapshot: {len(self.snapshot.users)} users, {len(self.snapshot.groups)} groups, "
+                        f"{len(self.snapshot.roles)} roles and {len(self.snapshot.policies)} managed policies"
+                    )
+                except Exception as e:
+                    if self.debug:
+                        print_red(f"Error loading account authorization details: {str(e)}")
+            return self.snapshot
+
+    def _get_attached_role_policies(self, role_name):
+        role = self.snapshot.role(role_name) if self.snapshot else None
+        if role is None:
+            return self.list_attached_role_policies(role_name)
+        return self.snapshot.attached_policies(role)
+
+    def _confirm_deep_enumeration(self):
+        if not sys.stdin or not sys.stdin.isatty():
+            print_yellow("\n[*] No terminal to confirm detailed enumeration; pass --yes to run it unattended.")
+            return False
+        print("\nWould you like to perform detailed enumeration of all permissions in the identified policies? (y/n): ", end="")
+        user_choice = input().strip().lower()
+        return user_choice == 'y' or user_choice == 'yes'
+
+    def _schedule_resource_action(self, scheduler, action, resource, is_wildcard):
+        # One unit per service and region the action reaches; the first prints
+        # the wildcard note, the first of each service its header and the last
+        # the interesting permission notes, so the output reads as one block
+        units = []
+        for service_prefix in self._target_services(action):
+            handlers = self.plan.handlers_for(action, resource, service_prefix) if self.plan else None
+            services = self._regional_services(service_prefix, action, resource) if handlers != [] else []
+            units.extend((service_prefix, service, handlers, index == 0) for index, service in enumerate(services))
+
+        if not units:
+            service_prefix = split_action(action)[0]
+            handlers = self.plan.handlers_for(action, resource) if self.plan else None
+            unit = partial(self._enumerate_and_list_resources, first=True, last=True, handlers=handlers)
+            scheduler.submit(service_prefix, unit, action, resource, is_wildcard)
             return
 
-        if is_resource_wildcard:
+        last = len(units) - 1
+        for index, (service_prefix, service, handlers, header) in enumerate(units):
+            unit = partial(
+                self._enumerate_and_list_resources,
+                service=service, first=index == 0, last=index == last, handlers=handlers, header=header
+            )
+            scheduler.submit(service_prefix, unit, action, resource, is_wildcard, region=service.region)
+
+    def _regional_services(self, service_prefix, action, resource):
+        if not self.available_services or service_prefix not in self.available_services:
+            return []
+        services = self.available_services.regional(service_prefix)
+        if not services[0].handles(action):
+            return []
+
+        # A resource ARN pinned to a region only needs that region's instance
+        arn_parts = resource.split(':')
+        if len(services) > 1 and resource.startswith('arn:') and len(arn_parts) > 3 and arn_parts[3]:
+            services = [service for service in services if matches(arn_parts[3], service.region, ignore_case=False)] or services
+        return services
+
+    def _enumerate_and_list_resources(self, action, resource, is_resource_wildcard=False,
+                                      service=None, first=True, last=True, handlers=None, header=None):
+        service_prefix, _ = split_action(action)
+        header = first if header is None else header
+
+        if service is None and self.available_services and service_prefix in self.available_services:
+            service = self.available_services[service_prefix]
+        is_supported = service is not None and service.handles(action)
+        # Every handler the pair asked for is already covered by an earlier pair
+        is_coalesced = is_supported and handlers == []
+        # The separator line is printed at most once per action and resource
+        print_line = not (is_resource_wildcard or is_supported or (service is not None and self.debug))
+
+        if first and is_resource_wildcard:
             print("\n" + "-" * 100)
-            print_line = False
             print_green(f"\n⚠️  Resource is a wildcard (*) for action: {action}")
 
-        if self.available_services and service_prefix in self.available_services:
-            service = self.available_services[service_prefix]
-            if action in service.supported_actions:
-                if print_line:
-                    print("\n" + "-" * 100)
-                    print_line = False
-                
-                print_yellow(f"\n[*] Enumerating permissions for action: {action} on resource: {resource}")
-                service.handle_permission_action(action, resource)
-            else: 
-                if print_line and self.debug:
+        if header:
+            if is_supported and not is_coalesced:
+                if not (first and is_resource_wildcard):
                     print("\n" + "-" * 100)
-                    print_line = False
-                    self.handle_unimplemented_action(action, resource)
+                target = f" [{service.service_name}]" if service.service_name != service_prefix else ""
+                print_yellow(f"\n[*] Enumerating permissions for action: {action} on resource: {resource}{target}")
+            elif service is not None and self.debug and not is_resource_wildcard:
+                print("\n" + "-" * 100)
+                self.handle_unimplemented_action(action, resource)
 
-        self.check_interesting_permissions(action, resource, print_line)
+        if is_supported and not is_coalesced:
+            if service.region:
+                print_cyan(f"\n[Region: {service.region}]")
+            service.handle_permission_action(action, resource, handlers)
+
+        if last:
+            self.check_interesting_permissions(action, resource, print_line, self.evaluator)
 
     # subcommand methods
     def find_role(self, role_name):
@@ -306,36 +586,36 @@ class IAMService(AWSServiceInterface):
         print_cyan("=" * 80)
     
         try:
-            roles = self.list_roles()
-            matching_role = None
-    
-            # Case-insensitive exact match
-            for role in roles:
-                if role_name.lower() == role['RoleName'].lower():
-                    matching_role = role
-                    break
+            snapshot = self.load_snapshot()
+            if snapshot:
+                matching_role = snapshot.role(role_name)
+            else:
+                # Case-insensitive exact match
+                matching_role = next(
+                    (role for role in self.list_roles() if role_name.lower() == role['RoleName'].lower()),
+                    None
+                )
     
             if matching_role:
                 print_green(f"\n[*] Found role: {matching_role['RoleName']}")
                 print_yellow("\nRole Details:")
-                print(yaml.dump(matching_role))
+                print(yaml.dump(IAMSnapshot.summary(matching_role)))
 
                 # Get attached policies
                 try:
-                    attached_policies = self.list_attached_role_policies(matching_role['RoleName'])
+                    if snapshot:
+                        attached_policies = snapshot.attached_policies(matching_role)
+                    else:
+                        attached_policies = self.list_attached_role_policies(matching_role['RoleName'])
                     print_cyan("\n[*] Attached Role Policies:")
                     if attached_policies:
                         print(yaml.dump(attached_policies))
                         print_cyan("\n[*] Attached Policy Details:")
                         for policy in attached_policies:
                             try:
-                                policy_details = self.get_policy(policy['PolicyArn'])
-                                policy_version = self.get_policy_version(
-                                    policy['PolicyArn'],
-                                    policy_details['DefaultVersionId']
-                                )
+                                policy_document = self._get_managed_policy_document(policy['PolicyArn'])
                                 print_yellow(f"\nPolicy Name: {policy['PolicyName']}")
-                                print(yaml.dump(policy_version['Document']))
+                                print(yaml.dump(policy_document))
                             except Exception as e:
                                 print_red(f"Error getting policy details for {policy['PolicyName']}: {str(e)}")
                     else:
@@ -345,11 +625,16 @@ class IAMService(AWSServiceInterface):
     
                 # Get inline policies
                 try:
-                    inline_policies = self.list_role_policies(matching_role['RoleName'])
+                    if snapshot:
+                        inline_policies = snapshot.inline_policies(matching_role)
+                    else:
+                        inline_policies = [
+                            (policy_name, self.get_role_policy(matching_role['RoleName'], policy_name))
+                            for policy_name in self.list_role_policies(matching_role['RoleName'])
+                        ]
                     print_cyan("\n[*] Inline Role Policies:")
                     if inline_policies:
-                        for policy_name in inline_policies:
-                            policy_doc = self.get_role_policy(matching_role['RoleName'], policy_name)
+                        for policy_name, policy_doc in inline_policies:
                             print_yellow(f"\nPolicy Name: {policy_name}")
                             print(yaml.dump(policy_doc))
                     else:
@@ -362,78 +647,166 @@ class IAMService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error finding role: {str(e)}")
 
+    def find_privesc_paths(self, principal_arn=None):
+        print_cyan("\n" + "=" * 80)
+        print_cyan("Searching for Privilege Escalation Paths")
+        print_cyan("=" * 80)
+
+        snapshot = self.load_snapshot()
+        if snapshot is None:
+            print_red("Error loading account authorization details: iam:GetAccountAuthorizationDetails failed")
+            return
+        graph = PolicyGraph(snapshot, self.policy_store)
+        print_yellow(f"\n[*] Loaded {len(graph.users)} users, {len(graph.roles)} roles and {len(graph.groups)} groups")
+
+        if principal_arn is None:
+            context = self.get_session_context()
+            principal_arn = graph.find(context.principal_name, context.principal_type)
+        if principal_arn not in graph.principals:
+            print_yellow(f"\nPrincipal not found in the account: {principal_arn or self.get_session_context().arn}")
+            return
+
+        paths = graph.escalation_paths(principal_arn)
+        if not paths:
+            print_yellow(f"\nNo escalation paths found for {principal_arn}")
+            return
+
+        for path in paths:
+            print_green(f"\n[!] {principal_arn} can reach administrator access in {len(path)} hop(s)")
+            for source, technique, target in path.steps:
+                print(f"  {source}\n    --[{technique}]--> {target}")
+            print_green(f"  {path.admin_arn} is an administrator via {path.admin_via}")
+            emit(
+                PRIVESC_PATH,
+                service=self.service_name,
+                principal=principal_arn,
+                steps=[{'source': source, 'technique': technique, 'target': target} for source, technique, target in path.steps],
+                admin=path.admin_arn,
+                admin_via=path.admin_via
+            )
+
+    def get_permissions_boundary(self):
+        """
+        The policy set as the caller's permissions boundary.
+
+        Returns:
+            str: The boundary policy ARN, or None if the caller has none
+        """
+        detail = self.get_principal_detail()
+        if detail is None:
+            return None
+        return (detail.get('PermissionsBoundary') or {}).get('PermissionsBoundaryArn')
+
+    def get_principal_detail(self):
+        """
+        The caller's IAM user or role, from the snapshot when it is loaded.
+
+        Returns:
+            dict: The user or role (ARN with its path, boundary, tags), None for other principals
+        """
+        session_context = self.get_session_context()
+        name = session_context.principal_name
+        if session_context.principal_type == 'user':
+            return (self.snapshot.user(name) if self.snapshot else None) or self.get_user(name)
+        if session_context.principal_type == 'role':
+            return (self.snapshot.role(name) if self.snapshot else None) or self.get_role(name)
+        return None
+
+    def get_service_control_policies(self, account_id):
+        """
+        SCP documents that apply to an account, grouped by organization level.
+
+        Walks from the account up through its OUs to the root. SCPs do not
+        apply to the management account, outside an organization or in one
+        with only consolidated billing. Reading them takes the management
+        account or a delegated administrator; from a member account the
+        Organizations calls raise AccessDenied.
+
+        Args:
+            account_id (str): The member account
+
+        Returns:
+            list: One list of policy documents per level, root first (empty if no SCPs apply)
+        """
+        client = self.get_client('organizations')
+        try:
+            organization = self.call_api('describe_organization', client=client)['Organization']
+        except client.exceptions.AWSOrganizationsNotInUseException:
+            return []
+        # SCPs only exist in organizations with all features enabled
+        if organization.get('FeatureSet') != 'ALL' or organization.get('MasterAccountId') == account_id:
+            return []
+
+        targets = [account_id]
+        while True:
+            parents = list(self.paginate('list_parents', 'Parents', client=client, ChildId=targets[-1]))
+            if not parents:
+                break
+            targets.append(parents[0]['Id'])
+            if parents[0]['Type'] == 'ROOT':
+                break
+
+        levels = []
+        for target in reversed(targets):
+            policies = self.paginate(
+                'list_policies_for_target', 'Policies', client=client,
+                TargetId=target, Filter='SERVICE_CONTROL_POLICY'
+            )
+            levels.append([
+                json.loads(self.call_api('describe_policy', client=client, PolicyId=policy['Id'])['Policy']['Content'])
+                for policy in policies
+            ])
+        return levels
+
     # Wrapper methods for IAM API calls
     def get_caller_identity(self):
-        return self.sts.get_caller_identity()
+        return self.get_session_context().identity
     
     def list_roles(self):
-        response = self.client.list_roles()
-        roles = response['Roles']
-        
-        # Handle pagination
-        while response.get('IsTruncated', False):
-            marker = response['Marker']
-            response = self.client.list_roles(Marker=marker)
-            roles.extend(response['Roles'])
-            
-        return roles
+        return self.paginate('list_roles', 'Roles')
+    
+    def get_account_authorization_details(self):
+        config = {'PageSize': self.page_size} if self.page_size else {}
+        paginator = self.client.get_paginator('get_account_authorization_details')
+        try:
+            snapshot = IAMSnapshot.from_pages(paginator.paginate(PaginationConfig=config))
+        except Exception as e:
+            self._emit_error(self.client, 'get_account_authorization_details', {}, e)
+            raise
+        for items in snapshot.details.values():
+            for item in items:
+                self._emit_item(self.client, 'get_account_authorization_details', item)
+        return snapshot
+    
+    def list_users(self):
+        return self.paginate('list_users', 'Users')
+    
+    def get_user(self, user_name):
+        return self.call_api('get_user', UserName=user_name)['User']
+    
+    def get_role(self, role_name):
+        return self.call_api('get_role', RoleName=role_name)['Role']
     
     def list_attached_user_policies(self, user_name):
-        response = self.client.list_attached_user_policies(UserName=user_name)
-        policies = response['AttachedPolicies']
-        
-        # Handle pagination
-        while response.get('IsTruncated', False):
-            marker = response['Marker']
-            response = self.client.list_attached_user_policies(UserName=user_name, Marker=marker)
-            policies.extend(response['AttachedPolicies'])
-            
-        return policies
+        return list(self.paginate('list_attached_user_policies', 'AttachedPolicies', UserName=user_name))
     
     def list_attached_role_policies(self, role_name):
-        response = self.client.list_attached_role_policies(RoleName=role_name)
-        policies = response['AttachedPolicies']
-        
-        # Handle pagination
-        while response.get('IsTruncated', False):
-            marker = response['Marker']
-            response = self.client.list_attached_role_policies(RoleName=role_name, Marker=marker)
-            policies.extend(response['AttachedPolicies'])
-            
-        return policies
+        return list(self.paginate('list_attached_role_policies', 'AttachedPolicies', RoleName=role_name))
     
     def list_user_policies(self, user_name):
-        response = self.client.list_user_policies(UserName=user_name)
-        policies = response['PolicyNames']
-        
-        # Handle pagination
-        while response.get('IsTruncated', False):
-            marker = response['Marker']
-            response = self.client.list_user_policies(UserName=user_name, Marker=marker)
-            policies.extend(response['PolicyNames'])
-            
-        return policies
+        return list(self.paginate('list_user_policies', 'PolicyNames', UserName=user_name))
     
     def list_role_policies(self, role_name):
-        response = self.client.list_role_policies(RoleName=role_name)
-        policies = response['PolicyNames']
-        
-        # Handle pagination
-        while response.get('IsTruncated', False):
-            marker = response['Marker']
-            response = self.client.list_role_policies(RoleName=role_name, Marker=marker)
-            policies.extend(response['PolicyNames'])
-            
-        return policies
+        return list(self.paginate('list_role_policies', 'PolicyNames', RoleName=role_name))
     
     def get_policy(self, policy_arn):
-        return self.client.get_policy(PolicyArn=policy_arn)['Policy']
+        return self.call_api('get_policy', PolicyArn=policy_arn)['Policy']
     
     def get_policy_version(self, policy_arn, version_id):
-        return self.client.get_policy_version(PolicyArn=policy_arn, VersionId=version_id)['PolicyVersion']
+        return self.call_api('get_policy_version', PolicyArn=policy_arn, VersionId=version_id)['PolicyVersion']
     
     def get_user_policy(self, user_name, policy_name):
-        return self.client.get_user_policy(UserName=user_name, PolicyName=policy_name)['PolicyDocument']
+        return self.call_api('get_user_policy', UserName=user_name, PolicyName=policy_name)['PolicyDocument']
     
     def get_role_policy(self, role_name, policy_name):
-        return self.client.get_role_policy(RoleName=role_name, PolicyName=policy_name)['PolicyDocument']
\ No newline at end of file
+        return self.call_api('get_role_policy', RoleName=role_name, PolicyName=policy_name)['PolicyDocument']
\ No newline at end of file
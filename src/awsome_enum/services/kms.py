@@ -5,9 +5,13 @@ from .aws_service_interface import AWSServiceInterface
 from ..utils import print_cyan, print_yellow, print_red, print_green
 
 class KMSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "kms:ListKeys": "_handle_list_keys",
+    }
+    LISTING_HANDLERS = ("_handle_list_keys",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'kms', debug)
-        self.supported_actions = ["kms:ListKeys", "kms:GetKeyPolicy", "kms:*"]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -19,14 +23,13 @@ class KMSService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating KMS resources: {str(e)}")
     
-    def handle_permission_action(self, action, resource):
-        if "kms:ListKeys" in action or "kms:*" in action:
-            print_yellow("\n[*] Found kms:ListKeys permission - Listing all KMS keys:\n")
-            self._list_and_check_keys()
+    def _handle_list_keys(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all KMS keys:\n")
+        self._list_and_check_keys()
 
     def _list_and_check_keys(self):
         try:
-            keys = self.list_keys()
+            keys = list(self.list_keys())
             if not keys:
                 print_yellow("No KMS keys found.")
                 return
@@ -60,11 +63,11 @@ class KMSService(AWSServiceInterface):
 
     # Wrapper methods for KMS API calls
     def list_keys(self):
-        response = self.client.list_keys()
-        return response.get('Keys', [])
+        return self.paginate('list_keys', 'Keys')
     
     def get_key_policy(self, key_id):
-        response = self.client.get_key_policy(
+        response = self.call_api(
+            'get_key_policy',
             KeyId=key_id,
             PolicyName='default'
         )
@@ -5,15 +5,16 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class LambdaService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "lambda:ListFunctions": "_handle_list_functions",
+        "lambda:GetFunction": "_handle_get_function",
+        "lambda:GetFunctionUrlConfig": "_handle_get_function_url",
+        "lambda:GetFunctionConfiguration": "_handle_get_function_configuration",
+    }
+    LISTING_HANDLERS = ("_handle_list_functions",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'lambda', debug)
-        self.supported_actions = [
-            "lambda:*",
-            "lambda:ListFunctions",
-            "lambda:GetFunction",
-            "lambda:GetFunctionUrlConfig",
-            "lambda:GetFunctionConfiguration"
-        ]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -21,52 +22,31 @@ class LambdaService(AWSServiceInterface):
         print_cyan("*" * 80)
         
         try:
-            functions = self.list_functions()
-            if not functions:
+            function_names = [function.get('FunctionName') for function in self.list_functions()]
+            if not function_names:
                 print_yellow("No Lambda functions found.")
                 return
-    
-            for function in functions:
-                function_name = function.get('FunctionName')
-                
-                try:
-                    detailed_info = self.get_function(function_name)
-                    if detailed_info:
-                        self._display_detailed_function_info(function_name)
-                except Exception as e:
-                    if self.debug:
-                        print_red(f"Error getting details for function {function_name}: {str(e)}")
-                
-                try:
-                    url_config = self.get_function_url_config(function_name)
-                    if url_config:
-                        self._display_function_url_config(function_name)
-                except Exception as e:
-                    if self.debug:
-                        print_red(f"Error getting URL config for function {function_name}: {str(e)}")
+
+            # Fetch every function's details and URL config in one fan-out each
+            details = self.get_functions(function_names)
+            url_configs = self.get_function_url_configs(function_names)
+            for function_name, detailed_info, url_config in zip(function_names, details, url_configs):
+                self._display_detailed_function_info(function_name, detailed_info)
+                if url_config:
+                    self._display_function_url_config(function_name, url_config)
     
         except Exception as e:
             print_red(f"Error enumerating Lambda resources: {str(e)}")
     
-    def handle_permission_action(self, action, resource):
-        if "lambda:ListFunctions" == action or "lambda:*" in action:
-            self._handle_list_functions(action)
-        elif "lambda:GetFunction" == action or "lambda:*" in action:
-            self._handle_get_function(action, resource)            
-        elif "lambda:GetFunctionUrlConfig" == action or "lambda:*" in action:
-            self._handle_get_function_url(action, resource)
-        elif "lambda:GetFunctionConfiguration" == action or "lambda:*" in action:
-            self._handle_get_function_configuration(action, resource)
-
-    def _handle_list_functions(self, action):
+    def _handle_list_functions(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing all functions")
-        functions = self.list_functions()
-        if not functions:
-            print_yellow("No Lambda functions found.")
-            return
-        
-        for function in functions:
+        found = False
+        for function in self.list_functions():
+            found = True
             self._display_basic_function_info(function)
+        
+        if not found:
+            print_yellow("No Lambda functions found.")
 
     def _display_basic_function_info(self, function):
         print_yellow(f"\n[*] Function: {function.get('FunctionName')}")
@@ -85,9 +65,9 @@ class LambdaService(AWSServiceInterface):
         
         try:
             if resource == '*':
-                functions = self.list_functions()
-                for function in functions:
-                    self._display_detailed_function_info(function['FunctionName'])
+                function_names = [function['FunctionName'] for function in self.list_functions()]
+                for function_name, response in zip(function_names, self.get_functions(function_names)):
+                    self._display_detailed_function_info(function_name, response)
             else:
                 function_name = resource.split(':')[-1] if ':' in resource else resource
                 self._display_detailed_function_info(function_name)
@@ -95,9 +75,12 @@ class LambdaService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in get function handler: {str(e)}")
 
-    def _display_detailed_function_info(self, function_name):
+    def _display_detailed_function_info(self, function_name, detailed_info=None):
         try:
-            detailed_info = self.get_function(function_name)
+            if detailed_info is None:
+                detailed_info = self.get_function(function_name)
+            if isinstance(detailed_info, Exception):
+                raise detailed_info
             if not detailed_info:
                 return
 
@@ -139,9 +122,9 @@ class LambdaService(AWSServiceInterface):
         
         try:
             if resource == '*':
-                functions = self.list_functions()
-                for function in functions:
-                    self._display_function_url_config(function['FunctionName'])
+                function_names = [function['FunctionName'] for function in self.list_functions()]
+                for function_name, response in zip(function_names, self.get_function_url_configs(function_names)):
+                    self._display_function_url_config(function_name, response)
             else:
                 function_name = resource.split(':')[-1] if ':' in resource else resource
                 self._display_function_url_config(function_name)
@@ -149,9 +132,10 @@ class LambdaService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in function URL handler: {str(e)}")
 
-    def _display_function_url_config(self, function_name):
+    def _display_function_url_config(self, function_name, url_config=None):
         try:
-            url_config = self.get_function_url_config(function_name)
+            if url_config is None:
+                url_config = self.get_function_url_config(function_name)
             if url_config:
                 print_yellow(f"\nURL Configuration for {function_name}:")
                 url_data = [
@@ -172,9 +156,9 @@ class LambdaService(AWSServiceInterface):
         
         try:
             if resource == '*':
-                functions = self.list_functions()
-                for function in functions:
-                    self._display_function_configuration(function['FunctionName'])
+                function_names = [function['FunctionName'] for function in self.list_functions()]
+                for function_name, response in zip(function_names, self.get_function_configurations(function_names)):
+                    self._display_function_configuration(function_name, response)
             else:
                 function_name = resource.split(':')[-1] if ':' in resource else resource
                 self._display_function_configuration(function_name)
@@ -182,9 +166,10 @@ class LambdaService(AWSServiceInterface):
             if self.debug:
                 print_red(f"Error in function configuration handler: {str(e)}")
 
-    def _display_function_configuration(self, function_name):
+    def _display_function_configuration(self, function_name, config=None):
         try:
-            config = self.get_function_configuration(function_name)
+            if config is None:
+                config = self.get_function_configuration(function_name)
             if config:
                 print_yellow(f"\nConfiguration for {function_name}:")
                 config_data = [
@@ -213,23 +198,46 @@ class LambdaService(AWSServiceInterface):
 
     # Wrapper methods for Lambda API calls
     def list_functions(self):
-        response = self.client.list_functions()
-        return response.get('Functions', [])
+        return self.paginate('list_functions', 'Functions')
 
     def get_function(self, function_name):
-        return self.client.get_function(FunctionName=function_name)
+        return self.call_api('get_function', FunctionName=function_name)
 
     def get_function_url_config(self, function_name):
         try:
-            return self.client.get_function_url_config(FunctionName=function_name)
+            return self.call_api('get_function_url_config', FunctionName=function_name)
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFoundException':
                 return None
             raise
 
+    def get_functions(self, function_names):
+        return self.call_api_many('get_function', [{'FunctionName': name} for name in function_names])
+
+    def get_function_url_configs(self, function_names):
+        # Functions without a URL (or whose URL config is unreadable) map to an empty dict
+        url_configs = self.call_api_many('get_function_url_config', [{'FunctionName': name} for name in function_names])
+        for index, url_config in enumerate(url_configs):
+            if isinstance(url_config, ClientError) and url_config.response['Error']['Code'] == 'ResourceNotFoundException':
+                url_configs[index] = {}
+            elif isinstance(url_config, Exception):
+                if self.debug:
+                    print_red(f"Error getting URL config for function {function_names[index]}: {str(url_config)}")
+                url_configs[index] = {}
+        return url_configs
+
+    def get_function_configurations(self, function_names):
+        configs = self.call_api_many('get_function_configuration', [{'FunctionName': name} for name in function_names])
+        for index, config in enumerate(configs):
+            if isinstance(config, Exception):
+                if self.debug:
+                    print_red(f"Error getting function configuration: {str(config)}")
+                configs[index] = {}
+        return configs
+
     def get_function_configuration(self, function_name):
         try:
-            return self.client.get_function_configuration(FunctionName=function_name)
+            return self.call_api('get_function_configuration', FunctionName=function_name)
         except ClientError as e:
             if self.debug:
                 print_red(f"Error getting function configuration: {str(e)}")
@@ -5,12 +5,14 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class LightsailService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "lightsail:GetInstances": "_handle_get_instances",
+        "lightsail:GetRelationalDatabases": "_handle_get_relational_databases",
+    }
+    LISTING_HANDLERS = ("_handle_get_instances", "_handle_get_relational_databases")
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'lightsail', debug)
-        self.supported_actions = [
-            "lightsail:GetInstances", 
-            "lightsail:GetRelationalDatabases"
-        ]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -23,17 +25,17 @@ class LightsailService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating Lightsail resources: {str(e)}")
     
-    def handle_permission_action(self, action, resource):
-        if "lightsail:GetInstances" in action:
-            print_yellow(f"\n[*] Found {action} permission - Listing all instances:\n")
-            self._list_and_display_instances()
-        elif "lightsail:GetRelationalDatabases" in action:
-            print_yellow(f"\n[*] Found {action} permission - Listing all databases:\n")
-            self._list_and_display_databases()
+    def _handle_get_instances(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all instances:\n")
+        self._list_and_display_instances()
+    
+    def _handle_get_relational_databases(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all databases:\n")
+        self._list_and_display_databases()
     
     def _list_and_display_instances(self):
         try:
-            instances = self.get_instances()
+            instances = list(self.get_instances())
             if not instances:
                 print_yellow("No Lightsail instances found.")
                 return
@@ -77,7 +79,7 @@ class LightsailService(AWSServiceInterface):
 
     def _list_and_display_databases(self):
         try:
-            databases = self.get_relational_databases()
+            databases = list(self.get_relational_databases())
             if not databases:
                 print_yellow("No Lightsail databases found.")
                 return
@@ -109,9 +111,7 @@ class LightsailService(AWSServiceInterface):
 
     # Wrapper methods for Lightsail API calls
     def get_instances(self):
-        response = self.client.get_instances()
-        return response.get('instances', [])
+        return self.paginate('get_instances', 'instances')
     
     def get_relational_databases(self):
-        response = self.client.get_relational_databases()
-        return response.get('relationalDatabases', [])
\ No newline at end of file
+        return self.paginate('get_relational_databases', 'relationalDatabases')
\ No newline at end of file
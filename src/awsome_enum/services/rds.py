@@ -4,13 +4,14 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class RDSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "rds:DescribeDBInstances": "_handle_describe_instances",
+        "rds:DescribeDBSnapshots": "_handle_describe_snapshots",
+    }
+    LISTING_HANDLERS = ("_handle_describe_instances", "_handle_describe_snapshots")
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'rds', debug)
-        self.supported_actions = [
-            "rds:*",
-            "rds:DescribeDBInstances",
-            "rds:DescribeDBSnapshots"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -18,34 +19,29 @@ class RDSService(AWSServiceInterface):
         print_cyan("*" * 80)
 
         try:
-            instances = self.list_db_instances()
-            if not instances:
+            found = False
+            for instance in self.list_db_instances():
+                found = True
+                self._display_instance_info(instance)
+
+            if not found:
                 print_yellow("No RDS instances found.")
                 return
 
-            for instance in instances:
-                self._display_instance_info(instance)
-
             self._handle_describe_snapshots("rds:DescribeDBSnapshots", "*")
 
         except Exception as e:
             print_red(f"Error enumerating RDS resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "rds:DescribeDBInstances" == action or "rds:*" in action:
-            self._handle_describe_instances(action, resource)
-        elif "rds:DescribeDBSnapshots" == action or "rds:*" in action:
-            self._handle_describe_snapshots(action, resource)
-
     def _handle_describe_instances(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing RDS instances")
-        instances = self.list_db_instances()
-        if not instances:
-            print_yellow("No RDS instances found.")
-            return
-        
-        for instance in instances:
+        found = False
+        for instance in self.list_db_instances():
+            found = True
             self._display_instance_info(instance)
+        
+        if not found:
+            print_yellow("No RDS instances found.")
 
     def _display_instance_info(self, instance):
         print_yellow(f"\n[*] DB Instance: {instance.get('DBInstanceIdentifier')}")
@@ -72,8 +68,7 @@ class RDSService(AWSServiceInterface):
         print_yellow(f"\n[*] Found {action} permission - Checking for public snapshots")
         
         try:
-            sts_client = self.session.client('sts')
-            account_id = sts_client.get_caller_identity().get('Account')
+            account_id = self.get_session_context().account_id
             print_yellow(f"\nChecking public snapshots for account: {account_id}")
     
             public_snapshots = self.list_public_snapshots(account_id)
@@ -104,12 +99,13 @@ class RDSService(AWSServiceInterface):
     
     def list_public_snapshots(self, account_id):
         try:
-            response = self.client.describe_db_snapshots(
+            snapshots = self.paginate(
+                'describe_db_snapshots',
+                'DBSnapshots',
                 IncludePublic=True,
                 SnapshotType='public'
             )
     
-            snapshots = response.get('DBSnapshots', [])
             account_pattern = f"{account_id}:"
             filtered_snapshots = [
                 snapshot for snapshot in snapshots 
@@ -124,5 +120,4 @@ class RDSService(AWSServiceInterface):
             return []
 
     def list_db_instances(self):
-        response = self.client.describe_db_instances()
-        return response.get('DBInstances', [])
+        return self.paginate('describe_db_instances', 'DBInstances')
@@ -5,9 +5,19 @@ from botocore.exceptions import ClientError
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class S3Service(AWSServiceInterface):
+    # Buckets are listed account-wide from a single endpoint
+    REGIONAL = False
+
+    ACTION_HANDLERS = {
+        "s3:ListAllMyBuckets": "_handle_list_all_my_buckets",
+        "s3:GetBucketPolicy": "_handle_get_bucket_policy",
+        "s3:ListBucket": "_handle_list_bucket",
+    }
+    LISTING_HANDLERS = ("_handle_list_all_my_buckets",)
+    CONCRETE_HANDLERS = ("_handle_get_bucket_policy", "_handle_list_bucket")
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 's3', debug)
-        self.supported_actions = ["s3:ListAllMyBuckets", "s3:GetBucketPolicy", "s3:ListBucket", "s3:*"]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -15,7 +25,7 @@ class S3Service(AWSServiceInterface):
         print_cyan("*" * 80)
         
         try:
-            buckets = self._list_and_display_buckets()
+            buckets = self._list_and_display_buckets() or []
             
             for bucket in buckets:
                 self._enumerate_bucket_details(bucket['Name'])
@@ -23,22 +33,30 @@ class S3Service(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating S3 resources: {str(e)}")
             
-    def handle_permission_action(self, action, resource):
-        if "s3:ListAllMyBuckets" in action or "s3:*" in action:
-            print_yellow("\n[*] Found s3:ListAllMyBuckets permission - Listing all buckets:\n")
-            buckets = self._list_and_display_buckets()
-            if buckets:
-                print_magenta("\n💡 Tip: Use 'awsome-enum --profile [profile] -e s3' to iteratively enumerate all buckets")
-            
-        elif resource != '*' and resource.startswith('arn:aws:s3:::'):
-            bucket_name = resource.split(':::')[1].split('/')[0]
-            print_yellow(f"\n[*] Found permissions for bucket: {bucket_name}")
-            
-            if "s3:GetBucketPolicy" in action or "s3:*" in action:
-                self._check_bucket_policy(bucket_name)
-                
-            if "s3:ListBucket" in action or "s3:*" in action:
-                self._list_bucket_objects(bucket_name)
+    def _handle_list_all_my_buckets(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all buckets:\n")
+        buckets = self._list_and_display_buckets()
+        if buckets:
+            print_magenta("\n💡 Tip: Use 'awsome-enum --profile [profile] -e s3' to iteratively enumerate all buckets")
+
+    def _handle_get_bucket_policy(self, action, resource):
+        bucket_name = self._bucket_name(resource)
+        if bucket_name:
+            print_yellow(f"\n[*] Found {action} permission for bucket: {bucket_name}")
+            self._check_bucket_policy(bucket_name)
+
+    def _handle_list_bucket(self, action, resource):
+        bucket_name = self._bucket_name(resource)
+        if bucket_name:
+            print_yellow(f"\n[*] Found {action} permission for bucket: {bucket_name}")
+            self._list_bucket_objects(bucket_name)
+
+    def _bucket_name(self, resource):
+        """The bucket a bucket or object ARN names; None for bucket wildcards and other resources."""
+        if not resource.startswith(self.get_session_context().arn_prefix('s3') + ':'):
+            return None
+        bucket_name = resource.split(':::')[1].split('/')[0]
+        return None if '*' in bucket_name else bucket_name
 
     def _enumerate_bucket_details(self, bucket_name):
         print_cyan(f"\n[*] Enumerating details for bucket: {bucket_name}")
@@ -52,7 +70,7 @@ class S3Service(AWSServiceInterface):
     
     def _list_and_display_buckets(self):
         try:
-            buckets = self.list_buckets()
+            buckets = list(self.list_buckets())
             if not buckets:
                 print_yellow("No S3 buckets found.")
                 return
@@ -66,7 +84,7 @@ class S3Service(AWSServiceInterface):
     
     def _check_bucket_policy(self, bucket_name):
         try:
-            policy = self.client.get_bucket_policy(Bucket=bucket_name)
+            policy = self.call_api('get_bucket_policy', Bucket=bucket_name)
             print_yellow(f"\n[*] Bucket Policy for {bucket_name}:")
             print(yaml.dump(yaml.safe_load(policy['Policy']), default_flow_style=False))
         except ClientError as e:
@@ -80,22 +98,25 @@ class S3Service(AWSServiceInterface):
     
     def _list_bucket_objects(self, bucket_name, max_keys=20):
         try:
-            objects = self.client.list_objects_v2(Bucket=bucket_name, MaxKeys=max_keys)
+            # Ask for one extra object to learn whether the listing was truncated
+            objects = list(self.list_objects(bucket_name, max_items=max_keys + 1))
             
-            if 'Contents' not in objects or not objects['Contents']:
+            if not objects:
                 print_yellow(f"No objects found in bucket {bucket_name}")
                 return
                 
             print_yellow(f"\n[*] Objects in bucket {bucket_name} (first {max_keys}):")
-            object_data = [[obj['Key'], obj['Size'], obj['LastModified']] for obj in objects['Contents']]
+            object_data = [[obj['Key'], obj['Size'], obj['LastModified']] for obj in objects[:max_keys]]
             print(tabulate(object_data, headers=['Key', 'Size', 'Last Modified'], tablefmt='plain'))
             
-            if objects.get('IsTruncated'):
+            if len(objects) > max_keys:
                 print_green(f"More than {max_keys} objects exist in this bucket.")
         except Exception as e:
             print_red(f"Error listing bucket objects: {str(e)}")
     
     # Wrapper methods for S3 API calls
     def list_buckets(self):
-        response = self.client.list_buckets()
-        return response.get('Buckets', [])
\ No newline at end of file
+        return self.paginate('list_buckets', 'Buckets')
+
+    def list_objects(self, bucket_name, max_items=None):
+        return self.paginate('list_objects_v2', 'Contents', page_size=max_items, max_items=max_items, Bucket=bucket_name)
\ No newline at end of file
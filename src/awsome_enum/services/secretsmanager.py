@@ -4,9 +4,16 @@ from .aws_service_interface import AWSServiceInterface
 from ..utils import print_cyan, print_yellow, print_red, print_green, print_magenta
 
 class SecretsManagerService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "secretsmanager:ListSecrets": "_handle_list_secrets",
+        "secretsmanager:GetResourcePolicy": "_handle_get_resource_policy",
+        "secretsmanager:PutResourcePolicy": "_handle_put_resource_policy",
+    }
+    LISTING_HANDLERS = ("_handle_list_secrets",)
+    CONCRETE_HANDLERS = ("_handle_get_resource_policy",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'secretsmanager', debug)
-        self.supported_actions = ["secretsmanager:ListSecrets", "secretsmanager:GetResourcePolicy", "secretsmanager:PutResourcePolicy", "secretsmanager:*"]
     
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -18,19 +25,22 @@ class SecretsManagerService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating Secrets Manager resources: {str(e)}")
     
-    def handle_permission_action(self, action, resource):
-        if "secretsmanager:ListSecrets" in action or "secretsmanager:*" in action:
-            print_yellow("\n[*] Found secretsmanager:ListSecrets permission - Listing all secrets:")
-            self._list_and_check_secrets()
-        elif "secretsmanager:GetResourcePolicy" in action or "secretsmanager:*" in action:
+    def _handle_list_secrets(self, action, resource):
+        print_yellow(f"\n[*] Found {action} permission - Listing all secrets:")
+        self._list_and_check_secrets()
+
+    def _handle_get_resource_policy(self, action, resource):
+        # A wildcard names no secret; ListSecrets covers the account-wide case
+        if '*' not in resource:
             self._check_secret_policy(resource)
-        elif "secretsmanager:PutResourcePolicy" in action or "secretsmanager:*" in action:
-            print_magenta(f"\n💡 Found 'secretsmanager:PutResourcePolicy' on resource '{resource}'.")
-            print_magenta("Try using 'aws secretsmanager put-resource-policy --secret-id <secret_name> --resource-policy file:///tmp/policy.json'.")
+
+    def _handle_put_resource_policy(self, action, resource):
+        print_magenta(f"\n💡 Found 'secretsmanager:PutResourcePolicy' on resource '{resource}'.")
+        print_magenta("Try using 'aws secretsmanager put-resource-policy --secret-id <secret_name> --resource-policy file:///tmp/policy.json'.")
 
     def _list_and_check_secrets(self):
         try:
-            secrets = self.list_secrets()
+            secrets = list(self.list_secrets())
             if not secrets:
                 print_yellow("No secrets found.")
                 return
@@ -57,12 +67,12 @@ class SecretsManagerService(AWSServiceInterface):
     # Wrapper methods for Secrets Manager API calls
     def list_secrets(self):
         """List all secrets in the account."""
-        response = self.client.list_secrets()
-        return response.get('SecretList', [])
+        return self.paginate('list_secrets', 'SecretList')
     
     def get_resource_policy(self, secret_id):
         """Get resource policy for a specific secret."""
-        response = self.client.get_resource_policy(
+        response = self.call_api(
+            'get_resource_policy',
             SecretId=secret_id
         )
         return response
\ No newline at end of file
@@ -5,14 +5,16 @@ from ..utils import print_cyan, print_yellow, print_red, print_green, print_mage
 import boto3
 
 class SNSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "sns:ListTopics": "_handle_list_topics",
+        "sns:ListSubscriptions": "_handle_list_subscriptions",
+        "sns:ListSubscriptionsByTopic": "_handle_list_subscriptions_by_topic",
+    }
+    LISTING_HANDLERS = ("_handle_list_topics", "_handle_list_subscriptions")
+    CONCRETE_HANDLERS = ("_handle_list_subscriptions_by_topic",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'sns', debug)
-        self.supported_actions = [
-            "sns:*",
-            "sns:ListTopics",
-            "sns:ListSubscriptions",
-            "sns:ListSubscriptionsByTopic"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -25,18 +27,10 @@ class SNSService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating SNS resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "sns:ListTopics" == action or "sns:*" == action:
-            self._handle_list_topics(action, resource)
-        elif "sns:ListSubscriptions" == action or "sns:*" == action:
-            self._handle_list_subscriptions(action, resource)
-        elif "sns:ListSubscriptionsByTopic" == action or "sns:*" == action:
-            self._handle_list_subscriptions_by_topic(action, resource)
-
     def _handle_list_topics(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing topics")
         try:
-            topics = self.list_topics()
+            topics = list(self.list_topics())
             if topics:
                 print_yellow("\nAvailable Topics:")
                 topics_data = [[topic.get('TopicArn')] for topic in topics]
@@ -51,7 +45,7 @@ class SNSService(AWSServiceInterface):
     def _handle_list_subscriptions(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing subscriptions")
         try:
-            subscriptions = self.list_subscriptions()
+            subscriptions = list(self.list_subscriptions())
             if subscriptions:
                 print_yellow("\nSubscriptions:")
                 subs_data = [[s.get('SubscriptionArn'), s.get('TopicArn'), s.get('Protocol'), s.get('Endpoint')] 
@@ -66,7 +60,7 @@ class SNSService(AWSServiceInterface):
     def _handle_list_subscriptions_by_topic(self, action, topic_arn):
         print_yellow(f"\n[*] Found {action} permission - Listing subscriptions for topic: {topic_arn}")
         try:
-            subscriptions = self.list_subscriptions_by_topic(topic_arn)
+            subscriptions = list(self.list_subscriptions_by_topic(topic_arn))
             if subscriptions:
                 print_yellow(f"\nSubscriptions for topic {topic_arn}:")
                 subs_data = [[s.get('SubscriptionArn'), s.get('Protocol'), s.get('Endpoint')] 
@@ -80,15 +74,10 @@ class SNSService(AWSServiceInterface):
 
     # API wrapper methods
     def list_topics(self):
-        response = self.client.list_topics()
-        return response.get('Topics', [])
+        return self.paginate('list_topics', 'Topics')
 
     def list_subscriptions(self):
-        response = self.client.list_subscriptions()
-        return response.get('Subscriptions', [])
+        return self.paginate('list_subscriptions', 'Subscriptions')
 
     def list_subscriptions_by_topic(self, topic_arn):
-        response = self.client.list_subscriptions_by_topic(
-            TopicArn=topic_arn
-        )
-        return response.get('Subscriptions', [])
+        return self.paginate('list_subscriptions_by_topic', 'Subscriptions', TopicArn=topic_arn)
@@ -5,15 +5,19 @@ from ..utils import print_cyan, print_yellow, print_red, print_green, print_mage
 import boto3
 
 class SQSService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "sqs:ListQueues": "_handle_list_queues",
+        "sqs:GetQueueAttributes": "_handle_get_queue_attributes",
+        "sqs:ReceiveMessage": "_handle_receive_message",
+        "sqs:SendMessage": "_handle_send_message",
+    }
+    # Change state, so they run only when the policy names them
+    EXPLICIT_ACTIONS = ("sqs:ReceiveMessage", "sqs:SendMessage")
+    LISTING_HANDLERS = ("_handle_list_queues",)
+    CONCRETE_HANDLERS = ("_handle_get_queue_attributes", "_handle_receive_message", "_handle_send_message")
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'sqs', debug)
-        self.supported_actions = [
-            "sqs:*",
-            "sqs:ListQueues",
-            "sqs:GetQueueAttributes",
-            "sqs:ReceiveMessage",
-            "sqs:SendMessage"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -28,26 +32,15 @@ class SQSService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating SQS resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "sqs:ListQueues" == action or "sqs:*" == action:
-            self._handle_list_queues(action, resource)
-        elif "sqs:GetQueueAttributes" == action or "sqs:*" == action:
-            self._handle_get_queue_attributes(action, resource)
-        elif "sqs:ReceiveMessage" == action or "sqs:*" == action:
-            self._handle_receive_message(action, resource)
-        elif "sqs:SendMessage" == action or "sqs:*" == action:
-            self._handle_send_message(action, resource)
-
     def _handle_list_queues(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing queues")
         try:
-            queues = self.list_queues()
-            if queues:
-                print_yellow("\nAvailable Queues:")
-                for queue_url in queues:
-                    print_green(f"Queue URL: {queue_url}")
-                    # Try to get queue attributes for each queue
-                    self._handle_get_queue_attributes(action, queue_url)
+            for index, queue_url in enumerate(self.list_queues()):
+                if index == 0:
+                    print_yellow("\nAvailable Queues:")
+                print_green(f"Queue URL: {queue_url}")
+                # Try to get queue attributes for each queue
+                self._handle_get_queue_attributes(action, queue_url)
         except Exception as e:
             if self.debug:
                 print_red(f"Error in list queues handler: {str(e)}")
@@ -94,11 +87,11 @@ class SQSService(AWSServiceInterface):
 
     # API wrapper methods
     def list_queues(self):
-        response = self.client.list_queues()
-        return response.get('QueueUrls', [])
+        return self.paginate('list_queues', 'QueueUrls')
 
     def get_queue_attributes(self, queue_url):
-        response = self.client.get_queue_attributes(
+        response = self.call_api(
+            'get_queue_attributes',
             QueueUrl=queue_url,
             AttributeNames=['All']
         )
@@ -5,21 +5,20 @@ from ..utils import print_cyan, print_yellow, print_red, print_green, print_mage
 import boto3
 
 class StepFunctionsService(AWSServiceInterface):
+    ACTION_HANDLERS = {
+        "states:ListStateMachines": "_handle_list_state_machines",
+        "states:DescribeStateMachine": "_handle_describe_state_machine",
+        "states:ListStateMachineVersions": "_handle_list_state_machine_versions",
+        "states:ListStateMachineAliases": "_handle_list_state_machine_aliases",
+        "states:DescribeStateMachineAlias": "_handle_describe_state_machine_alias",
+        "states:ListExecutions": "_handle_list_executions",
+        "states:DescribeExecution": "_handle_describe_execution",
+        "states:DescribeStateMachineForExecution": "_handle_describe_state_machine_for_execution",
+    }
+    LISTING_HANDLERS = ("_handle_list_state_machines",)
+
     def __init__(self, session=None, debug=False):
         super().__init__(session, 'stepfunctions', debug)
-        self.supported_actions = [
-            "states:*",
-            "states:List*",
-            "states:Describe*",
-            "states:ListStateMachines",
-            "states:DescribeStateMachine",
-            "states:ListStateMachineVersions",
-            "states:ListStateMachineAliases",
-            "states:DescribeStateMachineAlias",
-            "states:ListExecutions",
-            "states:DescribeExecution",
-            "states:DescribeStateMachineForExecution"
-        ]
 
     def enumerate(self):
         print_cyan("\n" + "*" * 80)
@@ -38,28 +37,10 @@ class StepFunctionsService(AWSServiceInterface):
         except Exception as e:
             print_red(f"Error enumerating Step Functions resources: {str(e)}")
 
-    def handle_permission_action(self, action, resource):
-        if "states:ListStateMachines" in action or "states:List*" in action or "states:*" in action:
-            self._handle_list_state_machines(action, resource)
-        elif "states:DescribeStateMachine" in action or "states:Describe*" in action or "states:*" in action:
-            self._handle_describe_state_machine(action, resource)
-        elif "states:ListStateMachineVersions" in action or "states:List*" in action or "states:*" in action:
-            self._handle_list_state_machine_versions(action, resource)
-        elif "states:ListStateMachineAliases" in action or "states:List*" in action or "states:*" in action:
-            self._handle_list_state_machine_aliases(action, resource)
-        elif "states:DescribeStateMachineAlias" in action or "states:Describe*" in action or "states:*" in action:
-            self._handle_describe_state_machine_alias(action, resource)
-        elif "states:ListExecutions" in action or "states:List*" in action or "states:*" in action:
-            self._handle_list_executions(action, resource)
-        elif "states:DescribeExecution" in action or "states:Describe*" in action or "states:*" in action:
-            self._handle_describe_execution(action, resource)
-        elif "states:DescribeStateMachineForExecution" in action or "states:Describe*" in action or "states:*" in action:
-            self._handle_describe_state_machine_for_execution(action, resource)
-
     def _handle_list_state_machines(self, action, resource):
         print_yellow(f"\n[*] Found {action} permission - Listing state machines")
         try:
-            state_machines = self.list_state_machines()
+            state_machines = list(self.list_state_machines())
             if state_machines:
                 print_yellow("\nAvailable State Machines:")
                 for sm in state_machines:
@@ -97,7 +78,7 @@ class StepFunctionsService(AWSServiceInterface):
         print_yellow(f"\n[*] Found {action} permission - Listing state machine versions")
         try:
             if resource != "*" and resource.startswith("arn:"):
-                versions = self.list_state_machine_versions(resource)
+                versions = list(self.list_state_machine_versions(resource))
                 if versions:
                     print_yellow(f"\nVersions for state machine: {resource}")
                     for version in versions:
@@ -108,7 +89,7 @@ class StepFunctionsService(AWSServiceInterface):
                 state_machines = self.list_state_machines()
                 for sm in state_machines:
                     sm_arn = sm.get('stateMachineArn')
-                    versions = self.list_state_machine_versions(sm_arn)
+                    versions = list(self.list_state_machine_versions(sm_arn))
                     if versions:
                         print_yellow(f"\nVersions for state machine: {sm_arn}")
                         for version in versions:
@@ -123,7 +104,7 @@ class StepFunctionsService(AWSServiceInterface):
         print_yellow(f"\n[*] Found {action} permission - Listing state machine aliases")
         try:
             if resource != "*" and resource.startswith("arn:"):
-                aliases = self.list_state_machine_aliases(resource)
+                aliases = list(self.list_state_machine_aliases(resource))
                 if aliases:
                     print_yellow(f"\nAliases for state machine: {resource}")
                     for alias in aliases:
@@ -134,7 +115,7 @@ class StepFunctionsService(AWSServiceInterface):
                 state_machines = self.list_state_machines()
                 for sm in state_machines:
                     sm_arn = sm.get('stateMachineArn')
-                    aliases = self.list_state_machine_aliases(sm_arn)
+                    aliases = list(self.list_state_machine_aliases(sm_arn))
                     if aliases:
                         print_yellow(f"\nAliases for state machine: {sm_arn}")
                         for alias in aliases:
@@ -174,7 +155,7 @@ class StepFunctionsService(AWSServiceInterface):
         print_yellow(f"\n[*] Found {action} permission - Listing executions")
         try:
             if resource != "*" and resource.startswith("arn:"):
-                executions = self.list_executions(resource)
+                executions = list(self.list_executions(resource))
                 if executions:
                     print_yellow(f"\nExecutions for state machine: {resource}")
                     for execution in executions:
@@ -186,7 +167,7 @@ class StepFunctionsService(AWSServiceInterface):
                 state_machines = self.list_state_machines()
                 for sm in state_machines:
                     sm_arn = sm.get('stateMachineArn')
-                    executions = self.list_executions(sm_arn)
+                    executions = list(self.list_executions(sm_arn))
                     if executions:
                         print_yellow(f"\nExecutions for state machine: {sm_arn}")
                         for execution in executions:
@@ -250,33 +231,29 @@ class StepFunctionsService(AWSServiceInterface):
 
     # API wrapper methods
     def list_state_machines(self):
-        response = self.client.list_state_machines()
-        return response.get('stateMachines', [])
+        return self.paginate('list_state_machines', 'stateMachines')
 
     def describe_state_machine(self, state_machine_arn):
-        response = self.client.describe_state_machine(stateMachineArn=state_machine_arn)
+        response = self.call_api('describe_state_machine', stateMachineArn=state_machine_arn)
         return response
 
     def list_state_machine_versions(self, state_machine_arn):
-        response = self.client.list_state_machine_versions(stateMachineArn=state_machine_arn)
-        return response.get('stateMachineVersions', [])
+        return self.paginate('list_state_machine_versions', 'stateMachineVersions', stateMachineArn=state_machine_arn)
 
     def list_state_machine_aliases(self, state_machine_arn):
-        response = self.client.list_state_machine_aliases(stateMachineArn=state_machine_arn)
-        return response.get('stateMachineAliases', [])
+        return self.paginate('list_state_machine_aliases', 'stateMachineAliases', stateMachineArn=state_machine_arn)
 
     def describe_state_machine_alias(self, state_machine_alias_arn):
-        response = self.client.describe_state_machine_alias(stateMachineAliasArn=state_machine_alias_arn)
+        response = self.call_api('describe_state_machine_alias', stateMachineAliasArn=state_machine_alias_arn)
         return response
 
     def list_executions(self, state_machine_arn):
-        response = self.client.list_executions(stateMachineArn=state_machine_arn)
-        return response.get('executions', [])
+        return self.paginate('list_executions', 'executions', stateMachineArn=state_machine_arn)
 
     def describe_execution(self, execution_arn):
-        response = self.client.describe_execution(executionArn=execution_arn)
+        response = self.call_api('describe_execution', executionArn=execution_arn)
         return response
 
     def describe_state_machine_for_execution(self, execution_arn):
-        response = self.client.describe_state_machine_for_execution(executionArn=execution_arn)
+        response = self.call_api('describe_state_machine_for_execution', executionArn=execution_arn)
         return response
@@ -0,0 +1,65 @@
+import threading
+
+class SessionContext:
+    """
+    Who the run's credentials belong to.
+
+    sts:GetCallerIdentity is called once, on first use, and every service of
+    the run reads the identity, account, partition and principal from here.
+    """
+
+    def __init__(self, client_pool):
+        self._client_pool = client_pool
+        self._identity = None
+        self._lock = threading.Lock()
+
+    @property
+    def identity(self):
+        """The GetCallerIdentity response (UserId, Account, Arn)."""
+        if self._identity is None:
+            with self._lock:
+                if self._identity is None:
+                    response = self._client_pool.get('sts').get_caller_identity()
+                    self._identity = {key: value for key, value in response.items() if key != 'ResponseMetadata'}
+        return self._identity
+
+    @property
+    def arn(self):
+        return self.identity['Arn']
+
+    @property
+    def account_id(self):
+        return self.identity['Account']
+
+    @property
+    def user_id(self):
+        return self.identity['UserId']
+
+    @property
+    def partition(self):
+        """'aws', 'aws-cn', 'aws-us-gov', ..."""
+        return self.arn.split(':')[1]
+
+    @property
+    def principal_type(self):
+        """'user', 'role', 'root' or 'federated-user'."""
+        resource = self.arn.split(':', 5)[5]
+        if resource == 'root':
+            return 'root'
+        if resource.startswith('user/'):
+            return 'user'
+        if resource.startswith('federated-user/'):
+            return 'federated-user'
+        return 'role'
+
+    @property
+    def principal_name(self):
+        """User or role name; an assumed role resolves to the role, not the session."""
+        resource = self.arn.split(':', 5)[5]
+        if resource.startswith('assumed-role/'):
+            return resource.split('/')[1]
+        return resource.split('/')[-1]
+
+    def arn_prefix(self, service):
+        """Start of this partition's ARNs for a global service, e.g. 'arn:aws:iam::'."""
+        return f"arn:{self.partition}:{service}::"
@@ -1,20 +1,50 @@
 import json
 import yaml
+from functools import lru_cache
+from importlib import resources
 from colorama import Fore, Style, init
+from .action_catalog import ActionCatalog
+from .permission_catalog import PermissionCatalog
 
+PERMISSIONS_FILE = "interesting_permissions.json"
+ACTION_CATALOG_FILE = "action_catalog.jsonl"
+
+@lru_cache(maxsize=None)
 def load_permissions():
+    """
+    Load the interesting permissions shipped with the package.
+
+    The file is read and indexed once per process; every caller shares the
+    same immutable PermissionCatalog.
+    """
     try:
-        with open("interesting_permissions.json", "r") as f:
-            permissions = json.load(f)
+        text = resources.files(__package__).joinpath(PERMISSIONS_FILE).read_text(encoding="utf-8")
+        permissions = json.loads(text)
         # print(f"Loaded {len(permissions)} interesting permissions.")
-        return permissions
+        return PermissionCatalog(permissions)
     except FileNotFoundError:
-        print("Warning: interesting_permissions.json not found in the current directory. Interesting permissions will not be checked.")
+        print(f"Warning: {PERMISSIONS_FILE} not found in the awsome_enum package. Interesting permissions will not be checked.")
     except json.JSONDecodeError:
-        print("Error: interesting_permissions.json is not valid JSON. Please check the file format.")
+        print(f"Error: {PERMISSIONS_FILE} is not valid JSON. Please check the file format.")
+    except Exception as e:
+        print(f"An error occurred while loading {PERMISSIONS_FILE}: {str(e)}")
+    return PermissionCatalog()
+
+@lru_cache(maxsize=None)
+def load_action_catalog():
+    """
+    Load the catalog of every IAM action shipped with the package.
+
+    Only the file's index is parsed here; each service's actions are decoded
+    on first use. Every caller shares the same ActionCatalog.
+    """
+    try:
+        return ActionCatalog(resources.files(__package__).joinpath(ACTION_CATALOG_FILE).read_bytes())
+    except FileNotFoundError:
+        print(f"Warning: {ACTION_CATALOG_FILE} not found in the awsome_enum package. Wildcards will not be expanded.")
     except Exception as e:
-        print(f"An error occurred while loading interesting_permissions.json: {str(e)}")
-    return {}
+        print(f"An error occurred while loading {ACTION_CATALOG_FILE}: {str(e)}")
+    return ActionCatalog()
 
 def print_compact_logo():
     init()
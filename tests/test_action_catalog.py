@@ -0,0 +1,42 @@
+import unittest
+
+from awsome_enum.evaluator import EffectivePermissions, PolicyEvaluator
+from awsome_enum.plan import EnumerationPlan
+from awsome_enum.services import AVAILABLE_SERVICES
+from awsome_enum.utils import load_action_catalog
+
+
+class ActionCatalogTest(unittest.TestCase):
+
+    def test_api_names_are_stored_as_iam_actions(self):
+        catalog = load_action_catalog()
+        for action in ('s3:ListAllMyBuckets', 's3:ListBucket', 's3:GetObject', 'lambda:InvokeFunction', 'apigateway:GET'):
+            self.assertIn(action, catalog)
+        for api_name in ('s3:ListBuckets', 's3:ListObjectsV2', 's3:HeadObject', 'lambda:Invoke', 'apigateway:GetRestApis'):
+            self.assertNotIn(api_name, catalog)
+
+    def test_every_handler_action_is_an_iam_action(self):
+        catalog = load_action_catalog()
+        unknown = [
+            action for name, service in AVAILABLE_SERVICES.items() if name != 'efs'
+            for action in service.ACTION_HANDLERS if action not in catalog
+        ]
+        self.assertEqual(unknown, [])
+
+    def test_plan_drops_wildcards_denied_on_every_action(self):
+        documents = [{
+            'Version': '2012-10-17',
+            'Statement': [
+                {'Effect': 'Allow', 'Action': 'ecs:*', 'Resource': '*'},
+                {'Effect': 'Deny', 'Action': 'ecs:List*', 'Resource': '*'},
+            ],
+        }]
+        plan = EnumerationPlan({'*': ['ecs:List*', 'ecs:Describe*']}, AVAILABLE_SERVICES.get,
+                               evaluator=EffectivePermissions(PolicyEvaluator(documents)),
+                               expand=load_action_catalog().expand)
+        self.assertEqual(plan.excluded, [('ecs:List*', '*')])
+        self.assertEqual(plan.pairs, [('ecs:Describe*', '*')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from awsome_enum.cache import CACHE_FILE, DiskCache, ResponseCache
+
+IDENTITY = ('123456789012', 'arn:aws:iam::123456789012:user/alice')
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open(self, identity=lambda: IDENTITY, **kwargs):
+        store = DiskCache(identity, cache_dir=self.directory, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_database_is_readable_by_its_owner_only(self):
+        previous = os.umask(0o022)
+        try:
+            store = self.open()
+        finally:
+            os.umask(previous)
+
+        self.assertEqual(stat.S_IMODE(os.stat(store.path).st_mode), 0o600)
+
+    def test_response_round_trips_with_its_timestamps(self):
+        store = self.open()
+        created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        key = ResponseCache.make_key('iam', None, 'get_role', {'RoleName': 'app'})
+
+        store.put(key, {'Role': {'RoleName': 'app', 'CreateDate': created}})
+
+        self.assertEqual(store.get(key), {'Role': {'RoleName': 'app', 'CreateDate': created}})
+
+    def test_listing_round_trips_as_a_sequence(self):
+        store = self.open()
+        key = ResponseCache.make_key('sqs', 'us-east-1', 'list_queues', {})
+
+        store.put(key, ('https://queue/a', 'https://queue/b'))
+
+        self.assertEqual(list(store.get(key)), ['https://queue/a', 'https://queue/b'])
+
+    def test_operations_outside_the_allowlist_stay_off_disk(self):
+        store = self.open()
+        cache = ResponseCache(store=store)
+        key = ResponseCache.make_key('lambda', 'us-east-1', 'list_functions', {})
+        functions = ({'FunctionName': 'f', 'Environment': {'Variables': {'DB_PASSWORD': 'hunter2'}}},)
+
+        cache.put(key, functions)
+
+        self.assertEqual(cache.get(key), functions)
+        self.assertIsNone(store.get(key))
+        with open(store.path, 'rb') as handle:
+            self.assertNotIn(b'hunter2', handle.read())
+
+    def test_entry_expires_after_its_ttl(self):
+        store = self.open(ttl=60, operation_ttls={'get_policy_version': 600})
+        role = ResponseCache.make_key('iam', None, 'get_role', {'RoleName': 'app'})
+        version = ResponseCache.make_key('iam', None, 'get_policy_version', {'PolicyArn': 'p', 'VersionId': 'v1'})
+        store.put(role, {'Role': {}})
+        store.put(version, {'PolicyVersion': {}})
+
+        later = time.time() + 120
+        with mock.patch('awsome_enum.cache.time.time', return_value=later):
+            self.assertIsNone(store.get(role))
+            self.assertEqual(store.get(version), {'PolicyVersion': {}})
+
+    def test_identity_is_looked_up_on_first_use_and_scopes_entries(self):
+        calls = []
+
+        def identity():
+            calls.append(True)
+            return IDENTITY
+
+        store = self.open(identity)
+        self.assertEqual(calls, [])
+
+        key = ResponseCache.make_key('s3', None, 'list_buckets', {})
+        store.put(key, {'Buckets': []})
+        other = self.open(lambda: ('123456789012', 'arn:aws:iam::123456789012:user/bob'))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(store.get(key), {'Buckets': []})
+        self.assertIsNone(other.get(key))
+
+    def test_databases_of_an_earlier_format_are_emptied(self):
+        path = os.path.join(self.directory, CACHE_FILE)
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE responses (value BLOB)")
+            conn.execute("INSERT INTO responses VALUES (?)", (b'\x80\x04pickled',))
+        conn.close()
+
+        store = self.open()
+
+        with store._lock:
+            columns = [row[1] for row in store._conn.execute("PRAGMA table_info(responses)")]
+            rows = store._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.assertIn('principal', columns)
+        self.assertEqual(rows, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import io
+import unittest
+
+from botocore.exceptions import ClientError
+
+from awsome_enum.services.codebuild import CodeBuildService
+
+ACCESS_DENIED = ClientError({'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}}, 'BatchGet')
+
+
+class FakeCodeBuild(CodeBuildService):
+    """CodeBuild with canned listings; batch lookups return the first `found` items, then fail."""
+
+    def __init__(self, names, found):
+        super().__init__()
+        self.names = names
+        self.found = found
+
+    def _batch(self, key, values):
+        for value in list(values)[:self.found]:
+            yield {key: value}
+        raise ACCESS_DENIED
+
+    def list_projects(self):
+        return iter(self.names)
+
+    def batch_get_projects(self, names):
+        return self._batch('name', names)
+
+    def batch_get_builds(self, ids):
+        return self._batch('id', ids)
+
+    def batch_get_build_batches(self, ids):
+        return self._batch('id', ids)
+
+
+def captured(func, *args):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        func(*args)
+    return output.getvalue()
+
+
+class BatchFallbackTest(unittest.TestCase):
+
+    def test_project_names_are_listed_without_batch_get_projects(self):
+        service = FakeCodeBuild(['api', 'web'], found=0)
+
+        output = captured(service._handle_list_projects, 'codebuild:ListProjects', '*')
+
+        self.assertIn('Project: api', output)
+        self.assertIn('Project: web', output)
+
+    def test_projects_shown_before_a_failure_are_not_repeated(self):
+        service = FakeCodeBuild(['api', 'web'], found=1)
+
+        output = captured(service._handle_list_projects, 'codebuild:ListProjects', '*')
+
+        self.assertEqual(output.count('Project: api'), 1)
+        self.assertEqual(output.count('Project: web'), 1)
+
+    def test_build_ids_already_streamed_are_not_reprinted(self):
+        service = FakeCodeBuild([], found=1)
+
+        output = captured(service._display_builds, ['api:1', 'api:2', 'api:3'], 'Builds')
+
+        self.assertEqual(output.count('api:1'), 1)
+        self.assertIn('api:2', output)
+        self.assertIn('api:3', output)
+
+    def test_build_batch_ids_already_streamed_are_not_reprinted(self):
+        service = FakeCodeBuild([], found=2)
+
+        output = captured(service._display_build_batches, ['web:1', 'web:2', 'web:3'], 'Build Batches')
+
+        self.assertEqual(output.count('web:1'), 1)
+        self.assertEqual(output.count('web:2'), 1)
+        self.assertIn('web:3', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import unittest
+
+from botocore.exceptions import ClientError
+
+from awsome_enum.evaluator import ALLOWED, EXPLICIT_DENY, EffectivePermissions, PolicyEvaluator
+from awsome_enum.services.iam import IAMService
+
+IDENTITY = {
+    'Version': '2012-10-17',
+    'Statement': [
+        {'Effect': 'Allow', 'Action': '*', 'Resource': '*'},
+        {'Effect': 'Deny', 'Action': 'iam:CreateAccessKey', 'Resource': '*'},
+    ],
+}
+
+
+class UnreadLayerTest(unittest.TestCase):
+
+    def test_unread_scps_leave_the_readable_layers_to_decide(self):
+        permissions = EffectivePermissions(PolicyEvaluator([IDENTITY]), unread=['SCPs'])
+        self.assertEqual(permissions.unread, ('SCPs',))
+        self.assertEqual(permissions.evaluate('s3:GetObject', '*'), ALLOWED)
+        self.assertEqual(permissions.evaluate('iam:CreateAccessKey', '*'), EXPLICIT_DENY)
+
+    def test_readable_layers_decide_alone(self):
+        permissions = EffectivePermissions(PolicyEvaluator([IDENTITY]))
+        self.assertEqual(permissions.evaluate('s3:GetObject', '*'), ALLOWED)
+
+    def test_scp_deny_at_any_level_wins(self):
+        scps = [
+            PolicyEvaluator([{'Statement': [{'Effect': 'Allow', 'Action': '*', 'Resource': '*'}]}]),
+            PolicyEvaluator([{'Statement': [
+                {'Effect': 'Allow', 'Action': '*', 'Resource': '*'},
+                {'Effect': 'Deny', 'Action': 's3:*', 'Resource': '*'},
+            ]}]),
+        ]
+        permissions = EffectivePermissions(PolicyEvaluator([IDENTITY]), scps=scps)
+        self.assertEqual(permissions.evaluate('s3:GetObject', '*'), EXPLICIT_DENY)
+        self.assertEqual(permissions.evaluate('ec2:DescribeInstances', '*'), ALLOWED)
+
+
+class SessionContextStub:
+    account_id = '111122223333'
+
+
+class MemberAccountIAM(IAMService):
+    """An IAM service whose Organizations calls fail the way they do from a member account."""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def get_session_context(self):
+        return SessionContextStub()
+
+    def get_service_control_policies(self, account_id):
+        raise self.error
+
+
+class UnreadableSCPTest(unittest.TestCase):
+
+    def scp_layers(self, error):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            layers = MemberAccountIAM(error)._scp_layers({})
+        return layers, output.getvalue()
+
+    def test_access_denied_reports_the_scps_as_unknown_in_one_line(self):
+        error = ClientError({'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}}, 'ListParents')
+
+        layers, output = self.scp_layers(error)
+
+        self.assertIsNone(layers)
+        self.assertEqual(output.count('[!]'), 1)
+        self.assertIn('management account or a delegated administrator', output)
+
+    def test_other_errors_are_reported_with_their_message(self):
+        error = ClientError({'Error': {'Code': 'TooManyRequestsException', 'Message': 'slow down'}}, 'ListParents')
+
+        layers, output = self.scp_layers(error)
+
+        self.assertIsNone(layers)
+        self.assertIn('slow down', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+
+from awsome_enum.conditions import ABSENT
+from awsome_enum.evaluator import ALLOWED, CONDITIONAL, EXPLICIT_DENY, IMPLICIT_DENY, PolicyEvaluator
+
+ACCOUNT = '123456789012'
+BUCKET = 'arn:aws:s3:::data'
+CONTEXT = {
+    'aws:PrincipalAccount': ACCOUNT,
+    'aws:username': 'alice',
+    'aws:SecureTransport': 'true',
+}
+
+
+def document(*statements):
+    return {'Version': '2012-10-17', 'Statement': list(statements)}
+
+
+def evaluator(*statements, context=CONTEXT):
+    return PolicyEvaluator([document(*statements)], context)
+
+
+class DenyPrecedenceTest(unittest.TestCase):
+
+    def test_explicit_deny_wins_over_any_allow(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'},
+            {'Effect': 'Deny', 'Action': 's3:DeleteObject', 'Resource': f"{BUCKET}/*"},
+        )
+        self.assertEqual(policies.evaluate('s3:DeleteObject', f"{BUCKET}/key"), EXPLICIT_DENY)
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), ALLOWED)
+
+    def test_nothing_allowed_is_an_implicit_deny(self):
+        policies = evaluator({'Effect': 'Allow', 'Action': 's3:GetObject', 'Resource': '*'})
+        self.assertEqual(policies.evaluate('ec2:DescribeInstances', '*'), IMPLICIT_DENY)
+
+    def test_not_action_allow_covers_every_other_action(self):
+        policies = evaluator({'Effect': 'Allow', 'NotAction': ['iam:*', 'organizations:*'], 'Resource': '*'})
+        self.assertEqual(policies.evaluate('s3:GetObject', '*'), ALLOWED)
+        self.assertEqual(policies.evaluate('iam:CreateUser', '*'), IMPLICIT_DENY)
+
+    def test_not_action_deny_overrides_a_wildcard_allow(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': '*', 'Resource': '*'},
+            {'Effect': 'Deny', 'NotAction': ['s3:Get*', 's3:List*'], 'Resource': '*'},
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', '*'), ALLOWED)
+        self.assertEqual(policies.evaluate('s3:PutObject', '*'), EXPLICIT_DENY)
+
+    def test_not_resource_deny_spares_only_the_excluded_resources(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'},
+            {'Effect': 'Deny', 'Action': 's3:*', 'NotResource': [BUCKET, f"{BUCKET}/*"]},
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), ALLOWED)
+        self.assertEqual(policies.evaluate('s3:GetObject', 'arn:aws:s3:::other/key'), EXPLICIT_DENY)
+
+    def test_not_resource_allow_excludes_its_resources(self):
+        policies = evaluator({'Effect': 'Allow', 'Action': 's3:GetObject', 'NotResource': f"{BUCKET}/*"})
+        self.assertEqual(policies.evaluate('s3:GetObject', 'arn:aws:s3:::other/key'), ALLOWED)
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), IMPLICIT_DENY)
+
+    def test_deny_under_an_undecided_condition_makes_an_allow_conditional(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'},
+            {'Effect': 'Deny', 'Action': 's3:*', 'Resource': '*',
+             'Condition': {'IpAddress': {'aws:SourceIp': '10.0.0.0/8'}}},
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', '*'), CONDITIONAL)
+
+    def test_condition_the_context_fails_drops_the_statement(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'},
+            {'Effect': 'Deny', 'Action': 's3:*', 'Resource': '*',
+             'Condition': {'StringNotEquals': {'aws:PrincipalAccount': ACCOUNT}}},
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', '*'), ALLOWED)
+
+
+class PolicyVariableTest(unittest.TestCase):
+
+    def test_known_variable_is_substituted(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 'iam:ChangePassword', 'Resource': f"arn:aws:iam::{ACCOUNT}:user/${{aws:username}}"}
+        )
+        self.assertEqual(policies.evaluate('iam:ChangePassword', f"arn:aws:iam::{ACCOUNT}:user/alice"), ALLOWED)
+        self.assertEqual(policies.evaluate('iam:ChangePassword', f"arn:aws:iam::{ACCOUNT}:user/bob"), IMPLICIT_DENY)
+
+    def test_missing_variable_matches_nothing(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 'iam:ChangePassword', 'Resource': f"arn:aws:iam::{ACCOUNT}:user/${{aws:username}}"},
+            context=dict(CONTEXT, **{'aws:username': ABSENT}),
+        )
+        self.assertEqual(policies.evaluate('iam:ChangePassword', f"arn:aws:iam::{ACCOUNT}:user/alice"), IMPLICIT_DENY)
+
+    def test_deny_on_an_unknown_variable_is_conditional(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'},
+            {'Effect': 'Deny', 'Action': 's3:*', 'Resource': 'arn:aws:s3:::${aws:PrincipalTag/team}/*'},
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), CONDITIONAL)
+        self.assertEqual(policies.evaluate('s3:ListAllMyBuckets', '*'), ALLOWED)
+
+    def test_allow_on_an_unknown_variable_is_conditional(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:GetObject', 'Resource': 'arn:aws:s3:::${aws:PrincipalTag/team}/*'}
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), CONDITIONAL)
+        self.assertEqual(policies.evaluate('s3:GetObject', '*'), CONDITIONAL)
+
+    def test_not_resource_with_an_unknown_variable_does_not_over_grant(self):
+        policies = evaluator(
+            {'Effect': 'Allow', 'Action': 's3:GetObject',
+             'NotResource': [f"{BUCKET}/*", 'arn:aws:s3:::${aws:PrincipalTag/team}/*']}
+        )
+        self.assertEqual(policies.evaluate('s3:GetObject', f"{BUCKET}/key"), IMPLICIT_DENY)
+        self.assertEqual(policies.evaluate('s3:GetObject', 'arn:aws:s3:::other/key'), CONDITIONAL)
+        self.assertEqual(policies.evaluate('s3:ListBucket', 'arn:aws:s3:::other'), IMPLICIT_DENY)
+
+
+if __name__ == '__main__':
+    unittest.main()
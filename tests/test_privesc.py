@@ -0,0 +1,164 @@
+import unittest
+
+from awsome_enum.iam_snapshot import IAMSnapshot
+from awsome_enum.privesc import PolicyGraph
+
+ACCOUNT = '123456789012'
+ADMIN_POLICY = 'arn:aws:iam::aws:policy/AdministratorAccess'
+ACCOUNT_ROOT = {'AWS': f"arn:aws:iam::{ACCOUNT}:root"}
+
+
+def arn(kind, name):
+    return f"arn:aws:iam::{ACCOUNT}:{kind}/{name}"
+
+
+def document(*statements):
+    return {'Version': '2012-10-17', 'Statement': list(statements)}
+
+
+def allow(action, resource='*'):
+    return {'Effect': 'Allow', 'Action': action, 'Resource': resource}
+
+
+def trust(principal):
+    return document({'Effect': 'Allow', 'Principal': principal, 'Action': 'sts:AssumeRole'})
+
+
+def inline(statements):
+    return [{'PolicyName': 'inline', 'PolicyDocument': document(*statements)}] if statements else []
+
+
+def attached(admin):
+    return [{'PolicyName': 'Admin', 'PolicyArn': ADMIN_POLICY}] if admin else []
+
+
+def user(name, *statements, admin=False):
+    return {
+        'UserName': name,
+        'Arn': arn('user', name),
+        'GroupList': [],
+        'UserPolicyList': inline(statements),
+        'AttachedManagedPolicies': attached(admin),
+    }
+
+
+def role(name, trusted, *statements, admin=False):
+    return {
+        'RoleName': name,
+        'Arn': arn('role', name),
+        'AssumeRolePolicyDocument': trust(trusted),
+        'RolePolicyList': inline(statements),
+        'AttachedManagedPolicies': attached(admin),
+    }
+
+
+def graph(users=(), roles=()):
+    policies = [{
+        'PolicyName': 'Admin', 'Arn': ADMIN_POLICY, 'DefaultVersionId': 'v1',
+        'PolicyVersionList': [{'VersionId': 'v1', 'IsDefaultVersion': True, 'Document': document(allow('*'))}],
+    }]
+    return PolicyGraph(IAMSnapshot({
+        'UserDetailList': list(users), 'GroupDetailList': [], 'RoleDetailList': list(roles), 'Policies': policies,
+    }))
+
+
+class EscalationPathTest(unittest.TestCase):
+
+    def test_administrator_gets_a_zero_hop_path(self):
+        policies = graph(users=[user('root-ish', admin=True)])
+
+        paths = policies.escalation_paths(arn('user', 'root-ish'))
+
+        self.assertEqual([(len(path), path.admin_via) for path in paths], [(0, 'AdministratorAccess')])
+
+    def test_assume_role_chain_reaches_the_admin_role(self):
+        policies = graph(
+            users=[user('dev', allow('sts:AssumeRole', arn('role', 'ops')))],
+            roles=[
+                role('ops', ACCOUNT_ROOT, allow('sts:AssumeRole', arn('role', 'admin'))),
+                role('admin', ACCOUNT_ROOT, admin=True),
+            ],
+        )
+
+        [path] = policies.escalation_paths(arn('user', 'dev'))
+
+        self.assertEqual(path.steps, [
+            (arn('user', 'dev'), 'sts:AssumeRole', arn('role', 'ops')),
+            (arn('role', 'ops'), 'sts:AssumeRole', arn('role', 'admin')),
+        ])
+        self.assertEqual(path.admin_arn, arn('role', 'admin'))
+
+    def test_explicit_deny_removes_the_assume_role_edge(self):
+        policies = graph(
+            users=[user('dev', allow('sts:AssumeRole'),
+                        {'Effect': 'Deny', 'Action': 'sts:AssumeRole', 'Resource': arn('role', 'admin')})],
+            roles=[role('admin', ACCOUNT_ROOT, admin=True)],
+        )
+
+        self.assertEqual(policies.escalation_paths(arn('user', 'dev')), [])
+
+    def test_role_trusting_the_principal_needs_no_identity_policy(self):
+        policies = graph(
+            users=[user('dev')],
+            roles=[role('admin', {'AWS': arn('user', 'dev')}, admin=True)],
+        )
+
+        [path] = policies.escalation_paths(arn('user', 'dev'))
+
+        self.assertEqual(path.steps, [(arn('user', 'dev'), 'sts:AssumeRole', arn('role', 'admin'))])
+
+    def test_pass_role_needs_the_service_calls_too(self):
+        lambda_admin = role('fn', {'Service': 'lambda.amazonaws.com'}, admin=True)
+        pass_only = graph(users=[user('dev', allow('iam:PassRole'))], roles=[lambda_admin])
+        pass_and_run = graph(
+            users=[user('dev', allow('iam:PassRole'), allow(['lambda:CreateFunction', 'lambda:InvokeFunction']))],
+            roles=[lambda_admin],
+        )
+
+        self.assertEqual(pass_only.escalation_paths(arn('user', 'dev')), [])
+        [path] = pass_and_run.escalation_paths(arn('user', 'dev'))
+        self.assertEqual(path.steps[0][1], 'iam:PassRole + lambda:CreateFunction + lambda:InvokeFunction')
+
+    def test_credentials_of_an_admin_user_can_be_taken_over(self):
+        policies = graph(users=[
+            user('dev', allow('iam:CreateAccessKey', arn('user', 'boss'))),
+            user('boss', admin=True),
+        ])
+
+        [path] = policies.escalation_paths(arn('user', 'dev'))
+
+        self.assertEqual(path.steps, [(arn('user', 'dev'), 'iam:CreateAccessKey', arn('user', 'boss'))])
+
+    def test_self_attaching_a_policy_is_an_admin_technique(self):
+        policies = graph(users=[user('dev', allow('iam:AttachUserPolicy', arn('user', 'dev')))])
+
+        [path] = policies.escalation_paths(arn('user', 'dev'))
+
+        self.assertEqual((len(path), path.admin_via), (0, 'iam:AttachUserPolicy'))
+
+    def test_search_stops_at_the_maximum_depth(self):
+        roles = [role(f"hop-{index}", ACCOUNT_ROOT, allow('sts:AssumeRole', arn('role', f"hop-{index + 1}")))
+                 for index in range(3)]
+        roles.append(role('hop-3', ACCOUNT_ROOT, admin=True))
+        policies = graph(users=[user('dev', allow('sts:AssumeRole', arn('role', 'hop-0')))], roles=roles)
+
+        self.assertEqual(policies.escalation_paths(arn('user', 'dev'), max_depth=3), [])
+        [path] = policies.escalation_paths(arn('user', 'dev'), max_depth=4)
+        self.assertEqual(len(path), 4)
+
+    def test_shortest_path_is_reported(self):
+        policies = graph(
+            users=[user('dev', allow('sts:AssumeRole', [arn('role', 'ops'), arn('role', 'admin')]))],
+            roles=[
+                role('ops', ACCOUNT_ROOT, allow('sts:AssumeRole', arn('role', 'admin'))),
+                role('admin', ACCOUNT_ROOT, admin=True),
+            ],
+        )
+
+        [path] = policies.escalation_paths(arn('user', 'dev'))
+
+        self.assertEqual(len(path), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import sys
+import threading
+import time
+import unittest
+
+from awsome_enum.scheduler import DeepEnumerationScheduler
+
+
+def run_captured(scheduler):
+    """Run the scheduler's queue and return everything it printed."""
+    stdout = sys.stdout
+    sys.stdout = captured = io.StringIO()
+    try:
+        scheduler.run()
+    finally:
+        sys.stdout = stdout
+    return captured.getvalue()
+
+
+class OutputOrderTest(unittest.TestCase):
+
+    def test_output_follows_submission_order_not_completion_order(self):
+        scheduler = DeepEnumerationScheduler(max_workers=4)
+        for index in range(8):
+            # Later units finish first
+            scheduler.submit(f"service{index}", self._unit, index, (8 - index) * 0.01)
+
+        output = run_captured(scheduler)
+
+        self.assertEqual(output.splitlines(), [f"unit {index}" for index in range(8)])
+
+    def test_stdout_is_restored_after_a_run(self):
+        stdout = sys.stdout
+        scheduler = DeepEnumerationScheduler(max_workers=2)
+        scheduler.submit('s3', print, 'done')
+
+        run_captured(scheduler)
+
+        self.assertIs(sys.stdout, stdout)
+
+    def test_failing_unit_is_reported_in_its_place(self):
+        scheduler = DeepEnumerationScheduler(max_workers=2)
+        scheduler.submit('s3', self._unit, 0, 0.02)
+        scheduler.submit('ec2', self._fail)
+        scheduler.submit('sqs', self._unit, 2, 0)
+
+        lines = run_captured(scheduler).splitlines()
+
+        self.assertEqual(lines[0], 'unit 0')
+        self.assertIn('Error while enumerating ec2: boom', lines[1])
+        self.assertEqual(lines[2], 'unit 2')
+
+    @staticmethod
+    def _unit(index, delay):
+        time.sleep(delay)
+        print(f"unit {index}")
+
+    @staticmethod
+    def _fail():
+        raise RuntimeError('boom')
+
+
+class ServiceLimitTest(unittest.TestCase):
+
+    def test_units_of_one_service_never_exceed_its_limit(self):
+        scheduler = DeepEnumerationScheduler(max_workers=8, service_limits={'iam': 2})
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def unit():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        for _ in range(6):
+            scheduler.submit('iam', unit)
+        run_captured(scheduler)
+
+        self.assertEqual(peak[0], 2)
+
+    def test_exhausted_service_budget_skips_remaining_units(self):
+        scheduler = DeepEnumerationScheduler(max_workers=1, service_budgets={'ec2': 0.15})
+        ran = []
+
+        def unit(index):
+            ran.append(index)
+            time.sleep(0.1)
+
+        for index in range(5):
+            scheduler.submit('ec2', unit, index)
+        output = run_captured(scheduler)
+
+        self.assertEqual(ran, [0, 1])
+        self.assertIn('ec2 used up its 0.15s time budget', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
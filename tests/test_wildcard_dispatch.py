@@ -0,0 +1,79 @@
+import unittest
+
+from awsome_enum.enumerator import ServiceRegistry
+from awsome_enum.evaluator import EffectivePermissions, PolicyEvaluator
+from awsome_enum.plan import EnumerationPlan
+from awsome_enum.services import AVAILABLE_SERVICES
+from awsome_enum.services.iam import IAMService
+
+ADMINISTRATOR_ACCESS = {
+    'Version': '2012-10-17',
+    'Statement': [{'Effect': 'Allow', 'Action': '*', 'Resource': '*'}],
+}
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.units = []
+
+    def submit(self, service, func, *args, region=None):
+        self.units.append((service, args, func.keywords))
+
+
+class WildcardActionDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iam = IAMService()
+        self.iam.set_available_services(ServiceRegistry(lambda name, region: AVAILABLE_SERVICES[name]()))
+        self.iam._parse_policy_document(ADMINISTRATOR_ACCESS)
+
+    def test_bare_star_reaches_every_service(self):
+        self.assertEqual(self.iam.all_resource_actions, {'*': ['*']})
+        self.assertEqual(self.iam._target_services('*'), list(AVAILABLE_SERVICES))
+        self.assertEqual(self.iam._target_services('*:List*'), list(AVAILABLE_SERVICES))
+        self.assertEqual(self.iam._target_services('s*:Get*'), ['s3', 'secretsmanager', 'sqs', 'sns', 'states', 'scheduler'])
+
+    def test_plan_resolves_bare_star_per_service(self):
+        plan = EnumerationPlan(self.iam.all_resource_actions, AVAILABLE_SERVICES.get,
+                               services_for=self.iam._target_services)
+        self.assertEqual(plan.unsupported, 0)
+        self.assertEqual({unit.service for unit in plan.units}, set(AVAILABLE_SERVICES))
+        self.assertIn('_handle_list_clusters', plan.handlers_for('*', '*', 'ecs'))
+        self.assertEqual(plan.handlers_for('*', '*'), [])
+
+    def test_bare_star_schedules_a_unit_per_service(self):
+        self.iam.plan = EnumerationPlan(self.iam.all_resource_actions, AVAILABLE_SERVICES.get,
+                                        services_for=self.iam._target_services)
+        scheduler = RecordingScheduler()
+        self.iam._schedule_resource_action(scheduler, '*', '*', True)
+
+        self.assertEqual([service for service, _, _ in scheduler.units], list(AVAILABLE_SERVICES))
+        for service, args, keywords in scheduler.units:
+            self.assertEqual(args, ('*', '*', True))
+            self.assertIsInstance(keywords['service'], AVAILABLE_SERVICES[service])
+            self.assertEqual(keywords['handlers'], self.iam.plan.handlers_for('*', '*', service))
+            self.assertTrue(keywords['handlers'])
+            self.assertTrue(keywords['header'])
+        self.assertTrue(scheduler.units[0][2]['first'])
+        self.assertTrue(scheduler.units[-1][2]['last'])
+
+    def test_plan_follows_the_evaluator(self):
+        documents = [{
+            'Version': '2012-10-17',
+            'Statement': [
+                {'Effect': 'Allow', 'NotAction': 'iam:*', 'Resource': '*'},
+                {'Effect': 'Deny', 'Action': 'ecs:ListClusters', 'Resource': '*'},
+            ],
+        }]
+        resource_actions = {'*': ['*', 'ecs:ListClusters', 'iam:ListRoles']}
+        plan = EnumerationPlan(resource_actions, AVAILABLE_SERVICES.get,
+                               evaluator=EffectivePermissions(PolicyEvaluator(documents)),
+                               services_for=self.iam._target_services)
+        self.assertEqual(plan.excluded, [('ecs:ListClusters', '*'), ('iam:ListRoles', '*')])
+        self.assertEqual(plan.handlers_for('*', '*', 'iam'), [])
+        self.assertNotIn('_handle_list_clusters', plan.handlers_for('*', '*', 'ecs'))
+        self.assertTrue(plan.handlers_for('*', '*', 'sqs'))
+
+
+if __name__ == '__main__':
+    unittest.main()